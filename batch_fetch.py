@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+수집 함수를 명령줄에서 일괄 실행하는 스크립트
+cron 등에서 대량 갱신을 실행할 때 사용하며, 하위 명령마다 동시 실행 수, 출력 형식(CSV/Parquet),
+이어서 수집(--resume) 옵션을 지원합니다.
+실패한 항목이 있거나 결과가 비어 있으면 기존 데이터 파일을 덮어쓰지 않습니다. (--allow-partial로 강제 저장)
+
+사용 예:
+    python batch_fetch.py schedule --days 60 --workers 10
+    python batch_fetch.py ratings --workers 4 --resume
+    python batch_fetch.py shelters --upkind 417000 --format parquet --output ./out/dogs.parquet
+    python batch_fetch.py shelter-codes
+    python batch_fetch.py akc --workers 2 --resume
+    python batch_fetch.py geocode --input ./static/database/pension_info.csv --address-column addressNew
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+import pandas as pd
+from src.batch import BatchRunner, OUTPUT_FORMATS, read_table, write_table
+from src.snapshot import DATABASE_DIR, SNAPSHOT_FILES, snapshot_path, write_snapshot
+
+PENSION_INFO_PATH = os.path.join(DATABASE_DIR, 'pension_info.csv')
+AKC_BREED_INFO_PATH = os.path.join(DATABASE_DIR, 'akcBreedInfo.csv')
+
+# 보호소 현황 조회 대상 축종 코드
+UPKINDS = ['417000', '422400', '429900']
+
+
+def default_output(name, output_format):
+    return os.path.join(DATABASE_DIR, f"{name}.{output_format}")
+
+
+def save_output(df, args, name, errors=(), **meta):
+    """
+    결과 저장 (기본 위치의 CSV이면 스냅샷 신선도 정보도 함께 기록)
+    실패한 항목이 있거나 결과가 비어 있으면 기존 파일을 덮어쓰지 않습니다. (--allow-partial로 강제 저장)
+    """
+    if (errors or df.empty) and not args.allow_partial:
+        reason = f"{len(errors):,}개 항목이 실패하여" if errors else "결과가 비어 있어"
+        print(f"⚠️ {reason} 저장하지 않았습니다: {args.output} (기존 파일 유지, --allow-partial로 강제 저장)")
+        return False
+    if name in SNAPSHOT_FILES and args.format == 'csv' and os.path.abspath(args.output) == os.path.abspath(snapshot_path(name)):
+        write_snapshot(name, df, **meta)
+    else:
+        write_table(df, args.output, args.format)
+    print(f"✅ {len(df):,}행 저장: {args.output}")
+    return True
+
+
+def make_runner(args):
+    return BatchRunner(f"{args.output}.parts", workers=args.workers, rate=args.rate, resume=args.resume)
+
+
+def finish(runner):
+    runner.cleanup()
+    if runner.errors:
+        print(f"⚠️ {len(runner.errors):,}개 항목이 실패했습니다. --resume 옵션으로 실패한 항목만 다시 수집할 수 있습니다.")
+        return 1
+    return 0
+
+
+def run_schedule(args):
+    from src.data import Naver
+    from src.fetch import fetch_schedule_row
+    from src.refresh import schedule_snapshot_meta
+
+    start_date_str = args.start or datetime.now().strftime("%Y-%m-%d")
+    end_date_str = args.end or (datetime.strptime(start_date_str, "%Y-%m-%d") + timedelta(days=args.days)).strftime("%Y-%m-%d")
+    pension_info = pd.read_csv(args.input)
+    naver = Naver()
+
+    def worker(row, cancel_token):
+        return fetch_schedule_row(naver, row, start_date_str, end_date_str, cancel_token)
+
+    runner = make_runner(args)
+    result = runner.run(
+        list(pension_info.itertuples(index=False)),
+        key=lambda row: f"{row.businessId}_{row.bizItemId}",
+        worker=worker,
+        desc="일정"
+    )
+    meta = schedule_snapshot_meta(start_date_str, end_date_str) if args.input == PENSION_INFO_PATH else {}
+    save_output(result, args, 'schedule_data', runner.errors, **meta)
+    return finish(runner)
+
+
+def run_ratings(args):
+    from src.data import Naver
+
+    pension_info = pd.read_csv(args.input)[['businessName', 'channelId']].drop_duplicates()
+    naver = Naver()
+
+    def worker(row, cancel_token):
+        if args.method == 'playwright':
+            result = naver._get_rating_playwright(row.channelId, cancel_token)
+        else:
+            result = naver._get_rating(row.channelId)
+        if not isinstance(result, pd.DataFrame):
+            raise RuntimeError(result.get('error', '알 수 없는 오류'))
+        result['businessName'] = row.businessName
+        result['channelId'] = row.channelId
+        return result
+
+    runner = make_runner(args)
+    result = runner.run(
+        list(pension_info.itertuples(index=False)),
+        key=lambda row: str(row.channelId),
+        worker=worker,
+        desc="리뷰"
+    )
+    save_output(result, args, 'rating_data', runner.errors)
+    return finish(runner)
+
+
+def run_shelters(args):
+    from src.data import Public
+
+    public = Public()
+    sido_path = os.path.join(DATABASE_DIR, '시도코드.csv')
+    sido = pd.read_csv(sido_path) if os.path.exists(sido_path) else public.find_sido()
+
+    # 축종 × 시도 단위로 나누어 조회 (한 번의 조회 건수 제한을 피하고 재시작 단위를 작게 유지)
+    items = [(upkind, str(upr_cd)) for upkind in args.upkind for upr_cd in sido['시도코드']]
+
+    def worker(item, cancel_token):
+        upkind, upr_cd = item
+        # 실패를 빈 결과로 바꾸지 않아야 완료로 기록되지 않고 --resume 때 다시 조회됨
+        return public.find_pet(upkind=upkind, upr_cd=upr_cd, raise_errors=True)
+
+    runner = make_runner(args)
+    result = runner.run(items, key=lambda item: f"{item[0]}_{item[1]}", worker=worker, desc="보호 동물")
+    if not result.empty and (not runner.errors or args.allow_partial):
+        from src.kind_mapping import update_kind_mapping
+        from src.shelter_ingest import ingest_petinshelter
+        from src.intake_rollup import update_intake_rollup
+        result = result.drop_duplicates(subset=['desertionNo'])
+        update_kind_mapping(result)
+        result = ingest_petinshelter(result)
+        update_intake_rollup(result)
+    save_output(result, args, 'petinshelter', runner.errors)
+    return finish(runner)
+
+
+def run_shelter_codes(args):
+    from src.data import Public
+    from src.shelter_crawler import CRAWL_RATE
+
+    # 앱과 같은 조회기 사용 (작업 파일로 이어서 조회, 바뀐 시군구만 코드표에 반영)
+    public = Public()
+    last_message = [None]
+
+    def on_progress(done, total, message):
+        if message != last_message[0] or done == total:
+            print(f"{message} ({done:,}/{total:,})")
+            last_message[0] = message
+
+    result_shelter = public.update_shelter_info(
+        on_progress=on_progress,
+        resume=args.resume,
+        workers=args.workers,
+        rate=args.rate or CRAWL_RATE
+    )
+
+    # 기본 위치가 아니면 갱신된 보호소 코드표를 출력 파일로도 저장
+    if os.path.abspath(args.output) != os.path.abspath(snapshot_path('보호소코드')):
+        write_table(result_shelter, args.output, args.format)
+        print(f"✅ {len(result_shelter):,}행 저장: {args.output}")
+
+    if public.shelter_crawl_failed:
+        print(f"⚠️ {len(public.shelter_crawl_failed):,}개 항목이 실패했습니다. --resume 옵션으로 실패한 항목만 다시 수집할 수 있습니다.")
+        return 1
+    return 0
+
+
+def run_akc(args):
+    # 앱이 읽는 견종 정보(한글 품종명, 단위 변환 컬럼 포함)는 원본 수집 결과로 덮어쓰지 않음
+    if os.path.abspath(args.output) == os.path.abspath(AKC_BREED_INFO_PATH):
+        print(f"⚠️ {AKC_BREED_INFO_PATH}는 한글 품종명·단위 변환이 추가된 파일이므로 덮어쓸 수 없습니다. 다른 --output을 지정하세요.")
+        return 2
+
+    from src.data import AKC
+
+    akc = AKC()
+    breed_urls = pd.read_csv(args.input)['breedurl'].drop_duplicates().tolist()
+
+    def worker(breedurl, cancel_token):
+        return akc.get_breed_info(breedurl)
+
+    runner = make_runner(args)
+    result = runner.run(breed_urls, key=str, worker=worker, desc="AKC 견종")
+    if save_output(result, args, 'akcBreedInfo_raw', runner.errors):
+        print(f"한글 품종명과 단위 변환은 {AKC_BREED_INFO_PATH}에 병합한 뒤 pythonutils/add_breed_name_kor.py, pythonutils/convert_units.py로 추가합니다.")
+    return finish(runner)
+
+
+def run_geocode(args):
+    from src.data import Common
+
+    common = Common()
+    data = read_table(args.input)
+    addresses = data[args.address_column].dropna().astype(str).drop_duplicates().tolist()
+
+    def worker(address, cancel_token):
+        lat, lon = common.convert_gps(address)
+        return pd.DataFrame([{args.address_column: address, 'lat': lat, 'lon': lon}])
+
+    runner = make_runner(args)
+    coordinates = runner.run(addresses, key=str, worker=worker, desc="좌표 변환")
+
+    # 기존 좌표는 새로 변환한 좌표로 교체
+    result = data.drop(columns=['lat', 'lon'], errors='ignore')
+    if not coordinates.empty:
+        result[args.address_column] = result[args.address_column].astype(str)
+        result = result.merge(coordinates, on=args.address_column, how='left')
+    save_output(result, args, os.path.splitext(os.path.basename(args.input))[0], runner.errors)
+    return finish(runner)
+
+
+# 하위 명령 → (실행 함수, 기본 출력 이름, 기본 동시 실행 수, 도움말)
+COMMANDS = {
+    'schedule': (run_schedule, 'schedule_data', 10, "네이버 숙박 일정 수집"),
+    'ratings': (run_ratings, 'rating_data', 4, "네이버 리뷰 평점 수집"),
+    'shelters': (run_shelters, 'petinshelter', 4, "보호 동물 현황 수집"),
+    'shelter-codes': (run_shelter_codes, '보호소코드', 8, "시도/시군구/보호소 코드 수집"),
+    'akc': (run_akc, 'akcBreedInfo_raw', 2, "AKC 견종 정보 수집 (원본, akcBreedInfo.csv는 덮어쓰지 않음)"),
+    'geocode': (run_geocode, None, 8, "주소를 위경도로 변환")
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="펫펜션 데이터 일괄 수집")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for command, (func, name, workers, help_text) in COMMANDS.items():
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.set_defaults(func=func, dataset=name)
+        sub.add_argument("--workers", type=int, default=workers, help=f"동시 실행 수 (기본값: {workers})")
+        sub.add_argument("--rate", type=float, default=None, help="초당 최대 요청 수 (기본값: 제한 없음)")
+        sub.add_argument("--format", choices=OUTPUT_FORMATS, default='csv', help="출력 형식")
+        sub.add_argument("--output", default=None, help="출력 파일 경로 (기본값: static/database 아래 데이터셋 파일)")
+        sub.add_argument("--resume", action="store_true", help="이전 실행에서 완료된 항목은 건너뛰고 이어서 수집")
+        sub.add_argument("--allow-partial", action="store_true", help="실패한 항목이 있거나 결과가 비어 있어도 출력 파일을 덮어씀")
+
+        if command == 'schedule':
+            sub.add_argument("--input", default=PENSION_INFO_PATH, help="펜션 정보 CSV")
+            sub.add_argument("--start", default=None, help="조회 시작일 (YYYY-MM-DD, 기본값: 오늘)")
+            sub.add_argument("--end", default=None, help="조회 종료일 (YYYY-MM-DD, 기본값: 시작일 + --days)")
+            sub.add_argument("--days", type=int, default=30, help="조회 기간(일)")
+        elif command == 'ratings':
+            sub.add_argument("--input", default=PENSION_INFO_PATH, help="펜션 정보 CSV")
+            sub.add_argument("--method", choices=['playwright', 'requests'], default='playwright', help="리뷰 수집 방식")
+        elif command == 'shelters':
+            sub.add_argument("--upkind", nargs="+", choices=UPKINDS, default=UPKINDS, help="축종 코드 (417000: 개, 422400: 고양이, 429900: 기타)")
+        elif command == 'akc':
+            sub.add_argument("--input", default=os.path.join(DATABASE_DIR, 'akcUrl.csv'), help="견종 URL 목록 CSV")
+        elif command == 'geocode':
+            sub.add_argument("--input", default=PENSION_INFO_PATH, help="주소가 포함된 CSV/Parquet 파일")
+            sub.add_argument("--address-column", default='addressNew', help="주소 컬럼명")
+
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    if args.output is None:
+        if args.dataset is None:
+            # geocode는 입력 파일을 같은 형식으로 갱신
+            args.output = f"{os.path.splitext(args.input)[0]}.{args.format}"
+        else:
+            args.output = default_output(args.dataset, args.format)
+
+    try:
+        sys.exit(args.func(args))
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -31,7 +31,17 @@ def show_findmybreed(upkind):
             type="secondary"
             )
 
+    # 입력한 글자로 시작하는 품종명을 자동 완성 후보로 표시 (누르면 검색어를 그 품종명으로 바꿈)
+    suggestions = BreedInfo().complete_breed(breed_input) if breed_input else []
+    if suggestions and breed_input.strip() not in suggestions:
+        def select_suggestion(name):
+            st.session_state[f"{data_key}_breed_input"] = name
+
+        for col, name in zip(st.columns(len(suggestions) + 1), suggestions):
+            col.button(name, key=f"{data_key}_suggest_{name}", on_click=select_suggestion, args=(name,), use_container_width=True)
+
     if breed_input or search_breed:
+        selected_breed = None
         breed_info = BreedInfo().search_breed(breed_input)
         if not breed_info.empty:
             if len(breed_info) > 1:
@@ -44,7 +54,7 @@ def show_findmybreed(upkind):
                 )
             else:
                 selected_breed = breed_info['품종'].iloc[0]
-        elif breed_info is not None:
+        else:
             st.info("검색 결과가 없습니다. 다른 키워드로 검색해보세요.")
         
         if selected_breed:
@@ -2,6 +2,7 @@ import streamlit as st
 from src.data import Public, Common
 from src.ui import UI, BreedInfo
 from src.survey import Survey
+from src.survey_model import get_survey_model, load_table, SURVEY_PATH
 from st_aggrid import AgGrid, GridOptionsBuilder
 import plotly.graph_objects as go
 import pydeck as pdk
@@ -293,14 +294,16 @@ import numpy as np
 #             st.session_state.show_intro = False
 #             st.rerun()
 
-def survey_page(survey_data, breed_info, akcTraits):
-    total_steps = len(survey_data)
+def survey_page(survey_model, breed_info, akcTraits):
+    total_steps = len(survey_model)
     current_step = st.session_state.current_step
 
     Survey().show_progress_bar(current_step, total_steps)
     
     if current_step < total_steps:
-        Survey().handle_survey_navigation(survey_data, current_step)
+        # 지금까지의 답변으로 누적 점수를 갱신하고 추천 후보 미리보기
+        Survey().show_live_preview(Survey().get_match_state(breed_info))
+        Survey().handle_survey_navigation(survey_model, current_step)
     else:
         Survey().handle_survey_completion(breed_info, akcTraits)
 
@@ -323,10 +326,10 @@ def show_survey_page():
     if 'animal_type' not in st.session_state:
         st.session_state.animal_type = "강아지"
     
-    # 데이터 로드
-    survey_data = pd.read_csv('./static/database/survey.csv')
-    breed_info = pd.read_csv('./static/database/akcBreedInfo.csv')
-    akcTraits = pd.read_csv('./static/database/akcTraits.csv')
+    # 데이터 로드 (파일이 바뀌지 않았으면 이전에 읽은 설문 모델과 데이터를 재사용)
+    survey_model = get_survey_model(SURVEY_PATH)
+    breed_info = load_table('./static/database/akcBreedInfo.csv')
+    akcTraits = load_table('./static/database/akcTraits.csv')
     
     # 인트로 화면과 설문 화면 분기
     if st.session_state.show_intro:
@@ -345,7 +348,7 @@ def show_survey_page():
         st.session_state.animal_type = animal_type
         
         if animal_type == "강아지":
-            survey_page(survey_data, breed_info, akcTraits)
+            survey_page(survey_model, breed_info, akcTraits)
         elif animal_type == "고양이":
             st.warning("고양이 설문은 준비중입니다.")
         else:
@@ -5,6 +5,10 @@ import sys
 from datetime import datetime, timedelta
 from src.data import Public, Common
 from src.ui import UI, BreedInfo
+from src.refresh import load_petinshelter_snapshot
+from src.snapshot import describe_freshness
+from src.intake_rollup import get_intake_rollup
+import plotly.express as px
 from pathlib import Path
 from threading import Thread, Lock
 import time
@@ -24,11 +28,17 @@ def show_pet_list(upkind):
     col1, col2, col3 = st.columns(3)
     with col2:
         refresh_button = st.button("보호소 현황조회", key=refresh_key, use_container_width=True, type="primary")
+    st.caption(f"{describe_freshness('petinshelter')} · 버튼을 누르면 최신 현황을 다시 조회합니다.")
     
     if refresh_button:
         ui.show_petinshelter(upkind, data_key, refresh_button)
     elif data_key not in st.session_state or st.session_state[data_key].empty:
-        ui.show_preview()
+        # 미리 수집된 현황이 있으면 바로 표시
+        snapshot = load_petinshelter_snapshot(upkind)
+        if snapshot is not None:
+            ui.show_petinshelter(upkind, data_key, snapshot=snapshot)
+        else:
+            ui.show_preview()
     
     if data_key in st.session_state and not st.session_state[data_key].empty:
         petinshelter = st.session_state[data_key]
@@ -46,13 +56,58 @@ def show_pet_list(upkind):
         else:
             with st.expander("지도 보기", expanded=True):
                 BreedInfo().show_map(filtered_data)
-            grid_response = BreedInfo().show_shelter_detail(filtered_data)            
+            grid_response = BreedInfo().show_shelter_detail(filtered_data, base=petinshelter, key=f"shelter_detail_{upkind}")
             BreedInfo().show_pet_detail(grid_response)
 
 
+def show_intake_trend():
+    """주별 입소 추이 (미리 집계한 입소 집계표만 사용)"""
+    rollup = get_intake_rollup()
+    if not rollup.weeks:
+        st.info("입소 집계 데이터가 없습니다. 보호소 현황을 조회하면 집계가 만들어집니다.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        kind = st.selectbox("축종", ["전체", "개", "고양이", "기타축종"], key="intake_kind")
+    with col2:
+        sidos = sorted(s for s in rollup.table['시도'].unique() if s != '정보 없음')
+        sido = st.selectbox("시도", ["모든 지역"] + sidos, key="intake_sido")
+    with col3:
+        if len(rollup.weeks) > 1:
+            weeks = st.slider("최근 몇 주", min_value=1, max_value=len(rollup.weeks), value=min(12, len(rollup.weeks)), key="intake_weeks")
+        else:
+            # 집계된 주가 하나뿐이면 슬라이더를 만들 수 없음 (min_value == max_value)
+            weeks = 1
+            st.caption(f"집계 기간: {rollup.weeks[0]} 주")
+
+    filters = {
+        '축종': None if kind == "전체" else kind,
+        '시도': None if sido == "모든 지역" else sido
+    }
+
+    weekly = rollup.weekly(by='processState', weeks=weeks, **filters)
+    st.info(f"기간 내 입소: {int(weekly.values.sum()):,}마리")
+    fig = px.bar(weekly.reset_index().melt(id_vars='week', var_name='상태', value_name='마릿수'),
+                 x='week', y='마릿수', color='상태', labels={'week': '발견 주'},
+                 title='주별 입소 현황 (현재 상태별)')
+    st.plotly_chart(fig, use_container_width=True)
+
+    region = '시군구' if filters['시도'] else '시도'
+    col1, col2 = st.columns(2)
+    with col1:
+        by_region = rollup.query((region,), weeks=weeks, **filters).nlargest(10, 'count')
+        st.plotly_chart(px.bar(by_region, x='count', y=region, orientation='h', title=f'{region}별 입소 상위 10',
+                               labels={'count': '마릿수'}), use_container_width=True)
+    with col2:
+        by_kind = rollup.query(('kindCd',), weeks=weeks, **filters).nlargest(10, 'count')
+        st.plotly_chart(px.bar(by_kind, x='count', y='kindCd', orientation='h', title='품종별 입소 상위 10',
+                               labels={'count': '마릿수', 'kindCd': '품종'}), use_container_width=True)
+
+
 def show_petshelter_page():
     st.subheader("📊 보호소 현황")
-    tab1, tab2, tab3 = st.tabs(["강아지","고양이","기타"])
+    tab1, tab2, tab3, tab4 = st.tabs(["강아지","고양이","기타","입소 추이"])
     with tab1:
         show_pet_list(upkind='417000')
 
@@ -61,3 +116,6 @@ def show_petshelter_page():
 
     with tab3:
         show_pet_list(upkind='429900')
+
+    with tab4:
+        show_intake_trend()
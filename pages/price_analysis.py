@@ -6,11 +6,13 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from pathlib import Path
-from src.data import Naver
 from src.ui import UI
 from src.settings import verify_password
+from src.fetch import iter_schedule_results, get_region_from_address
+from src.cancel import session_cancel_token
+from src.snapshot import describe_freshness
+from src.refresh import save_schedule_snapshot, load_schedule_snapshot
 import json
-from threading import Thread, Lock
 import time
 
 # 개발 모드에서만 캐싱 설정 비활성화
@@ -72,20 +74,6 @@ def load_pension_data():
     
     return pd.read_csv(csv_path)
 
-def get_region_from_address(address):
-    """주소에서 지역 정보 추출"""
-    if pd.isna(address):
-        return "미분류"
-    
-    regions = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종",
-               "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"]
-    
-    for region in regions:
-        if region in address:
-            return region
-    
-    return "기타"
-
 def get_available_regions(pension_info):
     """펜션 정보에서 사용 가능한 지역 목록 추출"""
     regions = ["전체"] + sorted([
@@ -113,112 +101,90 @@ def create_date_region_selection(pension_info):
     
     return start_date, end_date, selected_region
 
-@st.cache_data(ttl=1800)  # 30분 캐시
-def fetch_schedule_data(pension_info, start_date_str, end_date_str):
-    """일정 데이터를 실시간으로 조회하는 함수 (스레드 병렬 처리)"""
-    # Naver 객체 생성
-    naver = Naver()
-    
-    # 결과 저장용 데이터프레임
+SCHEDULE_CACHE_TTL = 1800  # 30분 캐시
+
+def fetch_schedule_data(pension_info, start_date_str, end_date_str, stream=True, refresh_now=False):
+    """
+    일정 데이터를 조회하는 함수
+    미리 수집된 스냅샷이 있으면 바로 사용하고, 없거나 refresh_now이면 실시간으로 조회 (스레드 병렬 처리, 완료 순서대로 표시)
+    """
+    if not refresh_now:
+        snapshot = load_schedule_snapshot(pension_info, start_date_str, end_date_str)
+        if snapshot is not None:
+            return snapshot
+    
+    # 같은 조건으로 30분 이내에 조회한 결과가 있으면 재사용
+    cache_key = (start_date_str, end_date_str, tuple(pension_info['bizItemId'].astype(str)))
+    cached = st.session_state.get('schedule_fetch_cache')
+    if cached and not refresh_now and cached['key'] == cache_key and time.time() - cached['fetched_at'] < SCHEDULE_CACHE_TTL:
+        return cached['data']
+    
+    # 완료된 펜션별 결과 (마지막에 한 번만 병합)
     all_results = []
-    results_lock = Lock()  # 결과 리스트 동시 접근 방지용 락
     
     # 진행 상황 관련 변수
     total_pensions = len(pension_info)
     completed_count = 0
-    completed_lock = Lock()  # 진행 상황 카운터용 락
     
-    # 진행 상황 표시
+    # 진행 상황 및 중간 결과 표시
     progress_bar = st.progress(0)
     status_text = st.empty()
-    
-    # 스레드로 실행할 함수 정의
-    def worker(row):
-        nonlocal completed_count
-        
-        businessId = str(row.businessId).strip()
-        biz_item_id = str(row.bizItemId).strip()
-        
-        try:
-            schedule_data = naver.get_schedule(
-                businessId, 
-                biz_item_id, 
-                start_date_str, 
-                end_date_str
+    preview = st.empty()
+    stream_chart = None
+    if stream:
+        with preview.container():
+            stream_chart = st.line_chart(
+                pd.DataFrame({'날짜': pd.Series(dtype='datetime64[ns]'), '가격': pd.Series(dtype='float'), '숙박업소': pd.Series(dtype='object')}),
+                x='날짜',
+                y='가격',
+                color='숙박업소'
             )
-            
-            # schedule_data가 None이 아닌 경우 처리
-            if schedule_data is not None:
-                schedule_data['businessName'] = row.businessName
-                schedule_data['bizItemName'] = row.bizItemName
-                schedule_data['address'] = row.addressNew
-                
-                # 결과를 필터링하고 필요한 열만 선택
-                filtered_schedule_data = schedule_data[
-                    schedule_data['isSaleDay'] == True
-                ]
-                
-                filtered_schedule_data = filtered_schedule_data[
-                    ['businessName', 'bizItemName', 'date', 'prices', 'address']
-                ].rename(columns={
-                    'businessName': '숙박업소', 
-                    'bizItemName': '숙박상품', 
-                    'date': '날짜', 
-                    'prices': '가격',
-                    'address': '주소'
-                })
-                
-                # 락을 사용하여 결과에 안전하게 추가
-                with results_lock:
-                    all_results.append(filtered_schedule_data)
-        except Exception as e:
-            print(f"오류 발생: {row.businessName} - {e}")
-        
-        # 진행 상황 업데이트
-        with completed_lock:
+    
+    # 이전 분석 요청이 아직 진행 중이면 취소하고 새 취소 토큰 발급
+    cancel_token = session_cancel_token('price_cancel_token')
+    results = iter_schedule_results(pension_info, start_date_str, end_date_str, max_workers=10, cancel_token=cancel_token)
+    failed = []
+    try:
+        for row, schedule_data, error in results:
             completed_count += 1
-            progress = completed_count / total_pensions
-            progress_bar.progress(progress)
+            
+            if error is not None:
+                print(f"오류 발생: {row.businessName} - {error}")
+                failed.append(f"{row.businessName} - {row.bizItemName}")
+            elif schedule_data is not None and not schedule_data.empty:
+                all_results.append(schedule_data)
+                # 완료된 펜션의 가격 추이를 차트에 바로 추가
+                if stream_chart is not None:
+                    stream_chart.add_rows(pd.DataFrame({
+                        '날짜': pd.to_datetime(schedule_data['날짜']),
+                        '가격': schedule_data['가격'],
+                        '숙박업소': schedule_data['숙박업소']
+                    }))
+            
+            progress_bar.progress(completed_count / total_pensions)
             status_text.text(f"처리 중... ({completed_count}/{total_pensions})")
-    
-    # 스레드 생성 및 실행
-    threads = []
-    max_workers = min(10, total_pensions)  # 최대 10개 스레드로 제한
-    
-    for row in pension_info.itertuples(index=False):
-        t = Thread(target=worker, args=(row,))
-        threads.append(t)
-        t.start()
-        
-        # 최대 동시 실행 스레드 수 제한 (선택적)
-        active_threads = sum(1 for t in threads if t.is_alive())
-        while active_threads >= max_workers:
-            time.sleep(0.1)  # 잠시 대기
-            active_threads = sum(1 for t in threads if t.is_alive())
-    
-    # 모든 스레드 완료 대기
-    for t in threads:
-        t.join()
+    finally:
+        # 재실행·이탈로 중단되면 남은 요청 취소
+        results.close()
     
     # 결과 병합
     result = pd.DataFrame()
     if all_results:
         result = pd.concat(all_results, ignore_index=True)
     
-    # 주소에서 지역 정보 추출
-    if not result.empty and '주소' in result.columns:
-        result['지역'] = result['주소'].apply(get_region_from_address)
-    
     # 진행 상황 바 완료 표시
     progress_bar.empty()
     status_text.empty()
+    preview.empty()
+    
+    # 일정을 받지 못한 펜션은 한 번에 알림
+    if failed:
+        st.warning(f"{len(failed)}개 숙박상품의 일정을 가져오는데 실패했습니다: {', '.join(failed)}", icon="⚠️")
     
-    # CSV 파일로 저장 (통계 분석용)
-    if not result.empty:
-        static_dir = Path('./static')
-        static_dir.mkdir(exist_ok=True)
-        result.to_csv('./static/database/schedule_data.csv', index=False)
+    # 스냅샷으로 저장 (통계 분석용, 모든 펜션을 받아 왔고 기존 스냅샷의 기간을 포함할 때만)
+    save_schedule_snapshot(pension_info, result, start_date_str, end_date_str, failed=failed)
     
+    st.session_state.schedule_fetch_cache = {'key': cache_key, 'fetched_at': time.time(), 'data': result}
     return result
 
 def process_schedule_data(schedule_data, start_date, end_date, selected_region):
@@ -284,14 +250,19 @@ def create_pension_selection(other_pensions):
     )
     return selected_pensions
 
-def analyze_data(start_date, end_date, selected_region, selected_pensions, pension_info):
+def analyze_data(start_date, end_date, selected_region, selected_pensions, pension_info, refresh_now=False):
     """가격 데이터 분석 함수 (스레드 병렬 처리)"""
     
     st.session_state.analyzing = True
     
     with st.spinner("데이터 분석 중..."):
         # 모든 데이터 가져오기
-        schedule_data = fetch_schedule_data(pension_info, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+        schedule_data = fetch_schedule_data(
+            pension_info,
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d"),
+            refresh_now=refresh_now
+        )
         
         # 데이터가 비어있는 경우 처리
         if schedule_data.empty:
@@ -355,31 +326,7 @@ def analyze_data(start_date, end_date, selected_region, selected_pensions, pensi
         if final_data:
             final_df = pd.concat(final_data, ignore_index=True)
         else:
-            final_df = pd.DataFrame(columns=['숙박업소', '숙박상품', '날짜', '가격', '주소', '카테고리'])
-        
-        # 가격 컬럼을 숫자 타입으로 변환 (문자열, 쉼표 등 처리)
-        def convert_price(price):
-            if pd.isna(price):
-                return float('nan')
-            
-            # 문자열인 경우
-            if isinstance(price, str):
-                # 쉼표 제거
-                price = price.replace(',', '')
-                
-                try:
-                    return float(price)
-                except ValueError:
-                    return float('nan')
-            
-            # 이미 숫자인 경우
-            elif isinstance(price, (int, float)):
-                return float(price)
-            
-            # 기타 처리 불가능한 경우
-            return float('nan')
-        
-        final_df['가격'] = final_df['가격'].apply(convert_price)
+            final_df = pd.DataFrame(columns=['숙박업소', '숙박상품', '날짜', '가격', '주소', '카테고리']).astype({'가격': 'float'})
         
         # 카테고리 순서 설정 - 카페이안 카테고리 다음에 선택된 펜션들
         category_order = cafe_ian_categories + selected_pensions
@@ -773,9 +720,13 @@ def show_price_analysis_page():
     with col2:
         analyze_clicked = st.button("분석 시작", use_container_width=True, key="analyze_button", type="primary")
     
+    # 미리 수집된 가격이 있으면 바로 분석하고, 필요할 때만 실시간 조회
+    refresh_now = st.checkbox("최신 가격으로 새로 조회", value=False, key="price_refresh_now")
+    st.caption(describe_freshness('schedule_data'))
+    
     # 분석 실행
     if analyze_clicked:
-        analyze_data(start_date, end_date, selected_region, selected_pensions, pension_info)
+        analyze_data(start_date, end_date, selected_region, selected_pensions, pension_info, refresh_now=refresh_now)
     
     # 분석 결과 표시
     if st.session_state.analyzed:
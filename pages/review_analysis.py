@@ -7,8 +7,9 @@ from datetime import datetime, timedelta
 from src.settings import verify_password
 from src.data import Naver
 from src.chart import Chart
-from threading import Thread, Lock
-import time
+from src.jobs import get_job_manager, DONE, FINISHED_STATES
+from src.fetch import fetch_rating_data
+from src.snapshot import update_snapshot, read_snapshot, describe_freshness
 
 naver = Naver()
 
@@ -44,85 +45,21 @@ def load_pension_data():
     pension_info['channelId'] = pension_info['channelId'].astype(str)
     return pension_info
 
-def fetch_rating_data_threaded(pension_info_filtered):
-    """멀티스레드를 사용하여 리뷰 데이터를 가져오는 함수"""
-    # Naver 객체 생성
-    naver = Naver()
-    
-    # 로딩 상태 표시
-    status_text = st.empty()
-    progress_bar = st.progress(0)
-    
-    # 결과 저장용 리스트 및 락
-    all_results = []
-    results_lock = Lock()
-    
-    # 진행 상황 추적용 변수
-    total_pensions = len(pension_info_filtered)
-    completed_count = 0
-    completed_lock = Lock()
-    
-    # 스레드로 실행될 함수
-    def fetch_rating_worker(row):
-        nonlocal completed_count
-        
-        channel_id = row.channelId
-        business_name = row.businessName
-        
-        try:
-            # 리뷰 데이터 가져오기
-            result = naver._get_rating_playwright(channel_id)
-            
-            # 결과가 데이터프레임인 경우 처리
-            if isinstance(result, pd.DataFrame):
-                result['businessName'] = business_name
-                result['channelId'] = channel_id
-                
-                # 락을 사용하여 결과에 안전하게 추가
-                with results_lock:
-                    all_results.append(result)
-            else:
-                print(f"오류: {business_name}의 리뷰 데이터 형식이 올바르지 않음")
-        except Exception as e:
-            print(f"오류 발생: {business_name} - {str(e)}")
-        
-        # 진행 상황 업데이트
-        with completed_lock:
-            completed_count += 1
-            progress = completed_count / total_pensions
-            progress_bar.progress(progress)
-            status_text.text(f"리뷰 데이터 수집 중... ({completed_count}/{total_pensions})")
-    
-    # 스레드 생성 및 실행
-    threads = []
-    max_workers = min(5, total_pensions)  # 최대 5개 스레드로 제한
-    
-    for row in pension_info_filtered.itertuples(index=False):
-        t = Thread(target=fetch_rating_worker, args=(row,))
-        threads.append(t)
-        t.start()
-        
-        # 최대 동시 실행 스레드 수 제한
-        active_threads = sum(1 for t in threads if t.is_alive())
-        while active_threads >= max_workers:
-            time.sleep(0.1)  # 잠시 대기
-            active_threads = sum(1 for t in threads if t.is_alive())
-    
-    # 모든 스레드 완료 대기
-    for t in threads:
-        t.join()
-    
-    # 진행 상황 바 및 상태 텍스트 제거
-    progress_bar.empty()
-    status_text.empty()
-    
-    # 결과 병합
-    rating_data = pd.DataFrame()
-    if all_results:
-        rating_data = pd.concat(all_results, ignore_index=True)
-        
-        # CSV로 저장
-        rating_data.to_csv('./static/database/rating_data.csv', index=False)
+def collect_rating_data(ctx, pensions):
+    """
+    백그라운드 작업으로 실행되는 리뷰 데이터 수집 함수 (멀티스레드)
+    pensions: businessName, channelId, addressNew 키를 가진 레코드 목록
+    """
+    rating_data = fetch_rating_data(
+        pd.DataFrame(pensions),
+        max_workers=5,
+        cancel_token=ctx.cancel_token,
+        on_progress=ctx.progress
+    )
+    
+    # 수집한 펜션의 리뷰만 스냅샷에서 교체
+    if not rating_data.empty and not ctx.cancelled:
+        update_snapshot('rating_data', rating_data, key='channelId')
     
     return rating_data
 
@@ -184,6 +121,36 @@ def process_rating_data(rating_data, pension_info_filtered):
     
     return pd.concat(zscore_data), pension_col
 
+def load_rating_snapshot(pension_info_filtered):
+    """선택한 펜션의 리뷰가 모두 스냅샷에 있으면 해당 리뷰만 반환 (없으면 None)"""
+    snapshot = read_snapshot('rating_data')
+    if snapshot is None or snapshot.empty or 'channelId' not in snapshot.columns:
+        return None
+    
+    channel_ids = set(pension_info_filtered['channelId'].astype(str))
+    snapshot = snapshot[snapshot['channelId'].astype(str).isin(channel_ids)]
+    if set(snapshot['channelId'].astype(str)) != channel_ids:
+        return None
+    return snapshot
+
+def analyze_rating_data(rating_data, pension_info_filtered):
+    """리뷰 데이터를 분석해 세션 상태에 결과 저장"""
+    # 세션 상태에 데이터 저장
+    st.session_state.rating_data = rating_data
+    st.session_state.pension_info_filtered = pension_info_filtered
+    
+    # 데이터 분석
+    with st.spinner("리뷰 데이터 분석중..."):
+        rating_average, pension_col = process_rating_data(rating_data, pension_info_filtered)
+        
+        # 분석 결과 저장
+        st.session_state.rating_average = rating_average
+        st.session_state.pension_col = pension_col
+        st.session_state.has_analysis_result = True
+        
+        # 카테고리 순서 정의
+        st.session_state.category_order = rating_average['review_item'].unique().tolist()
+
 def prioritize_cafeian(rating_average, pension_col):
     """카페이안을 첫 번째로 하는 펜션 순서 생성 및 적용"""
     pension_order = list(rating_average[pension_col].unique())
@@ -273,45 +240,53 @@ def show_review_analysis_page():
             type="primary"
         )
     
-    # 분석 결과 표시 조건
-    if not (review_button or st.session_state.has_analysis_result):
-        return
+    # 미리 수집된 리뷰가 있으면 바로 분석하고, 필요할 때만 새로 수집
+    refresh_now = st.checkbox("최신 리뷰로 새로 수집", value=False, key="review_refresh_now")
+    st.caption(describe_freshness('rating_data'))
+    
+    job_manager = get_job_manager()
     
-    # 데이터 처리 및 분석
+    # 리뷰 수집을 백그라운드 작업으로 등록
     if review_button:
         # 선택한 펜션 정보 표시 (카페이안 포함)
         pension_info_filtered = pension_info[pension_info['businessName'].isin(analysis_pensions)]
         st.dataframe(pension_info_filtered, use_container_width=True, hide_index=True)
         
-        # 리뷰 데이터 가져오기
-        with st.spinner("리뷰 데이터 수집중..."):
-            try:
-                # 스레드를 사용하여 리뷰 데이터 가져오기
-                rating_data = fetch_rating_data_threaded(pension_info_filtered)
-                
-                # 수집된 데이터가 없거나 비어있는 경우 처리
-                if rating_data is None or rating_data.empty:
-                    st.error("리뷰 데이터를 가져오는데 실패했습니다.")
-                    return
-                
-                # 세션 상태에 데이터 저장
-                st.session_state.rating_data = rating_data
-                st.session_state.pension_info_filtered = pension_info_filtered
-            except Exception as e:
-                st.error(f"데이터 수집 중 오류가 발생했습니다: {str(e)}")
-                return
+        snapshot = None if refresh_now else load_rating_snapshot(pension_info_filtered)
+        if snapshot is not None:
+            analyze_rating_data(snapshot, pension_info_filtered)
+            review_button = False
+    
+    if review_button:
+        previous_job = job_manager.get(st.session_state.get('review_job_id'))
+        if previous_job is not None and previous_job['status'] not in FINISHED_STATES:
+            job_manager.cancel(previous_job['id'])
         
-        # 데이터 분석
-        with st.spinner("리뷰 데이터 분석중..."):
-            rating_average, pension_col = process_rating_data(rating_data, pension_info_filtered)
+        st.session_state.review_job_id = job_manager.submit(
+            'review_scrape',
+            collect_rating_data,
+            params={'pensions': pension_info_filtered.to_dict('records')}
+        )
+    
+    # 세션에 작업이 없으면 (페이지 새로고침 등) 가장 최근 작업을 이어서 조회
+    job = job_manager.get(st.session_state.get('review_job_id'))
+    if job is None and not st.session_state.has_analysis_result:
+        job = job_manager.latest('review_scrape')
+    
+    if job is not None and job['id'] != st.session_state.get('review_job_analyzed'):
+        UI().show_job_status(job, key="review_job")
+        
+        if job['status'] == DONE:
+            rating_data = job_manager.load_result(job)
             
-            # 분석 결과 저장
-            st.session_state.rating_average = rating_average
-            st.session_state.pension_col = pension_col
-            st.session_state.has_analysis_result = True
+            # 수집된 데이터가 없거나 비어있는 경우 처리
+            if rating_data is None or rating_data.empty:
+                st.error("리뷰 데이터를 가져오는데 실패했습니다.")
+                st.session_state.review_job_analyzed = job['id']
+                return
             
-            # 카테고리 순서 정의
-            st.session_state.category_order = rating_average['review_item'].unique().tolist()
+            analyze_rating_data(rating_data, pd.DataFrame(job['params']['pensions']))
+            st.session_state.review_job_analyzed = job['id']
     
     # 분석 결과 표시
     if st.session_state.has_analysis_result:
@@ -2,22 +2,92 @@ import streamlit as st
 import pandas as pd
 import os
 from datetime import datetime, timedelta
-from src.data import Naver
 from src.ui import UI
+from src.fetch import iter_schedule_results, empty_schedule_frame
+from src.cancel import session_cancel_token
+from src.snapshot import describe_freshness
+from src.refresh import save_schedule_snapshot, load_schedule_snapshot
 from pathlib import Path
-from threading import Thread, Lock
-import time
-from tqdm import tqdm
 
 # 개발 모드에서만 캐싱 설정 비활성화
 if os.environ.get('STREAMLIT_DEVELOPMENT', 'false').lower() == 'true':
     st.cache_data.clear()
     st.cache_resource.clear()
 
+def fetch_live_schedule(pension_info, start_date_str, end_date_str, stream_results=True):
+    """네이버에서 일정을 실시간으로 조회하고 결과를 스냅샷으로 저장"""
+    result = pd.DataFrame()
+    
+    # 완료된 펜션별 결과 (마지막에 한 번만 병합)
+    df_results = []
+    errors = []
+    
+    total_threads = len(pension_info)
+    completed_threads = 0
+    
+    # 진행 상황 및 중간 결과 표시 영역
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    preview = st.empty()
+    stream_table = None
+    if stream_results:
+        with preview.container():
+            stream_table = st.dataframe(
+                empty_schedule_frame(),
+                use_container_width=True,
+                hide_index=True,
+                column_config={'가격': st.column_config.NumberColumn('가격', format='%d원')}
+            )
+    
+    # 이전 검색이 아직 진행 중이면 취소하고 새 취소 토큰 발급
+    cancel_token = session_cancel_token('schedule_cancel_token')
+    
+    # 로딩 메시지 표시
+    with st.spinner('데이터를 불러오는 중입니다. 잠시만 기다려주세요...'):
+        results = iter_schedule_results(
+            pension_info,
+            start_date_str,
+            end_date_str,
+            max_workers=10,
+            cancel_token=cancel_token
+        )
+        try:
+            for row, schedule_data, error in results:
+                completed_threads += 1
+                
+                if error is not None:
+                    errors.append(f"{row.businessName} - {row.bizItemName}의 일정을 가져오는데 실패했습니다. 오류: {str(error)}")
+                elif schedule_data is not None and not schedule_data.empty:
+                    df_results.append(schedule_data)
+                    # 완료된 결과를 표에 바로 추가
+                    if stream_table is not None:
+                        stream_table.add_rows(schedule_data)
+                
+                current_progress = completed_threads / total_threads
+                progress_bar.progress(current_progress)
+                status_text.text(f"처리 중: {completed_threads}/{total_threads} ({int(current_progress * 100)}%)")
+        finally:
+            # 재실행·이탈로 중단되면 남은 요청 취소
+            results.close()
+        
+        # 진행 상황 완료 표시
+        progress_bar.progress(1.0)
+        preview.empty()
+        
+        # 오류 메시지 표시
+        for message in errors:
+            st.warning(message, icon="⚠️")
+        
+        # 결과가 있으면 데이터프레임으로 변환
+        if df_results:
+            result = pd.concat(df_results, ignore_index=True)
+            # 모든 펜션을 받아 왔고 기존 스냅샷의 기간을 포함할 때만 스냅샷으로 저장
+            save_schedule_snapshot(pension_info, result, start_date_str, end_date_str, failed=errors)
+    
+    return result
+
 def show_schedule_page():
-    # Naver 객체 생성
     st.subheader("🏠 반려동물 동반 숙박시설 조회")
-    naver = Naver()
     
     # 세션 상태 초기화
     if 'result' not in st.session_state:
@@ -53,170 +123,28 @@ def show_schedule_page():
     # CSV 파일에서 데이터 읽기
     pension_info = pd.read_csv('./static/database/pension_info.csv')
 
+    # 완료된 펜션부터 바로 표시할지 여부
+    stream_results = st.toggle("완료된 숙박업소부터 바로 표시", value=True, key="schedule_stream_results")
+    
+    # 미리 수집된 일정이 있으면 바로 표시하고, 필요할 때만 실시간 조회
+    refresh_now = st.checkbox("최신 일정으로 새로 조회", value=False, key="schedule_refresh_now")
+    st.caption(describe_freshness('schedule_data'))
+
     # 검색 버튼 클릭 시 데이터 로드
     if search_button:  
         # 새 검색 시 이전 결과 초기화
         st.session_state.result = pd.DataFrame()
-        result = pd.DataFrame()
         
-        # 스레드 결과를 저장할 리스트와 락 객체 생성
-        all_results = []
-        results_lock = Lock()
+        start_date_str = start_date.strftime("%Y-%m-%d")
+        end_date_str = end_date.strftime("%Y-%m-%d")
+        snapshot = None if refresh_now else load_schedule_snapshot(pension_info, start_date_str, end_date_str)
         
-        # 스레드 진행 상황을 추적하기 위한 변수
-        total_threads = len(pension_info)
-        completed_threads = 0
-        completed_lock = Lock()
-        
-        # 진행 상황 컨테이너 생성
-        progress_container = st.empty()
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # 로딩 메시지 표시
-        with st.spinner('데이터를 불러오는 중입니다. 잠시만 기다려주세요...'):
-            # 스레드로 실행할 함수 정의
-            def worker(row):
-                nonlocal completed_threads
-                
-                businessId = str(row.businessId).strip()
-                biz_item_id = str(row.bizItemId).strip()
-                
-                try:
-                    schedule_data = naver.get_schedule(
-                        businessId, 
-                        biz_item_id, 
-                        start_date.strftime("%Y-%m-%d"), 
-                        end_date.strftime("%Y-%m-%d")
-                    )
-                    
-                    # 결과가 있는 경우 리스트에 추가
-                    if schedule_data is not None:
-                        schedule_data['businessName'] = row.businessName
-                        schedule_data['bizItemName'] = row.bizItemName
-                        schedule_data['address'] = row.addressNew
-                        
-                        with results_lock:
-                            all_results.append(schedule_data)
-                    else:
-                        # 메인 스레드에서 처리하도록 결과에 오류 정보 추가
-                        with results_lock:
-                            all_results.append({
-                                'error': True,
-                                'message': f"{row.businessName} - {row.bizItemName}의 일정을 가져오는데 실패했습니다.",
-                                'businessName': row.businessName,
-                                'bizItemName': row.bizItemName
-                            })
-                except Exception as e:
-                    # 메인 스레드에서 처리하도록 결과에 오류 정보 추가
-                    with results_lock:
-                        all_results.append({
-                            'error': True,
-                            'message': f"{row.businessName} - {row.bizItemName}의 일정을 가져오는데 실패했습니다. 오류: {str(e)}",
-                            'businessName': row.businessName,
-                            'bizItemName': row.bizItemName
-                        })
-                
-                # 진행 상황 업데이트 (직접 UI 업데이트하지 않음)
-                with completed_lock:
-                    completed_threads += 1
-            
-            # 스레드 생성 및 시작
-            threads = []
-            max_concurrent_threads = 10  # 최대 동시 스레드 수 제한
-            active_threads = 0
-            
-            for row in pension_info.itertuples(index=False):
-                # 최대 동시 스레드 수 제한 관리
-                while active_threads >= max_concurrent_threads:
-                    # 활성 스레드 수 확인
-                    active_threads = sum(1 for t in threads if t.is_alive())
-                    time.sleep(0.1)  # 잠시 대기
-                
-                # 새로운 스레드 생성 및 시작
-                t = Thread(target=worker, args=(row,))
-                t.start()
-                threads.append(t)
-                active_threads += 1
-                
-                # 메인 스레드에서 진행 상황 업데이트 (0.5초마다)
-                if len(threads) % 5 == 0 or len(threads) == len(pension_info):
-                    with completed_lock:
-                        current_progress = completed_threads / total_threads
-                    progress_bar.progress(current_progress)
-                    status_text.text(f"처리 중: {completed_threads}/{total_threads} ({int(current_progress * 100)}%)")
-                    time.sleep(0.1)  # UI 업데이트를 위한 짧은 대기
-            
-            # 모든 스레드가 완료될 때까지 대기하면서 진행 상황 업데이트
-            while any(t.is_alive() for t in threads):
-                with completed_lock:
-                    current_progress = completed_threads / total_threads
-                progress_bar.progress(current_progress)
-                status_text.text(f"처리 중: {completed_threads}/{total_threads} ({int(current_progress * 100)}%)")
-                time.sleep(0.5)  # 0.5초마다 업데이트
-            
-            # 모든 스레드가 완료될 때까지 대기
-            for t in threads:
-                t.join()
-            
-            # 진행 상황 완료 표시
-            progress_bar.progress(1.0)
-            
-            # 오류 메시지 표시 (메인 스레드에서)
-            errors = [r for r in all_results if isinstance(r, dict) and r.get('error')]
-            for error in errors:
-                st.warning(error['message'], icon="⚠️")
-                # 오류가 있는 항목을 all_results에서 제거
-                all_results.remove(error)
-            
-            # 결과가 있으면 데이터프레임으로 변환
-            if all_results:
-                # 데이터프레임 형태의 결과만 처리
-                df_results = [r for r in all_results if isinstance(r, pd.DataFrame)]
-                if df_results:
-                    result = pd.concat(df_results, ignore_index=True)
-                    
-                    # 결과를 필터링하고 필요한 열만 선택
-                    filtered_result = result[
-                        result['isSaleDay'] == True
-                    ]
-                    
-                    filtered_result = filtered_result[
-                        ['businessName', 'bizItemName', 'date', 'prices', 'address']
-                    ].rename(columns={
-                        'businessName': '숙박업소', 
-                        'bizItemName': '숙박상품', 
-                        'date': '날짜', 
-                        'prices': '가격',
-                        'address': '주소'
-                    })
-                    
-                    result = filtered_result
+        if snapshot is not None:
+            result = snapshot
+        else:
+            result = fetch_live_schedule(pension_info, start_date_str, end_date_str, stream_results)
 
         st.session_state.result = result
-        
-        # 주소에서 지역 정보 추출
-        def get_region_from_address(address):
-            if pd.isna(address):
-                return "미분류"
-            
-            regions = [
-                "서울", "부산", "대구", "인천", "광주", 
-                "대전", "울산", "세종", "경기", "강원", 
-                "충북", "충남", "전북", "전남", "경북", 
-                "경남", "제주"
-            ]
-            
-            for region in regions:
-                if region in address:
-                    return region
-            
-            return "기타"
-        
-        # 지역 정보 추가
-        if not result.empty and '주소' in result.columns:
-            result['지역'] = result['주소'].apply(get_region_from_address)
-            st.session_state.result = result
             
         # 검색 결과 저장 후 필터링된 결과도 초기화
         st.session_state.filtered_result = result
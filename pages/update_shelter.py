@@ -1,18 +1,58 @@
 import streamlit as st
 import pandas as pd
 import os
-from datetime import datetime, timedelta
-from src.data import Naver
+from src.data import Public
 from src.ui import UI
-from pathlib import Path
-from threading import Thread, Lock
-import time
-from tqdm import tqdm
+from src.snapshot import describe_freshness
+from src.jobs import get_job_manager, DONE, FINISHED_STATES
+
+SHELTER_CODE_PATH = './static/database/보호소코드.csv'
+
+def rebuild_shelter_codes(ctx):
+    """백그라운드 작업으로 실행되는 시도/시군구/보호소 코드 재구축"""
+    return Public().update_shelter_info(on_progress=ctx.progress, cancel_token=ctx.cancel_token)
 
 def show_update_shelter():
     st.subheader("🏠 보호소 정보 업데이트")
-    naver = Naver()
-    
+
     # 세션 상태 초기화
     if 'result' not in st.session_state:
-        st.session_state.result = pd.DataFrame()
\ No newline at end of file
+        st.session_state.result = pd.DataFrame()
+
+    job_manager = get_job_manager()
+
+    # 현재 보호소 코드 파일 정보
+    if os.path.exists(SHELTER_CODE_PATH):
+        shelter_codes = pd.read_csv(SHELTER_CODE_PATH)
+        st.caption(f"보호소 {len(shelter_codes):,}곳 · {describe_freshness('보호소코드')}")
+
+    # 세션에 작업이 없으면 (페이지 새로고침 등) 가장 최근 작업을 이어서 조회
+    job = job_manager.get(st.session_state.get('shelter_code_job_id')) or job_manager.latest('shelter_code')
+    is_running = job is not None and job['status'] not in FINISHED_STATES
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        update_button = st.button(
+            "보호소 코드 업데이트",
+            use_container_width=True,
+            key="update_shelter_button",
+            type="primary",
+            disabled=is_running
+        )
+
+    if update_button:
+        st.session_state.shelter_code_job_id = job_manager.submit('shelter_code', rebuild_shelter_codes)
+        job = job_manager.get(st.session_state.shelter_code_job_id)
+
+    if job is None:
+        return
+
+    UI().show_job_status(job, key="shelter_code_job")
+
+    if job['status'] == DONE:
+        result = job_manager.load_result(job)
+        if result is not None:
+            st.dataframe(result, use_container_width=True, hide_index=True)
+
+if __name__ == "__main__":
+    show_update_shelter()
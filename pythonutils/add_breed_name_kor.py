@@ -1,4 +1,8 @@
 import pandas as pd
+from pathlib import Path
+
+# 프로젝트 루트 기준 견종 정보 파일 경로
+AKC_BREED_INFO_PATH = Path(__file__).resolve().parent.parent / 'static' / 'database' / 'akcBreedInfo.csv'
 
 # 주요 개 품종 영-한 매핑 딕셔너리 생성
 breed_mapping = {
@@ -323,7 +327,7 @@ breed_mapping.update(additional_mapping)
 
 try:
     # 파일 읽기
-    df = pd.read_csv('/Users/hoshin/workspace/petpension/static/database/akcBreedInfo.csv')
+    df = pd.read_csv(AKC_BREED_INFO_PATH)
     
     # breed_name_kor 칼럼 초기화
     df['breed_name_kor'] = ''
@@ -349,7 +353,7 @@ try:
                 df.at[index, 'breed_name_kor'] = breed_name.replace('-', ' ').title()
     
     # 결과 저장
-    df.to_csv('/Users/hoshin/workspace/petpension/static/database/akcBreedInfo.csv', index=False)
+    df.to_csv(AKC_BREED_INFO_PATH, index=False)
     print("파일이 성공적으로 생성되었습니다: akcBreedInfo.csv")
 
 except Exception as e:
@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import ast
+import time
+import numpy as np
+import pandas as pd
+from src.matching import get_breed_matcher, RecommendationTable
+
+def timed(label, func, n_respondents):
+    started_at = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started_at
+    print(f"{label:<40} {elapsed * 1000:>10.1f} ms  ({elapsed / n_respondents * 1e6:>8.1f} µs/응답)")
+    return result
+
+def benchmark_matching(n_respondents=10000, k=5, seed=0):
+    """
+    무작위 설문 응답으로 추천 방식별 처리 시간을 비교합니다.
+    - 응답별 점수 계산 후 전체 정렬 (기존 handle_survey_completion 방식)
+    - 일괄 점수 계산 후 argpartition으로 상위 k개만 선택
+    - 미리 계산한 추천표 조회
+    """
+    os.chdir(project_root)
+    breed_info = pd.read_csv(os.path.join("static", "database", "akcBreedInfo.csv"))
+    survey_data = pd.read_csv(os.path.join("static", "database", "survey.csv"))
+    matcher = get_breed_matcher(breed_info)
+
+    # 설문 선택지에서 무작위 응답 생성
+    rng = np.random.default_rng(seed)
+    answers = pd.DataFrame({
+        row['question_k']: rng.choice(ast.literal_eval(row['select_option_k']), n_respondents)
+        for _, row in survey_data.iterrows()
+        if pd.notna(row['select_option_k'])
+    })
+    answer_sets = answers.to_dict('records')
+    print(f"견종 {matcher.n_breeds}개, 응답 {n_respondents:,}개, 상위 {k}개\n")
+
+    def one_by_one():
+        return [
+            sorted(zip(matcher.breed_names, matcher.score(a).tolist()), key=lambda x: x[1], reverse=True)[:k]
+            for a in answer_sets
+        ]
+
+    def batch_full_sort():
+        scores = matcher.score_many(answers)
+        return np.argsort(-scores, axis=1, kind='stable')[:, :k]
+
+    def batch_top_k():
+        return matcher.recommend(answers, k=k)
+
+    started_at = time.perf_counter()
+    table = RecommendationTable.build(matcher, survey_data, k=k)
+    print(f"{'추천표 생성 (' + format(len(table.indices), ',') + '개 조합)':<40} {(time.perf_counter() - started_at) * 1000:>10.1f} ms")
+    expected = timed("응답별 계산 + 전체 정렬", one_by_one, n_respondents)
+    full = timed("일괄 계산 + 전체 정렬 (argsort)", batch_full_sort, n_respondents)
+    recommended = timed("일괄 계산 + 상위 k개 (argpartition)", batch_top_k, n_respondents)
+    looked_up = timed("추천표 조회", lambda: [table.lookup(a) for a in answer_sets], n_respondents)
+
+    # 모든 방식의 결과가 같은지 확인
+    top_k_names = recommended.groupby('respondent')['breed_name_kor'].apply(list).tolist()
+    assert top_k_names == [[name for name, _ in r] for r in expected]
+    assert full.tolist() == [[matcher.breed_names.index(name) for name in names] for names in top_k_names]
+    assert looked_up == expected
+    print("\n모든 방식의 추천 결과가 일치합니다.")
+
+if __name__ == "__main__":
+    benchmark_matching()
@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+import os
+import time
+import pandas as pd
+from src.matching import get_breed_matcher, RecommendationTable, RECOMMENDATION_TABLE_PATH
+
+def build_breed_recommendations(k=5):
+    """
+    survey.csv의 모든 선택지 조합에 대한 추천 견종 상위 k개를 계산해 저장합니다.
+    akcBreedInfo.csv가 바뀌면 다시 실행해야 하며, 그 전까지 설문 페이지는 실시간 계산으로 대체합니다.
+    """
+    os.chdir(project_root)
+    breed_info = pd.read_csv(os.path.join("static", "database", "akcBreedInfo.csv"))
+    survey_data = pd.read_csv(os.path.join("static", "database", "survey.csv"))
+
+    started_at = time.perf_counter()
+    matcher = get_breed_matcher(breed_info)
+    table = RecommendationTable.build(matcher, survey_data, k=k)
+    table.save(RECOMMENDATION_TABLE_PATH)
+
+    print(f"질문 {len(table.questions)}개, 답변 조합 {len(table.indices):,}개의 추천 결과를 저장했습니다: {RECOMMENDATION_TABLE_PATH}")
+    print(f"소요 시간: {time.perf_counter() - started_at:.2f}초")
+
+if __name__ == "__main__":
+    build_breed_recommendations()
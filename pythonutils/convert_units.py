@@ -1,6 +1,10 @@
 import pandas as pd
 import re
 import ast
+from pathlib import Path
+
+# 프로젝트 루트 기준 견종 정보 파일 경로
+AKC_BREED_INFO_PATH = Path(__file__).resolve().parent.parent / 'static' / 'database' / 'akcBreedInfo.csv'
 
 # 단위 변환 상수
 INCH_TO_CM = 2.54
@@ -274,7 +278,7 @@ def process_american_bulldog(df):
 
 try:
     # 파일 읽기
-    df = pd.read_csv('/Users/hoshin/workspace/petpension/static/database/akcBreedInfo.csv')
+    df = pd.read_csv(AKC_BREED_INFO_PATH)
     
     # 새 칼럼 추가 및 단위 변환
     df['height_k'] = df['height'].apply(convert_height)
@@ -285,7 +289,7 @@ try:
     process_american_bulldog(df)
     
     # 결과 저장
-    df.to_csv('/Users/hoshin/workspace/petpension/static/database/akcBreedInfo.csv', index=False)
+    df.to_csv(AKC_BREED_INFO_PATH, index=False)
     print("단위 변환이 완료되었습니다. 파일이 성공적으로 생성되었습니다: akcBreedInfo.csv")
 
 except Exception as e:
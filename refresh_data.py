@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+static/database 스냅샷을 주기적으로 갱신하는 스크립트
+각 데이터셋은 src/refresh.py에 정의된 주기마다 새로 수집되어 원자적으로 저장되고,
+갱신 시각은 static/database/freshness.json에 기록됩니다.
+
+사용 예:
+    python refresh_data.py                 # 데몬으로 계속 실행
+    python refresh_data.py --once          # 갱신이 필요한 데이터셋만 한 번 갱신
+    python refresh_data.py --once --force --only petinshelter
+"""
+
+import argparse
+import sys
+import time
+import traceback
+from datetime import datetime
+from src.refresh import DATASETS
+from src.snapshot import snapshot_age
+
+
+def log(message):
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+# 갱신에 실패한 데이터셋은 5분, 10분, 20분 ... 간격으로 다시 시도 (최대 갱신 주기)
+RETRY_DELAY = 5 * 60
+
+# 데이터셋 이름 → (연속 실패 횟수, 다음 재시도 시각)
+_failures = {}
+
+
+def refresh_due(names, force=False):
+    """갱신 주기가 지난 데이터셋을 차례로 갱신"""
+    for name in names:
+        refresh, interval = DATASETS[name]
+        age = snapshot_age(name)
+        if not force and age is not None and age < interval:
+            continue
+        failures, retry_at = _failures.get(name, (0, 0))
+        if not force and time.time() < retry_at:
+            continue
+
+        log(f"🔄 {name} 갱신 시작")
+        started_at = time.time()
+        try:
+            result = refresh()
+            rows = 0 if result is None else len(result)
+            _failures.pop(name, None)
+            log(f"✅ {name} 갱신 완료 ({rows:,}행, {time.time() - started_at:.1f}초)")
+        except Exception:
+            # 한 데이터셋이 실패해도 나머지는 계속 갱신
+            delay = min(RETRY_DELAY * 2 ** failures, interval)
+            _failures[name] = (failures + 1, time.time() + delay)
+            log(f"❌ {name} 갱신 실패 ({delay // 60:,}분 후 다시 시도)")
+            traceback.print_exc()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="static/database 스냅샷 갱신")
+    parser.add_argument("--once", action="store_true", help="한 번만 갱신하고 종료")
+    parser.add_argument("--force", action="store_true", help="갱신 주기와 관계없이 갱신")
+    parser.add_argument("--only", nargs="+", choices=list(DATASETS), default=list(DATASETS), help="갱신할 데이터셋")
+    parser.add_argument("--interval", type=int, default=60, help="갱신 필요 여부 확인 간격(초)")
+    args = parser.parse_args()
+
+    if args.once:
+        refresh_due(args.only, force=args.force)
+        sys.exit(0)
+
+    log(f"🚀 스냅샷 갱신 데몬 시작: {', '.join(args.only)}")
+    force = args.force
+    while True:
+        refresh_due(args.only, force=force)
+        force = False
+        time.sleep(args.interval)
@@ -0,0 +1,142 @@
+"""
+명령줄 일괄 수집을 위한 실행기
+항목별 작업을 스레드로 병렬 실행하고, 완료된 항목의 결과를 작업 폴더에 하나씩 저장해
+중단되더라도 --resume으로 남은 항목만 이어서 수집할 수 있습니다.
+"""
+import os
+import shutil
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from tqdm import tqdm
+from src.cancel import CancelToken
+
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+
+class RateLimiter:
+    """초당 시작하는 작업 수를 제한 (rate가 None이면 제한 없음)"""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_at = 0
+        self.lock = threading.Lock()
+
+    def wait(self, cancel_token=None):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start_at = max(now, self.next_at)
+            self.next_at = start_at + self.interval
+        if start_at > now:
+            if cancel_token is not None:
+                cancel_token.sleep(start_at - now)
+            else:
+                time.sleep(start_at - now)
+
+
+def read_table(path):
+    """CSV 또는 Parquet 파일 읽기 (확장자로 판단)"""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def write_table(df, path, output_format='csv'):
+    """임시 파일에 쓴 뒤 교체하여 결과 파일을 원자적으로 저장"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if output_format == 'parquet':
+        try:
+            df.to_parquet(tmp_path, index=False)
+        except ImportError as e:
+            raise SystemExit(f"Parquet 저장에는 pyarrow가 필요합니다: pip install pyarrow ({e})")
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+class BatchRunner:
+    """
+    items의 각 항목에 worker(item, cancel_token)를 병렬로 실행해 결과 데이터프레임을 모음
+    key(item)는 재시작 시 같은 항목을 식별하는 문자열이어야 합니다.
+    """
+
+    def __init__(self, parts_dir, workers=4, rate=None, resume=False):
+        self.parts_dir = parts_dir
+        self.workers = max(1, workers)
+        self.rate_limiter = RateLimiter(rate)
+        self.resume = resume
+        self.cancel_token = CancelToken()
+        self.errors = []
+
+    def _part_path(self, key):
+        digest = hashlib.md5(str(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.parts_dir, f"{digest}.pkl")
+
+    def run(self, items, key, worker, desc=None):
+        if not self.resume and os.path.exists(self.parts_dir):
+            shutil.rmtree(self.parts_dir)
+        os.makedirs(self.parts_dir, exist_ok=True)
+
+        # 이미 완료된 항목은 건너뜀
+        pending = [item for item in items if not os.path.exists(self._part_path(key(item)))]
+        skipped = len(items) - len(pending)
+        if skipped:
+            print(f"이전 실행에서 완료된 {skipped:,}개 항목을 건너뜁니다.")
+
+        def run_item(item):
+            self.rate_limiter.wait(self.cancel_token)
+            self.cancel_token.raise_if_cancelled()
+            result = worker(item, self.cancel_token)
+            if result is None:
+                result = pd.DataFrame()
+            # 완료된 항목은 바로 저장해 두어 중단되어도 잃지 않음
+            part_path = self._part_path(key(item))
+            result.to_pickle(f"{part_path}.tmp")
+            os.replace(f"{part_path}.tmp", part_path)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        futures = {executor.submit(run_item, item): item for item in pending}
+        try:
+            for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+                item = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    self.errors.append((key(item), str(e)))
+                    print(f"오류 발생: {key(item)} - {str(e)}")
+        except KeyboardInterrupt:
+            print("중단되었습니다. --resume 옵션으로 남은 항목을 이어서 수집할 수 있습니다.")
+            raise
+        finally:
+            self.cancel_token.cancel()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        return self.collect(items, key)
+
+    def collect(self, items, key):
+        """완료된 항목의 결과를 items 순서대로 병합"""
+        parts = []
+        for item in items:
+            part_path = self._part_path(key(item))
+            if os.path.exists(part_path):
+                part = pd.read_pickle(part_path)
+                if not part.empty:
+                    parts.append(part)
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts, ignore_index=True)
+
+    def cleanup(self):
+        """모든 항목이 성공한 경우 작업 폴더 삭제 (실패가 있으면 재시작을 위해 유지)"""
+        if not self.errors and os.path.exists(self.parts_dir):
+            shutil.rmtree(self.parts_dir)
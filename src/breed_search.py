@@ -0,0 +1,230 @@
+"""
+견종 이름 검색 인덱스
+한글/영문 품종명과 흔히 쓰는 별칭을 자모 단위로 분해해 접두사 사전(트라이를 펼친 형태), 초성·자음 사전,
+자모 3-gram 역색인으로 만들어 두고, 오타나 띄어쓰기 차이, 초성 입력("ㄱㄹㄷ")에도 순위를 매겨 결과를 반환합니다.
+"""
+import re
+import pandas as pd
+
+# 자주 쓰는 다른 이름 → 견종 정보의 한글 품종명
+BREED_ALIASES = {
+    "푸들": "스탠다드 푸들",
+    "미디엄 푸들": "스탠다드 푸들",
+    "진돗개": "진도견",
+    "진도": "진도견",
+    "도사": "토사",
+    "도사견": "토사",
+    "스피츠": "재패니즈 스피츠",
+    "셰퍼드": "저먼 셰퍼드 독",
+    "세퍼드": "저먼 셰퍼드 독",
+    "포인터": "저먼 포인터",
+    "라이카": "Yakutian Laika",
+    "야쿠티안 라이카": "Yakutian Laika",
+    "코기": "웰시 코기 펨브로크",
+    "빠삐용": "파피용",
+    "빠삐용(콘티넨탈 토이 스파니엘)": "파피용",
+    "브리타니 스파니엘": "브리타니",
+    "닥스훈트": "스탠다드 닥스훈트",
+    "장모치와와": "치와와",
+    "잭러셀테리어": "러셀 테리어",
+    "잭 러셀 테리어": "러셀 테리어",
+    "꼬똥 드 뚤레아": "코튼 드 튈레아",
+    "마리노이즈": "벨지안 말리노이즈",
+    "말리노이즈": "벨지안 말리노이즈",
+    "핏불테리어": "아메리칸 스태퍼드셔 테리어",
+    "체코슬로바이칸 울프독": "체코슬로바키안 블치아크",
+    "허스키": "시베리안 허스키",
+    "말라뮤트": "알라스칸 말라뮤트",
+    "골든": "골든 리트리버",
+    "래브라도 리트리버": "라브라도 리트리버",
+    "레트리버": "라브라도 리트리버",
+    "리트리버": "라브라도 리트리버",
+    "슈나우저": "슈나우져",
+    "미니어처 슈나우저": "미니어쳐 슈나우저",
+    "미니어처 핀셔": "미니어쳐 핀셔",
+    "미니어처 푸들": "미니어쳐 푸들",
+    "시추": "시츄",
+    "요키": "요크셔 테리어",
+    "비숑": "비숑 프리제",
+    "포메": "포메라니안",
+    "샤페이": "차이니즈 샤페이",
+    "세인트버나드": "세인트 버나드"
+}
+
+CHOSUNG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+JUNGSUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
+JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+CONSONANTS = set(CHOSUNG) | set(JONGSUNG[1:])
+
+HANGUL_START = 0xAC00
+HANGUL_END = 0xD7A3
+
+# 검색 순위: 일치 > 접두사 > 초성/자음 > 부분 문자열 > 3-gram 포함 비율
+EXACT_SCORE = 4.0
+PREFIX_SCORE = 3.0
+INITIAL_SCORE = 2.5
+SUBSTRING_SCORE = 2.0
+NGRAM_MIN_SIMILARITY = 0.5
+NGRAM_SIZE = 3
+
+
+def normalize(text):
+    """소문자로 바꾸고 공백·구분 기호를 제거"""
+    return re.sub(r"[\s\-_.,()\[\]/']", "", str(text).lower())
+
+
+def _syllables(text):
+    for char in text:
+        code = ord(char)
+        if HANGUL_START <= code <= HANGUL_END:
+            code -= HANGUL_START
+            yield CHOSUNG[code // 588], JUNGSUNG[(code % 588) // 28], JONGSUNG[code % 28]
+        else:
+            yield char, None, None
+
+
+def decompose(text):
+    """한글 음절을 자모로 분해 ("골든" → "ㄱㅗㄹㄷㅡㄴ")"""
+    return "".join(c + (v or "") + (j or "") for c, v, j in _syllables(text))
+
+
+def initials(text):
+    """초성만 추출 ("골든" → "ㄱㄷ")"""
+    return "".join(c for c, _, _ in _syllables(text))
+
+
+def consonants(text):
+    """초성과 받침 자음 추출 ("골든" → "ㄱㄹㄷㄴ")"""
+    return "".join(c + (j or "") for c, _, j in _syllables(text))
+
+
+def ngrams(text, n=NGRAM_SIZE):
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class BreedSearchIndex:
+    """한글/영문 품종명과 별칭에 대한 검색 인덱스"""
+
+    def __init__(self, breed_info, aliases=BREED_ALIASES):
+        self.breed_names = breed_info['breed_name_kor'].astype(str).tolist()
+        self.breed_names_eng = breed_info['breed_name'].astype(str).tolist()
+        positions = {name: i for i, name in reversed(list(enumerate(self.breed_names)))}
+
+        # 검색 키: (정규화한 이름, 자모, 초성, 자음, 견종 위치)
+        names = []
+        for i, (kor, eng) in enumerate(zip(self.breed_names, self.breed_names_eng)):
+            names.append((kor, i))
+            names.append((eng.replace('-', ' '), i))
+        n_official = len(names)
+        for alias, target in aliases.items():
+            if target in positions:
+                names.append((alias, positions[target]))
+
+        self.keys = []
+        # 별칭이 아닌 견종 정보의 품종명 키 위치
+        self.official_keys = set()
+        self.prefixes = {}
+        self.initial_prefixes = {}
+        self.grams = {}
+        seen = set()
+        for n, (name, breed) in enumerate(names):
+            key = normalize(name)
+            if not key or (key, breed) in seen:
+                continue
+            seen.add((key, breed))
+            jamo = decompose(key)
+            entry = (key, jamo, initials(key), consonants(key), breed)
+            k = len(self.keys)
+            self.keys.append(entry)
+            if n < n_official:
+                self.official_keys.add(k)
+
+            for form, table in ((key, self.prefixes), (jamo, self.prefixes), (entry[2], self.initial_prefixes), (entry[3], self.initial_prefixes)):
+                for end in range(1, len(form) + 1):
+                    table.setdefault(form[:end], set()).add(k)
+            for gram in ngrams(jamo):
+                self.grams.setdefault(gram, set()).add(k)
+
+    def _match_keys(self, query):
+        """검색어에 맞는 키 위치 → 점수"""
+        key = normalize(query)
+        if not key:
+            return {}
+        jamo = decompose(key)
+        scores = {}
+
+        def add(k, score):
+            if score > scores.get(k, 0):
+                scores[k] = score
+
+        for k in self.prefixes.get(key, set()) | self.prefixes.get(jamo, set()):
+            entry = self.keys[k]
+            add(k, EXACT_SCORE if entry[0] == key else PREFIX_SCORE + len(jamo) / len(entry[1]))
+
+        if all(char in CONSONANTS for char in key):
+            # 초성 또는 자음 입력 ("ㄱㄹㄷ")
+            for k in self.initial_prefixes.get(key, ()):
+                add(k, INITIAL_SCORE + len(key) / len(self.keys[k][3]))
+            for k, entry in enumerate(self.keys):
+                if key in entry[2] or key in entry[3]:
+                    add(k, SUBSTRING_SCORE)
+            return scores
+
+        # 부분 문자열과 오타는 3-gram을 공유하는 키만 비교
+        query_grams = ngrams(jamo)
+        counts = {}
+        for gram in query_grams:
+            for k in self.grams.get(gram, ()):
+                counts[k] = counts.get(k, 0) + 1
+        for k, common in counts.items():
+            entry = self.keys[k]
+            if jamo in entry[1]:
+                add(k, SUBSTRING_SCORE + len(jamo) / len(entry[1]))
+                continue
+            # 검색어의 3-gram 중 키에 들어 있는 비율 (긴 이름 일부를 오타로 입력해도 찾도록)
+            similarity = common / len(query_grams)
+            if similarity >= NGRAM_MIN_SIMILARITY:
+                add(k, similarity)
+        return scores
+
+    def search(self, query, limit=10):
+        """
+        검색어와 맞는 견종의 (한글 품종명, 영문 품종명, 점수) 목록
+        같은 견종이 여러 키로 맞으면 가장 높은 점수를 쓰며, 같은 점수는 짧은 이름이 먼저 옵니다.
+        """
+        best = {}
+        for k, score in self._match_keys(query).items():
+            breed = self.keys[k][4]
+            if score > best.get(breed, 0):
+                best[breed] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], len(self.breed_names[item[0]]), item[0]))[:limit]
+        return [(self.breed_names[i], self.breed_names_eng[i], score) for i, score in ranked]
+
+    def complete(self, prefix, limit=10):
+        """입력 중인 접두사로 시작하는 품종명 (자동 완성)"""
+        key = normalize(prefix)
+        if not key:
+            return []
+        matches = self.prefixes.get(key, set()) | self.prefixes.get(decompose(key), set())
+        breeds = sorted({self.keys[k][4] for k in matches}, key=lambda i: (len(self.breed_names[i]), i))
+        return [self.breed_names[i] for i in breeds[:limit]]
+
+
+_indexes = {}
+# 마지막으로 조회한 견종 정보 데이터프레임과 검색 인덱스 (같은 객체면 해시를 다시 계산하지 않음)
+_last = (None, None)
+
+
+def get_breed_search_index(breed_info):
+    """견종 정보가 같으면 이미 만든 검색 인덱스를 재사용"""
+    global _last
+    if _last[0] is breed_info:
+        return _last[1]
+    key = int(pd.util.hash_pandas_object(breed_info[['breed_name_kor', 'breed_name']], index=False).sum())
+    if key not in _indexes:
+        _indexes.clear()
+        _indexes[key] = BreedSearchIndex(breed_info)
+    _last = (breed_info, _indexes[key])
+    return _indexes[key]
@@ -0,0 +1,57 @@
+"""
+진행 중인 외부 요청을 협력적으로 취소하기 위한 토큰
+새 검색을 시작하거나 스크립트가 재실행·종료되면 이전 토큰을 취소하고,
+수집 함수들은 요청 사이사이에 토큰을 확인해 남은 작업을 건너뜁니다.
+"""
+import threading
+import time
+import streamlit as st
+
+
+class FetchCancelled(Exception):
+    """취소된 토큰으로 작업을 계속하려 할 때 발생"""
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise FetchCancelled("요청이 취소되었습니다.")
+
+    def sleep(self, seconds):
+        """지정한 시간만큼 대기하되, 그 사이 취소되면 즉시 FetchCancelled 발생"""
+        if self._event.wait(seconds):
+            raise FetchCancelled("요청이 취소되었습니다.")
+
+
+def check_cancelled(cancel_token):
+    """토큰이 있으면 취소 여부 확인"""
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+
+def cancellable_sleep(seconds, cancel_token=None):
+    """토큰이 있으면 취소 가능한 대기, 없으면 일반 대기"""
+    if cancel_token is not None:
+        cancel_token.sleep(seconds)
+    else:
+        time.sleep(seconds)
+
+
+def session_cancel_token(key):
+    """같은 키로 진행 중이던 이전 작업을 취소하고 새 토큰을 세션에 등록"""
+    previous = st.session_state.get(key)
+    if previous is not None:
+        previous.cancel()
+    token = CancelToken()
+    st.session_state[key] = token
+    return token
@@ -10,11 +10,17 @@ from bs4 import BeautifulSoup as BS
 from playwright.sync_api import sync_playwright
 import streamlit as st
 from typing import List, Dict, Any, Callable, Optional, Union, Tuple
-import time, random,os, json, math, datetime
+import time, random,os, json, math, re
 from fake_useragent import UserAgent
 from requests_html import HTMLSession
 from math import ceil
 from concurrent.futures import ThreadPoolExecutor
+from src.cancel import FetchCancelled, check_cancelled, cancellable_sleep
+from src.snapshot import write_snapshot
+from src.shelter_dim import get_shelter_tables
+from src.shelter_crawler import ShelterCodeCrawler
+from src.http_cache import cached_get
+from src.json_decode import loads, public_items, decode_items
 from src.payload import (
     payload_schedule,
     payload_booking_list,
@@ -57,6 +63,12 @@ class Common:
             self.pension_info.loc[index, 'lon'] = lon
         self.pension_info.to_csv('./static/database/pension_info.csv', index=False)
 
+# 일별 예약 현황 컬럼 (가격은 prices 목록의 첫 가격으로 따로 만듦)
+SCHEDULE_SCHEMA = {column: None for column in [
+    'isHoliday', 'isBusinessDay', 'hasBusinessDays', 'isSaleDay', 'stock', 'bookingCount',
+    'occupiedBookingCount', 'todayDealRate', 'minBookingCount', 'maxBookingCount', 'startTime', 'endTime'
+]}
+
 class Naver:
     def __init__(self):
         self.url_schedule = "https://m.booking.naver.com/graphql?opName=schedule"
@@ -74,32 +86,22 @@ class Naver:
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7'
         }
         
-    def get_schedule(self, businessId, bizItemId, startDateTime, endDateTime):
+    def get_schedule(self, businessId, bizItemId, startDateTime, endDateTime, cancel_token=None):
+        # 취소된 검색이면 요청하지 않음
+        check_cancelled(cancel_token)
+
         # payload.py에서 페이로드 가져오기
         payload = payload_schedule(businessId, bizItemId, startDateTime, endDateTime)
 
         response = req.post(self.url_schedule, json=payload)
-        data = response.json()["data"]["schedule"]["bizItemSchedule"]["daily"]['date']
-        result = []
-        for date_key, datum in data.items():
-            result.append({
-                'date': date_key,
-                'isHoliday': datum['isHoliday'],
-                'isBusinessDay': datum['isBusinessDay'],
-                'hasBusinessDays': datum['hasBusinessDays'],
-                'isSaleDay': datum['isSaleDay'],
-                'stock': datum['stock'],
-                'bookingCount': datum['bookingCount'],
-                'occupiedBookingCount': datum['occupiedBookingCount'],
-                'todayDealRate': datum['todayDealRate'],
-                'minBookingCount': datum['minBookingCount'],
-                'maxBookingCount': datum['maxBookingCount'],
-                'startTime': datum['startTime'],
-                'endTime': datum['endTime'],
-                'prices': f"{datum['prices'][0]['price']:,}" if datum['prices'] and len(datum['prices']) > 0 else "0"
-            })
-        
-        result = pd.DataFrame(result)
+        data = loads(response.content)["data"]["schedule"]["bizItemSchedule"]["daily"]['date']
+        result = decode_items(list(data.values()), SCHEDULE_SCHEMA)
+        result.insert(0, 'date', list(data.keys()))
+        # 가격은 원 단위 정수로 유지하고, 천 단위 구분 기호는 화면에서만 붙임
+        result['prices'] = [
+            (datum['prices'][0].get('price') or 0) if datum.get('prices') else 0
+            for datum in data.values()
+        ]
         return result
     
     def get_booking_list(self, businessId):
@@ -165,13 +167,14 @@ class Naver:
         
         return {"review_count": review_count, "rating_distribution": rating_distribution}
 
-    def _get_rating_playwright(self, channel_id):
+    def _get_rating_playwright(self, channel_id, cancel_token=None):
         # 재시도 횟수 설정
         max_retries = 3
         retry_count = 0
         
         while retry_count < max_retries:
             try:
+                check_cancelled(cancel_token)
                 with sync_playwright() as p:
                     # 브라우저 런치 옵션 설정
                     browser = p.chromium.launch(
@@ -216,22 +219,24 @@ class Naver:
                     # 무작위 지연 시간 추가 (1.25~2.5초, 첫 시도에서는 더 짧게)
                     delay = random.uniform(0.125, 0.25) if retry_count == 0 else random.uniform(0.125, 0.25)
                     print(f"요청 전 {delay:.1f}초 대기 중...")
-                    time.sleep(delay)
+                    cancellable_sleep(delay, cancel_token)
                     
                     # 네이버 메인 페이지 먼저 방문
+                    check_cancelled(cancel_token)
                     page.goto("https://www.naver.com")
-                    time.sleep(random.uniform(0.125, 0.25))
+                    cancellable_sleep(random.uniform(0.125, 0.25), cancel_token)
                     
                     # 마우스 움직임 시뮬레이션
                     page.mouse.move(random.randint(100, 800), random.randint(100, 600))
-                    time.sleep(random.uniform(0.0625, 0.125))
+                    cancellable_sleep(random.uniform(0.0625, 0.125), cancel_token)
                     
                     # 페이지 스크롤
                     page.evaluate("window.scrollBy(0, 150)")
-                    time.sleep(random.uniform(0.0625, 0.125))
+                    cancellable_sleep(random.uniform(0.0625, 0.125), cancel_token)
                     
                     # 페이지 접속
                     print(f"리뷰 페이지로 이동 중...")
+                    check_cancelled(cancel_token)
                     page.goto(f"{self.url_rating_detail}{channel_id}/review/visitor")
                     
                     # 페이지가 완전히 로드될 때까지 대기
@@ -242,7 +247,7 @@ class Naver:
                         button = page.query_selector("a.dP0sq[role='button']")
                         if button:
                             button.click()
-                            time.sleep(random.uniform(0.0625, 0.125))  # 클릭 후 대기
+                            cancellable_sleep(random.uniform(0.0625, 0.125), cancel_token)  # 클릭 후 대기
                     
                     # 페이지에 "과도한 접근 요청" 문구가 있는지 확인
                     content = page.content()
@@ -253,15 +258,15 @@ class Naver:
                         # 더 긴 대기 시간
                         wait_time = 15 + retry_count * 15  # 15초, 30초, 45초...
                         print(f"{wait_time}초 후에 재시도합니다...")
-                        time.sleep(wait_time)
+                        cancellable_sleep(wait_time, cancel_token)
                         continue
                     
                     # 추가 지연 시간 및 활동 시뮬레이션
-                    time.sleep(random.uniform(0.125, 0.375))
+                    cancellable_sleep(random.uniform(0.125, 0.375), cancel_token)
                     
                     # 페이지에서 스크롤
                     page.evaluate("window.scrollBy(0, 150)")
-                    time.sleep(random.uniform(0.125, 0.25))
+                    cancellable_sleep(random.uniform(0.125, 0.25), cancel_token)
                     
                     # 페이지 내용 가져오기
                     html = page.content()
@@ -293,35 +298,43 @@ class Naver:
                     browser.close()
                     return reviews_data
                     
+            except FetchCancelled:
+                print(f"리뷰 수집이 취소되었습니다: {channel_id}")
+                return {"error": "요청이 취소되었습니다.", "status": "cancelled"}
             except Exception as e:
                 print(f"오류 발생: {str(e)}")
                 retry_count += 1
                 if retry_count < max_retries:
                     wait_time = 15 + retry_count * 15
                     print(f"{wait_time}초 후에 재시도합니다...")
-                    time.sleep(wait_time)
+                    cancellable_sleep(wait_time, cancel_token)
                 else:
                     return {"error": str(e), "status": "error"}
         
         return {"error": "최대 재시도 횟수 초과", "status": "failed"}
         
-    def get_rating_data(self, df, method='default'):
+    def get_rating_data(self, df, method='default', cancel_token=None):
         """
         리뷰 데이터를 수집하는 함수
         method: 'default', 'playwright', 'requests_html' 중 하나를 선택
+        cancel_token이 취소되면 남은 펜션은 수집하지 않음
         """
         rating_data = pd.DataFrame()
         errors = []  # 오류 기록용
         
         for index, row in tqdm(df.iterrows(), total=len(df)):
+            if cancel_token is not None and cancel_token.cancelled:
+                print("리뷰 수집이 취소되어 남은 펜션을 건너뜁니다.")
+                break
+            
             # 크롤링 메서드 선택
             if method == 'playwright':
-                result = self._get_rating_playwright(row['channelId'])
+                result = self._get_rating_playwright(row['channelId'], cancel_token)
             elif method == 'requests_html':
                 result = self._get_rating_requests_html(row['channelId'])
             else:  # default
                 # 개발 환경인 경우 playwright, 그렇지 않으면 일반 method 사용
-                result = self._get_rating_playwright(row['channelId']) if os.environ.get('STREAMLIT_DEVELOPMENT', 'false').lower() == 'true' else self._get_rating(row['channelId'])
+                result = self._get_rating_playwright(row['channelId'], cancel_token) if os.environ.get('STREAMLIT_DEVELOPMENT', 'false').lower() == 'true' else self._get_rating(row['channelId'])
             
             # 결과가 DataFrame인지 확인
             if isinstance(result, pd.DataFrame):
@@ -344,7 +357,7 @@ class Naver:
         
         # 수집된 데이터가 있는 경우만 저장
         if not rating_data.empty:
-            rating_data.to_csv('./static/database/rating_data.csv', index=False)
+            write_snapshot('rating_data', rating_data)
             return rating_data
         else:
             # 데이터가 없는 경우 빈 데이터프레임 반환
@@ -585,6 +598,13 @@ class Naver:
         # 최대 재시도 횟수를 초과한 경우
         return {"error": "최대 재시도 횟수 초과", "status": "failed"}
     
+# 보호 동물 조회 결과 컬럼 → 응답에 없을 때의 기본값
+PET_SCHEMA = {column: '' for column in [
+    'desertionNo', 'filename', 'happenDt', 'happenPlace', 'kindCd', 'colorCd', 'age', 'weight',
+    'noticeNo', 'noticeSdt', 'noticeEdt', 'popfile', 'processState', 'sexCd', 'neuterYn',
+    'specialMark', 'careNm', 'careTel', 'careAddr', 'orgNm', 'chargeNm', 'officetel'
+]}
+
 class Public:
     def __init__(self):
         self.public_key = "k/yxtkMUkNQCQ9C6AyTGUtC7Zd58Wbff8Ndb7WKFZX8a1PBAUr8zSzaeBNHFGkFd5CxYWaEM+iQzaejQ5M+LXQ=="
@@ -593,33 +613,21 @@ class Public:
         self.url_public_sigungu = "http://apis.data.go.kr/1543061/abandonmentPublicSrvc/sigungu"
         self.url_public_shelter = "http://apis.data.go.kr/1543061/abandonmentPublicSrvc/shelter"
         self.url_public_kind = "http://apis.data.go.kr/1543061/abandonmentPublicSrvc/kind"
-
-        self.shelter_data_path = './static/database/보호소코드.csv'
-        if os.path.exists(self.shelter_data_path):
-            try:
-                # CSV 파일에 이미 헤더가 있으므로 header=0(기본값)으로 읽음
-                self.shelter_data = pd.read_csv(self.shelter_data_path)
-                
-                self.shelter_data = self.shelter_data.drop_duplicates(subset=['보호소명'])
-                
-                # 컬럼 존재 여부 확인
-                if '보호소명' in self.shelter_data.columns and '시도명' in self.shelter_data.columns:
-                    self.shelter_to_sido = dict(zip(self.shelter_data['보호소명'], self.shelter_data['시도명']))
-                else:
-                    st.warning(f"보호소 데이터에 필요한 컬럼이 없습니다. 현재 컬럼: {', '.join(self.shelter_data.columns.tolist())}")
-                    self.shelter_to_sido = {}
-                    
-                if '보호소명' in self.shelter_data.columns and '시군구명' in self.shelter_data.columns:
-                    self.shelter_to_sigungu = dict(zip(self.shelter_data['보호소명'], self.shelter_data['시군구명']))
-                else:
-                    self.shelter_to_sigungu = {}
-            except Exception as e:
-                st.warning(f"보호소 코드 데이터 로딩 중 오류: {str(e)}")
-                self.shelter_to_sido = {}
-                self.shelter_to_sigungu = {}
+        # 시도/시군구/보호소 코드 조회 요청 제한 시간 (초)
+        self.timeout = 10
+        # 코드·건수 조회 응답 캐시를 이보다 오래되었으면 다시 확인 (None이면 엔드포인트별 유효 기간)
+        self.cache_max_age = None
+
+        # 보호소명 → 대표 관할 시도·시군구 (보호소마다 한 줄인 차원표 기준)
+        self.shelter_tables = get_shelter_tables()
+        if self.shelter_tables is not None:
+            primary = self.shelter_tables.dim.join(self.shelter_tables.primary, on='shelter_id')
+            self.shelter_to_sido = dict(zip(primary['보호소명'], primary['시도명']))
+            self.shelter_to_sigungu = dict(zip(primary['보호소명'], primary['시군구명']))
         else:
             st.warning("보호소 코드 데이터를 찾을 수 없습니다.")
             self.shelter_to_sido = {}
+            self.shelter_to_sigungu = {}
         
     def totalCount(self, upkind=None):
         params = {
@@ -629,7 +637,7 @@ class Public:
             'numOfRows': 1,
             'upkind': upkind
         }
-        res = req.get(self.url_public_animal, params=params)
+        res = cached_get(self.url_public_animal, params=params, timeout=self.timeout, max_age=self.cache_max_age)
         data = res.json()
         totalCount = data['response']['body']['totalCount']
         return totalCount
@@ -644,8 +652,10 @@ class Public:
             org_cd=None, 
             care_reg_no=None, 
             state=None, 
-            neuter_yn=None
+            neuter_yn=None,
+            raise_errors=False
         ):
+        """raise_errors가 True이면 요청·응답 오류를 빈 결과로 바꾸지 않고 그대로 발생 (재시도용)"""
         try:
             params = {
                 'serviceKey': self.public_key,
@@ -665,12 +675,14 @@ class Public:
             
             # 초기 API 호출로 총 개수 가져오기
             res = req.get(self.url_public_animal, params=params)
-            data = res.json()
+            data = loads(res.content)
             
             # 응답 확인
             if ('response' not in data or 
                 'body' not in data['response'] or 
                 'totalCount' not in data['response']['body']):
+                if raise_errors:
+                    raise ValueError(f"API 응답 형식 오류 - 축종: {upkind}, 시도코드: {upr_cd}")
                 print("API 응답 형식 오류 - 기본 정보를 가져올 수 없습니다.")
                 return pd.DataFrame()
             
@@ -680,8 +692,6 @@ class Public:
                 print("검색 조건에 맞는 동물 데이터가 없습니다.")
                 return pd.DataFrame()
             
-            result = []
-            
             def fetch_pet_data(page):
                 try:
                     # 페이지별 파라미터 설정
@@ -690,31 +700,22 @@ class Public:
                     
                     # API 호출
                     res = req.get(self.url_public_animal, params=page_params)
-                    data = res.json()
+                    petlist = public_items(loads(res.content))
                     
                     # 응답 검증
-                    if ('response' not in data or 
-                        'body' not in data['response'] or 
-                        'items' not in data['response']['body']):
+                    if petlist is None:
+                        if raise_errors:
+                            raise ValueError(f"페이지 {page}에서 API 응답 형식 오류")
                         print(f"페이지 {page}에서 API 응답 형식 오류")
                         return []
                     
-                    items = data['response']['body']['items']
-                    
-                    # items가 없거나 비어있는 경우
-                    if not items or 'item' not in items:
+                    if not petlist:
                         print(f"페이지 {page}에 데이터가 없습니다.")
-                        return []
-                    
-                    petlist = items['item']
-                    
-                    # 단일 항목인 경우 리스트로 변환
-                    if isinstance(petlist, dict):
-                        petlist = [petlist]
-                    
                     return petlist
                     
                 except Exception as e:
+                    if raise_errors:
+                        raise
                     print(f"페이지 {page} 데이터 가져오기 실패: {str(e)}")
                     return []
             
@@ -722,40 +723,8 @@ class Public:
                 pages = range(1, min(ceil(totalCount / 1000) + 1, 10))  # 너무 많은 페이지 방지
                 pet_lists = list(executor.map(fetch_pet_data, pages))
             
-            for petlist in pet_lists:
-                for pet in petlist:
-                    try:
-                        pet_data = {
-                            'desertionNo': pet.get('desertionNo', ''),
-                            'filename': pet.get('filename', ''),
-                            'happenDt': pet.get('happenDt', ''),
-                            'happenPlace': pet.get('happenPlace', ''),
-                            'kindCd': pet.get('kindCd', ''),
-                            'colorCd': pet.get('colorCd', ''),
-                            'age': pet.get('age', ''),
-                            'weight': pet.get('weight', ''),
-                            'noticeNo': pet.get('noticeNo', ''),
-                            'noticeSdt': pet.get('noticeSdt', ''),
-                            'noticeEdt': pet.get('noticeEdt', ''),
-                            'popfile': pet.get('popfile', ''),
-                            'processState': pet.get('processState', ''),
-                            'sexCd': pet.get('sexCd', ''),
-                            'neuterYn': pet.get('neuterYn', ''),
-                            'specialMark': pet.get('specialMark', ''),
-                            'careNm': pet.get('careNm', ''),
-                            'careTel': pet.get('careTel', ''),
-                            'careAddr': pet.get('careAddr', ''),
-                            'orgNm': pet.get('orgNm', ''),
-                            'chargeNm': pet.get('chargeNm', ''),
-                            'officetel': pet.get('officetel', '')
-                        }
-                        result.append(pet_data)
-                    except Exception as e:
-                        print(f"동물 데이터 처리 오류: {str(e)}")
-                        continue
-            
-            # 결과를 데이터프레임으로 변환
-            df = pd.DataFrame(result)
+            # 결과를 데이터프레임으로 변환 (컬럼별로 한 번에 생성)
+            df = decode_items([pet for petlist in pet_lists for pet in petlist], PET_SCHEMA)
             
             # 날짜 형식 변환 시도
             date_columns = ['happenDt', 'noticeSdt', 'noticeEdt']
@@ -774,6 +743,8 @@ class Public:
             return df
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"동물 데이터 검색 중 오류 발생: {str(e)}")
             return pd.DataFrame()
     
@@ -784,7 +755,7 @@ class Public:
             'pageNo': 1,
             'numOfRows': 1000
         }
-        res = req.get(self.url_public_sido, params=params)
+        res = cached_get(self.url_public_sido, params=params, timeout=self.timeout, max_age=self.cache_max_age)
         data = res.json()
         sido_list = data['response']['body']['items']['item']
         result = []
@@ -802,9 +773,12 @@ class Public:
             'numOfRows': 1000,
             'upr_cd': upr_cd
         }
-        res = req.get(self.url_public_sigungu, params=params)
+        res = cached_get(self.url_public_sigungu, params=params, timeout=self.timeout, max_age=self.cache_max_age)
         data = res.json()
         sigungu_list = data['response']['body']['items']['item']
+        # 시군구가 하나뿐이면 목록이 아닌 딕셔너리로 옴 (예: 세종특별자치시)
+        if isinstance(sigungu_list, dict):
+            sigungu_list = [sigungu_list]
         result = []
         for sigungu in sigungu_list:
             orgCd = sigungu['orgCd']
@@ -812,7 +786,8 @@ class Public:
             result.append({'시군구코드': orgCd, '시군구명': orgdownNm})
         return pd.DataFrame(result)
     
-    def find_shelter(self, upr_cd=None, org_cd=None):
+    def find_shelter(self, upr_cd=None, org_cd=None, raise_errors=False):
+        """raise_errors가 True이면 요청·응답 오류를 빈 결과로 바꾸지 않고 그대로 발생 (재시도용)"""
         params = {
             'serviceKey': self.public_key,
             '_type': 'json',
@@ -823,13 +798,15 @@ class Public:
         }
         
         try:
-            res = req.get(self.url_public_shelter, params=params)
+            res = cached_get(self.url_public_shelter, params=params, timeout=self.timeout, max_age=self.cache_max_age)
             data = res.json()
             
             # 응답 구조 검증
             if ('response' not in data or 
                 'body' not in data['response'] or 
                 'items' not in data['response']['body']):
+                if raise_errors:
+                    raise ValueError(f"API 응답 형식 오류 - 시도코드: {upr_cd}, 시군구코드: {org_cd}")
                 print(f"API 응답 형식 오류 또는 데이터 없음 - 시도코드: {upr_cd}, 시군구코드: {org_cd}")
                 return pd.DataFrame(columns=['보호소코드', '보호소명'])
             
@@ -863,6 +840,8 @@ class Public:
             return pd.DataFrame(result)
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"보호소 조회 중 오류 발생: {str(e)} - 시도코드: {upr_cd}, 시군구코드: {org_cd}")
             return pd.DataFrame(columns=['보호소코드', '보호소명'])
 
@@ -878,7 +857,7 @@ class Public:
             'up_kind_cd': up_kind_cd,
             '_type': 'json'
         }
-        res = req.get(self.url_public_kind, params=params)
+        res = cached_get(self.url_public_kind, params=params, timeout=self.timeout, max_age=self.cache_max_age)
         data = res.json()
         kind_list = data['response']['body']['items']['item']
         result = []
@@ -888,75 +867,22 @@ class Public:
             result.append({'품종코드': kindCd, '품종명': KNm})
         return pd.DataFrame(result)
 
-    def update_shelter_info(self):
-        result_sido = self.find_sido()
-        result_sido.to_csv('./static/database/시도코드.csv', index=False)
-        result_sigungu = pd.DataFrame()
-
-        def process_sigungu(row):
-            upr_cd = row['시도코드']
-            upr_nm = row['시도명']
-            result = self.find_sigungu(upr_cd)
-            result['시도코드'] = upr_cd
-            result['시도명'] = upr_nm
-            return result
-
-        with ThreadPoolExecutor() as executor:
-            results = list(
-                tqdm(
-                    executor.map(process_sigungu, 
-                                  [row for _, row in result_sido.iterrows()]), 
-                    total=len(result_sido)
-                )
-            )
-
-        result_sigungu = pd.concat(results, ignore_index=True)
-        result_sigungu.to_csv('./static/database/시군구코드.csv', index=False)
-        result_shelter = pd.DataFrame()
-
-        def process_shelter(row):
-            upr_cd = row['시도코드']
-            upr_nm = row['시도명']
-            org_cd = row['시군구코드']
-            org_nm = row['시군구명']
-            result = self.find_shelter(upr_cd, org_cd)
-            result['시도코드'] = upr_cd
-            result['시도명'] = upr_nm
-            result['시군구코드'] = org_cd
-            result['시군구명'] = org_nm
-            return result
-
-        with ThreadPoolExecutor() as executor:
-            shelter_results = list(
-                tqdm(
-                    executor.map(process_shelter, 
-                                  [row for _, row in result_sigungu.iterrows()]), 
-                    total=len(result_sigungu)
-                )
-            )
-
-        result_shelter = pd.concat(shelter_results, ignore_index=True)
-        result_shelter.to_csv('./static/database/보호소코드.csv', index=False)
+    def update_shelter_info(self, on_progress=None, cancel_token=None, resume=True, **crawler_options):
+        """
+        시도 → 시군구 → 보호소 코드를 조회해 바뀐 시군구만 CSV에 반영
+        on_progress(done, total, message)가 주어지면 단계별 진행률을 전달하고,
+        중단된 이전 조회가 있으면 남은 항목만 이어서 조회합니다.
+        crawler_options(workers, rate, retries)는 ShelterCodeCrawler에 그대로 전달하며,
+        모든 재시도가 실패한 항목은 self.shelter_crawl_failed에 남습니다.
+        """
+        # 코드표 재구축은 캐시된 응답을 쓰지 않고 항상 다시 확인 (중단 후 이어서 조회하는 항목은 작업 파일에 있음)
+        self.cache_max_age = 0
+        crawler = ShelterCodeCrawler(self, cancel_token=cancel_token, on_progress=on_progress, **crawler_options)
+        _, _, result_shelter, changed = crawler.run(resume=resume)
+        self.shelter_crawl_failed = dict(crawler.state['failed'])
+        print(f"보호소 코드 조회 완료: 바뀐 시군구 {changed:,}곳, 실패 {len(self.shelter_crawl_failed):,}건")
+        return result_shelter
 
-    def extract_birth_year(self, age_string):
-        try:
-            if pd.isna(age_string) or not isinstance(age_string, str):
-                return None
-                
-            # 괄호 앞의 숫자 추출 (예: "2017(년생)" -> "2017")
-            match = re.search(r'^(\d{4})(?:\s*\(|$)', age_string.strip())
-            if match:
-                year = int(match.group(1))
-                # 유효한 연도 범위 확인 (1990년부터 현재 연도까지)
-                current_year = datetime.now().year
-                if 1990 <= year <= current_year + 1:  # +1은 내년 출생 표기도 허용
-                    return year
-            return None
-        except Exception:
-            return None
-        
-    
-    
 
 class AKC:
     def __init__(self):
@@ -0,0 +1,159 @@
+"""
+네이버 숙박 일정과 리뷰를 병렬로 수집하는 모듈
+각 펜션 상품의 결과는 완료되는 순서대로 전달되어 화면에 바로 추가할 수 있습니다.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from src.data import Naver
+from src.cancel import FetchCancelled
+
+# 일정 데이터 컬럼 → 화면 표시용 컬럼
+SCHEDULE_COLUMNS = {
+    'businessName': '숙박업소',
+    'bizItemName': '숙박상품',
+    'date': '날짜',
+    'prices': '가격',
+    'address': '주소'
+}
+
+
+def parse_prices(prices):
+    """
+    가격 컬럼을 숫자(원)로 변환
+    예전 스냅샷처럼 "450,000" 형식의 문자열로 저장된 가격도 한 번에 변환합니다. (변환할 수 없는 값이 있으면 NaN이 들어간 실수 컬럼)
+    """
+    if pd.api.types.is_numeric_dtype(prices):
+        return prices
+    return pd.to_numeric(prices.astype(str).str.replace(',', '', regex=False), errors='coerce')
+
+
+def get_region_from_address(address):
+    """주소에서 지역 정보 추출"""
+    if pd.isna(address):
+        return "미분류"
+
+    regions = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종",
+               "경기", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"]
+
+    for region in regions:
+        if region in address:
+            return region
+
+    return "기타"
+
+
+def fetch_schedule_row(naver, row, start_date_str, end_date_str, cancel_token=None):
+    """
+    펜션 상품 하나의 판매일 일정을 조회해 화면 표시용 컬럼으로 정리
+    일정을 받지 못하면(None) 오류를 발생시켜 호출한 쪽에서 펜션별로 경고하도록 하고, 판매일이 없으면 None 반환
+    """
+    schedule_data = naver.get_schedule(
+        str(row.businessId).strip(),
+        str(row.bizItemId).strip(),
+        start_date_str,
+        end_date_str,
+        cancel_token=cancel_token
+    )
+    if schedule_data is None:
+        raise RuntimeError("일정 응답이 없습니다.")
+    if schedule_data.empty:
+        return None
+
+    schedule_data = schedule_data[schedule_data['isSaleDay'] == True].copy()
+    schedule_data['businessName'] = row.businessName
+    schedule_data['bizItemName'] = row.bizItemName
+    schedule_data['address'] = row.addressNew
+
+    result = schedule_data[list(SCHEDULE_COLUMNS)].rename(columns=SCHEDULE_COLUMNS)
+    result['지역'] = get_region_from_address(row.addressNew)
+    return result
+
+
+def iter_schedule_results(pension_info, start_date_str, end_date_str, max_workers=10, cancel_token=None):
+    """
+    펜션 상품별 일정을 병렬로 조회하고 완료되는 순서대로 (row, 결과, 오류)를 반환
+    결과는 판매일이 없으면 None, 오류가 없으면 오류 값은 None 입니다. (일정을 받지 못한 펜션은 오류로 전달)
+    cancel_token이 취소되거나 제너레이터가 닫히면 아직 시작하지 않은 요청은 실행하지 않습니다.
+    """
+    naver = Naver()
+    rows = list(pension_info.itertuples(index=False))
+    if not rows:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(rows)))
+    futures = {
+        executor.submit(fetch_schedule_row, naver, row, start_date_str, end_date_str, cancel_token): row
+        for row in rows
+    }
+    try:
+        for future in as_completed(futures):
+            row = futures[future]
+            try:
+                yield row, future.result(), None
+            except FetchCancelled:
+                return
+            except Exception as e:
+                yield row, None, e
+    finally:
+        # 중단된 경우 대기 중인 요청을 취소하고 실행 중인 요청은 기다리지 않음
+        if cancel_token is not None:
+            cancel_token.cancel()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def empty_schedule_frame():
+    """일정 결과와 같은 컬럼을 가진 빈 데이터프레임"""
+    return pd.DataFrame(columns=list(SCHEDULE_COLUMNS.values()) + ['지역'])
+
+
+def fetch_rating_data(pension_info, max_workers=5, cancel_token=None, on_progress=None):
+    """
+    펜션별 네이버 리뷰 데이터를 병렬로 수집해 하나의 데이터프레임으로 반환
+    on_progress(done, total, message)가 주어지면 펜션 하나가 끝날 때마다 호출됩니다.
+    """
+    naver = Naver()
+    rows = list(pension_info.itertuples(index=False))
+    total = len(rows)
+    if not rows:
+        return pd.DataFrame()
+
+    def fetch_rating_worker(row):
+        result = naver._get_rating_playwright(row.channelId, cancel_token)
+        if isinstance(result, pd.DataFrame):
+            result['businessName'] = row.businessName
+            result['channelId'] = row.channelId
+        return result
+
+    all_results = []
+    completed_count = 0
+    if on_progress is not None:
+        on_progress(0, total, "리뷰 데이터 수집 대기 중...")
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, total)))
+    futures = {executor.submit(fetch_rating_worker, row): row for row in rows}
+    try:
+        for future in as_completed(futures):
+            row = futures[future]
+            try:
+                result = future.result()
+                if isinstance(result, pd.DataFrame):
+                    all_results.append(result)
+                elif result.get('status') != 'cancelled':
+                    print(f"오류: {row.businessName}의 리뷰 데이터 형식이 올바르지 않음")
+            except Exception as e:
+                print(f"오류 발생: {row.businessName} - {str(e)}")
+
+            completed_count += 1
+            if on_progress is not None:
+                on_progress(completed_count, total, f"리뷰 데이터 수집 중... ({completed_count}/{total})")
+    finally:
+        # 중단된 경우 남은 스크래핑도 취소
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    if not all_results:
+        return pd.DataFrame()
+    return pd.concat(all_results, ignore_index=True)
@@ -0,0 +1,205 @@
+"""
+보호 동물 필터 인덱스
+데이터가 바뀔 때 한 번만 품종, 시도, 시군구, 성별, 출생년도별 위치 배열과 정렬된 발견일 배열을 만들어 두고,
+필터 조합은 가장 작은 후보 위치 배열에서 시작해 나머지 조건의 코드만 확인하는 방식으로 계산합니다.
+원본 데이터프레임은 복사하지 않으며, 조회 비용은 전체 행 수가 아니라 후보 수에 비례합니다.
+목록 화면은 같은 인덱스에서 정렬 순위를 조회해 보이는 페이지의 행만 꺼냅니다.
+"""
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.shelter_ingest import UNKNOWN_REGION
+
+# 인덱스를 만드는 컬럼
+INDEX_COLUMNS = ['kindCd', '시도', '시군구', 'sexCd', '출생년도']
+
+# 세션마다 데이터가 따로 있으므로 최근에 사용한 데이터 몇 개의 인덱스만 유지
+MAX_CACHED_INDEXES = 8
+
+
+class ColumnIndex:
+    """한 컬럼의 값 → 행 위치 배열 (위치는 오름차순)"""
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        self.codes = codes.astype(np.int32)
+        self.values = list(uniques)
+        self.lookup = {value: code for code, value in enumerate(self.values)}
+        # 코드별 위치를 한 배열에 모아 두고 시작 위치(offsets)로 나눔
+        order = np.argsort(self.codes, kind='stable')
+        sorted_codes = self.codes[order]
+        self.order = order[sorted_codes >= 0]
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.values))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def code(self, value):
+        return self.lookup.get(value, -2)
+
+    def positions(self, value):
+        code = self.code(value)
+        if code < 0:
+            return np.empty(0, dtype=np.int64)
+        return self.order[self.offsets[code]:self.offsets[code + 1]]
+
+    def count(self, value):
+        code = self.code(value)
+        return 0 if code < 0 else int(self.offsets[code + 1] - self.offsets[code])
+
+
+class ShelterFilterIndex:
+    """보호 동물 데이터의 필터 선택지와 필터 조합 조회"""
+
+    def __init__(self, data):
+        self.data = data
+        self.size = len(data)
+        self.columns = {column: ColumnIndex(data[column]) for column in INDEX_COLUMNS if column in data.columns}
+
+        happen = pd.to_datetime(data['happenDt'], errors='coerce').to_numpy(dtype='datetime64[D]')
+        self.date_order = np.argsort(happen, kind='stable')
+        self.sorted_dates = happen[self.date_order]
+        valid = ~np.isnat(self.sorted_dates)
+        self.date_order = self.date_order[valid]
+        self.sorted_dates = self.sorted_dates[valid]
+        self.dates = happen
+
+        # 선택지 목록
+        self.kinds = sorted(str(v) for v in self._values('kindCd'))
+        self.sexes = sorted(s for s in self._values('sexCd') if s and s != ' ')
+        self.sidos = sorted(s for s in self._values('시도') if s != UNKNOWN_REGION)
+        self.birth_years = sorted((int(y) for y in self._values('출생년도') if len(str(int(y))) == 4), reverse=True)
+        self.min_date = pd.Timestamp(self.sorted_dates[0]).date() if len(self.sorted_dates) else None
+        self.max_date = pd.Timestamp(self.sorted_dates[-1]).date() if len(self.sorted_dates) else None
+
+        self._sigungu_by_sido = {}
+        self._ranks = {}
+        self._row_of = None
+
+    def _values(self, column):
+        return self.columns[column].values if column in self.columns else []
+
+    def sigungus(self, sido):
+        """시도에 속한 시군구 목록"""
+        if sido not in self._sigungu_by_sido:
+            positions = self.columns['시도'].positions(sido)
+            codes = np.unique(self.columns['시군구'].codes[positions])
+            values = self.columns['시군구'].values
+            self._sigungu_by_sido[sido] = sorted(str(values[c]) for c in codes if c >= 0)
+        return self._sigungu_by_sido[sido]
+
+    def _date_positions(self, date_from, date_to):
+        start = 0 if date_from is None else np.searchsorted(self.sorted_dates, np.datetime64(date_from, 'D'), side='left')
+        end = len(self.sorted_dates) if date_to is None else np.searchsorted(self.sorted_dates, np.datetime64(date_to, 'D'), side='right')
+        return self.date_order[start:end]
+
+    def query(self, date_from=None, date_to=None, **conditions):
+        """
+        조건에 맞는 행 위치 (오름차순)
+        conditions는 컬럼명=값 형식이며 값이 None인 조건은 무시합니다. (예: kindCd='말티즈', 시도='서울특별시')
+        """
+        conditions = {column: value for column, value in conditions.items() if value is not None}
+        date_filtered = date_from is not None and self.min_date is not None and date_from > self.min_date \
+            or date_to is not None and self.max_date is not None and date_to < self.max_date
+
+        # 후보 수가 가장 적은 조건에서 시작
+        candidates = []
+        for column, value in conditions.items():
+            candidates.append((self.columns[column].count(value), column, value))
+        candidates.sort(key=lambda item: item[0])
+
+        if candidates:
+            _, column, value = candidates[0]
+            positions = self.columns[column].positions(value)
+            for _, column, value in candidates[1:]:
+                index = self.columns[column]
+                positions = positions[index.codes[positions] == index.code(value)]
+            if date_filtered:
+                dates = self.dates[positions]
+                keep = ~np.isnat(dates)
+                if date_from is not None:
+                    keep &= dates >= np.datetime64(date_from, 'D')
+                if date_to is not None:
+                    keep &= dates <= np.datetime64(date_to, 'D')
+                positions = positions[keep]
+            return positions
+        if date_filtered:
+            return np.sort(self._date_positions(date_from, date_to))
+        return np.arange(self.size)
+
+    def count(self, **conditions):
+        return len(self.query(**conditions))
+
+    def positions_of(self, frame):
+        """인덱스 데이터에서 잘라낸 데이터프레임의 행 위치 (인덱스 데이터가 아니면 None)"""
+        if frame is self.data:
+            return np.arange(self.size)
+        if not self.data.index.is_unique:
+            return None
+        positions = self.data.index.get_indexer(frame.index)
+        if (positions < 0).any():
+            return None
+        return positions
+
+    def rows_for(self, desertion_nos):
+        """유기번호 목록 → 행 위치 (주어진 순서 유지, 없는 번호는 제외)"""
+        if self._row_of is None:
+            self._row_of = {no: i for i, no in enumerate(self.data['desertionNo'].tolist())}
+        return np.array([self._row_of[no] for no in desertion_nos if no in self._row_of], dtype=np.int64)
+
+    def contains(self, positions, column, text):
+        """column 값에 text가 포함된 행만 남김 (값 목록에서 한 번만 비교)"""
+        index = self.columns.get(column) or ColumnIndex(self.data[column])
+        self.columns[column] = index
+        codes = [code for code, value in enumerate(index.values) if text in str(value)]
+        return positions[np.isin(index.codes[positions], codes)]
+
+    def rank(self, column):
+        """행 위치 → column 정렬 순위 (결측은 마지막, 처음 정렬할 때 한 번만 계산)"""
+        if column not in self._ranks:
+            if column == 'happenDt':
+                values = self.dates
+                order = np.argsort(values, kind='stable')
+            else:
+                codes, uniques = pd.factorize(self.data[column], sort=True)
+                order = np.argsort(np.where(codes < 0, len(uniques), codes), kind='stable')
+            rank = np.empty(self.size, dtype=np.int64)
+            rank[order] = np.arange(self.size)
+            self._ranks[column] = rank
+        return self._ranks[column]
+
+    def page(self, positions, sort_by=None, ascending=True, start=0, size=50):
+        """정렬한 positions 중 start부터 size개의 행 위치"""
+        if sort_by is not None:
+            rank = self.rank(sort_by)[positions]
+            if not ascending:
+                rank = -rank
+            end = min(start + size, len(positions))
+            if end <= 0:
+                return positions[:0]
+            # 보이는 페이지까지만 부분 정렬
+            if end < len(positions):
+                head = np.argpartition(rank, end - 1)[:end]
+                head = head[np.argsort(rank[head], kind='stable')]
+            else:
+                head = np.argsort(rank, kind='stable')
+            return positions[head[start:end]]
+        return positions[start:start + size]
+
+    def take(self, positions):
+        """위치 배열에 해당하는 행 (원본 순서 유지)"""
+        return self.data.iloc[positions]
+
+
+_indexes = OrderedDict()
+
+
+def get_filter_index(data):
+    """같은 데이터프레임이면 이미 만든 인덱스를 재사용"""
+    key = id(data)
+    index = _indexes.get(key)
+    if index is None or index.data is not data:
+        index = ShelterFilterIndex(data)
+        _indexes[key] = index
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    _indexes.move_to_end(key)
+    return index
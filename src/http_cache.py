@@ -0,0 +1,155 @@
+"""
+공공데이터 API 응답 캐시
+자주 바뀌지 않는 응답(시도·시군구·보호소·품종 코드, 전체 건수)을 엔드포인트와 정렬한 파라미터로 만든 키로
+gzip 압축해 디스크에 저장하고, 엔드포인트별 유효 기간 동안은 요청하지 않습니다.
+유효 기간이 지나면 ETag/Last-Modified로 조건부 요청을 보내고, 요청이 실패하면 지난 응답을 사용합니다.
+"""
+import os
+import json
+import gzip
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit
+import requests
+
+HTTP_CACHE_DIR = './static/cache/http'
+
+# 캐시 키와 기록 파일에서 제외하는 파라미터 (인증키)
+SECRET_PARAMS = {'serviceKey'}
+
+# 엔드포인트 경로의 마지막 부분 → 유효 기간 (초)
+ENDPOINT_TTLS = {
+    'sido': 7 * 24 * 60 * 60,
+    'sigungu': 7 * 24 * 60 * 60,
+    'shelter': 24 * 60 * 60,
+    'kind': 7 * 24 * 60 * 60,
+    'abandonmentPublic': 10 * 60
+}
+DEFAULT_TTL = 60 * 60
+
+
+class CachedResponse:
+    """requests.Response 중 캐시에서 쓰는 부분만 갖춘 응답"""
+
+    def __init__(self, status_code, text, headers=None, from_cache=False):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    @property
+    def content(self):
+        return self.text.encode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def cache_key(url, params=None):
+    """엔드포인트(쿼리 제외)와 인증키를 뺀 파라미터를 정렬해 만든 키"""
+    parts = urlsplit(url)
+    endpoint = f"{parts.scheme}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+    normalized = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None and k not in SECRET_PARAMS)
+    return hashlib.sha1(json.dumps([endpoint, normalized], ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def endpoint_ttl(url):
+    return ENDPOINT_TTLS.get(urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1], DEFAULT_TTL)
+
+
+def is_json(text):
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return False
+
+
+class HttpCache:
+    def __init__(self, directory=HTTP_CACHE_DIR):
+        self.directory = directory
+        self.lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def load(self, key):
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key, entry):
+        path = self.path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def get(self, url, params=None, ttl=None, max_age=None, timeout=None, **kwargs):
+        """
+        캐시를 거친 GET 요청
+        ttl은 엔드포인트 기본 유효 기간 대신 쓸 값이고, max_age를 주면 그보다 오래된 캐시는 다시 확인합니다. (0이면 항상 확인)
+        """
+        key = cache_key(url, params)
+        entry = self.load(key)
+
+        ttl = endpoint_ttl(url) if ttl is None else ttl
+        if max_age is not None:
+            ttl = min(ttl, max_age)
+        if entry is not None and time.time() - entry['fetched_at'] < ttl:
+            return CachedResponse(entry['status'], entry['body'], entry.get('headers'), from_cache=True)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            if entry['headers'].get('ETag'):
+                headers['If-None-Match'] = entry['headers']['ETag']
+            if entry['headers'].get('Last-Modified'):
+                headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        try:
+            response = requests.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            # 요청이 실패하면 지난 응답이라도 사용
+            if entry is not None:
+                return CachedResponse(entry['status'], entry['body'], entry.get('headers'), from_cache=True)
+            raise
+
+        if response.status_code == 304 and entry is not None:
+            entry['fetched_at'] = time.time()
+            self.store(key, entry)
+            return CachedResponse(entry['status'], entry['body'], entry.get('headers'), from_cache=True)
+
+        # 인증키 오류 등은 200이어도 XML로 오므로 JSON 응답만 저장
+        if response.status_code == 200 and is_json(response.text):
+            self.store(key, {
+                'url': url,
+                'params': {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS},
+                'status': response.status_code,
+                'headers': {h: response.headers[h] for h in ('ETag', 'Last-Modified') if h in response.headers},
+                'fetched_at': time.time(),
+                'body': response.text
+            })
+        elif entry is not None:
+            return CachedResponse(entry['status'], entry['body'], entry.get('headers'), from_cache=True)
+        return response
+
+
+_caches = {}
+
+
+def get_http_cache(directory=HTTP_CACHE_DIR):
+    """프로세스에서 하나의 응답 캐시를 공유"""
+    if directory not in _caches:
+        _caches[directory] = HttpCache(directory)
+    return _caches[directory]
+
+
+def cached_get(url, params=None, **kwargs):
+    return get_http_cache().get(url, params=params, **kwargs)
@@ -0,0 +1,176 @@
+"""
+보호 동물 사진 캐시
+animal.go.kr의 사진을 한 번만 내려받아 목록용 썸네일(작은 사진 filename에서)과
+상세 화면용 중간 크기 이미지(원본 사진 popfile에서)로 줄여 디스크에 저장합니다.
+캐시 전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 파일부터 지우고,
+목록에 보이는 행의 사진은 백그라운드에서 미리 받아 둡니다.
+"""
+import os
+import io
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from PIL import Image, features
+
+IMAGE_CACHE_DIR = './static/cache/images'
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+# 크기 이름 → 최대 가로·세로 (px)
+IMAGE_SIZES = {
+    'thumb': (200, 200),
+    'medium': (720, 720)
+}
+IMAGE_QUALITY = 80
+IMAGE_FORMAT, IMAGE_EXT = ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+
+FETCH_TIMEOUT = 10
+PREFETCH_WORKERS = 4
+
+
+def image_key(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def resize_image(data, size):
+    """원본 이미지 바이트를 size 안에 들어가도록 줄인 이미지 바이트"""
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert('RGB')
+        image.thumbnail(size)
+        buffer = io.BytesIO()
+        image.save(buffer, IMAGE_FORMAT, quality=IMAGE_QUALITY)
+        return buffer.getvalue()
+
+
+class ImageCache:
+    """URL → 크기별로 줄인 로컬 이미지 파일 (LRU 크기 제한)"""
+
+    def __init__(self, directory=IMAGE_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # (url, 크기) → 내려받기 완료 이벤트
+        self.pending = {}
+        self.executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='image-prefetch')
+        os.makedirs(directory, exist_ok=True)
+
+        # 파일 경로 → 크기 (오래 사용하지 않은 순)
+        self.entries = OrderedDict()
+        files = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith('.tmp') or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            files.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(files):
+            self.entries[path] = size
+        self.total_bytes = sum(self.entries.values())
+
+    def path(self, url, size):
+        return os.path.join(self.directory, f"{image_key(url)}_{size}.{IMAGE_EXT}")
+
+    def _touch(self, path):
+        with self.lock:
+            if path in self.entries:
+                self.entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _store(self, path, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self.lock:
+            self.total_bytes += len(data) - self.entries.pop(path, 0)
+            self.entries[path] = len(data)
+            self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            path, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def fetch(self, url, size):
+        """원본을 내려받아 size 크기로 줄여 저장 (실패하면 False)"""
+        try:
+            response = requests.get(url, timeout=FETCH_TIMEOUT)
+            response.raise_for_status()
+            self._store(self.path(url, size), resize_image(response.content, IMAGE_SIZES[size]))
+            return True
+        except (requests.RequestException, OSError, ValueError):
+            return False
+
+    def _claim(self, url, size):
+        """
+        (url, size) 내려받기를 한 곳에서만 하도록 등록
+        (완료 이벤트, 직접 내려받아야 하는지) 반환 (이미 받는 중이면 그 이벤트를 기다림)
+        """
+        with self.lock:
+            event = self.pending.get((url, size))
+            if event is not None:
+                return event, False
+            event = threading.Event()
+            self.pending[(url, size)] = event
+            return event, True
+
+    def _fetch_claimed(self, url, size, event):
+        try:
+            return self.fetch(url, size)
+        finally:
+            with self.lock:
+                self.pending.pop((url, size), None)
+            event.set()
+
+    def cached(self, url, size='thumb'):
+        """이미 캐시된 이미지 경로 (없으면 내려받지 않고 None)"""
+        if not isinstance(url, str) or not url.startswith('http'):
+            return None
+        path = self.path(url, size)
+        if not os.path.exists(path):
+            return None
+        self._touch(path)
+        return path
+
+    def get(self, url, size='medium'):
+        """캐시된 이미지 경로 (없으면 내려받고, 실패하면 None)"""
+        if not isinstance(url, str) or not url.startswith('http'):
+            return None
+        path = self.path(url, size)
+        if not os.path.exists(path):
+            event, owner = self._claim(url, size)
+            if owner:
+                self._fetch_claimed(url, size, event)
+            else:
+                # 미리 받는 중인 이미지는 새로 요청하지 않고 끝나기를 기다림
+                event.wait(FETCH_TIMEOUT * 2)
+        return self.cached(url, size)
+
+    def prefetch(self, urls, size='medium'):
+        """아직 캐시되지 않은 이미지를 백그라운드에서 내려받음"""
+        for url in urls:
+            if not isinstance(url, str) or not url.startswith('http'):
+                continue
+            if os.path.exists(self.path(url, size)):
+                continue
+            event, owner = self._claim(url, size)
+            if owner:
+                self.executor.submit(self._fetch_claimed, url, size, event)
+
+
+_caches = {}
+
+
+def get_image_cache(directory=IMAGE_CACHE_DIR):
+    """프로세스에서 하나의 이미지 캐시를 공유"""
+    if directory not in _caches:
+        _caches[directory] = ImageCache(directory)
+    return _caches[directory]
@@ -0,0 +1,191 @@
+"""
+보호 동물 입소 집계표
+발견일 주(월요일 시작) × 시도 × 시군구 × 품종(kindCd) × 상태(processState)별 마릿수를 집계표로 저장하고,
+보호 동물 스냅샷을 갱신할 때마다 새로 들어오거나 상태가 바뀐 동물만 반영합니다.
+추이 화면은 원본 보호 동물 데이터를 다시 집계하지 않고 이 집계표만 조회합니다.
+집계표는 실행 중에 갱신되는 파일이므로 캐시 폴더에 두고, 없으면 보호 동물 스냅샷으로 처음 만듭니다.
+갱신 데몬, 페이지 세션, batch_fetch가 동시에 갱신할 수 있으므로 잠금 파일로 한 번에 하나씩 반영합니다.
+"""
+import os
+import threading
+from contextlib import contextmanager
+import pandas as pd
+from src.shelter_ingest import ensure_ingested
+from src.kind_mapping import KIND_PREFIX_PATTERN
+from src.snapshot import read_snapshot
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+INTAKE_DIR = './static/cache/intake'
+INTAKE_ROLLUP_PATH = os.path.join(INTAKE_DIR, 'intake_rollup.csv')
+# 유기번호별로 집계에 반영한 값 (상태가 바뀌면 이전 값을 빼기 위해 보관)
+INTAKE_LEDGER_PATH = os.path.join(INTAKE_DIR, 'intake_ledger.csv')
+
+ROLLUP_KEYS = ['week', '시도', '시군구', 'kindCd', 'processState']
+LEDGER_COLUMNS = ['desertionNo'] + ROLLUP_KEYS
+
+# 보관 기간 (주)
+RETENTION_WEEKS = 53
+
+
+def intake_week(happenDt):
+    """발견일이 속한 주의 월요일 ("YYYY-MM-DD")"""
+    dates = pd.to_datetime(happenDt, errors='coerce')
+    return (dates - pd.to_timedelta(dates.dt.weekday, unit='D')).dt.strftime('%Y-%m-%d')
+
+
+def ledger_rows(petinshelter):
+    """보호 동물 데이터 → 집계에 반영할 (유기번호, 집계 키) 행"""
+    df = ensure_ingested(petinshelter)
+    rows = pd.DataFrame({
+        'desertionNo': df['desertionNo'].astype(str),
+        'week': intake_week(df['happenDt']),
+        '시도': df['시도'].astype(str),
+        '시군구': df['시군구'].astype(str),
+        'kindCd': df['kindCd'].astype(str),
+        'processState': df['processState'].fillna('').astype(str)
+    })
+    return rows.dropna(subset=['week']).drop_duplicates('desertionNo', keep='last')
+
+
+def count_rows(rows, sign=1):
+    counts = rows.groupby(ROLLUP_KEYS).size().rename('count') * sign
+    return counts.reset_index()
+
+
+class IntakeRollup:
+    """입소 집계표 조회"""
+
+    def __init__(self, table):
+        # 축종("개", "고양이", "기타축종")은 kindCd 접두어에서 한 번만 추출
+        self.table = table.assign(축종=table['kindCd'].str.extract(KIND_PREFIX_PATTERN.pattern, expand=False).fillna(''))
+        self.weeks = sorted(table['week'].unique().tolist())
+
+    def query(self, group_by=('week',), weeks=None, **filters):
+        """
+        조건에 맞는 집계를 group_by 컬럼별로 합산
+        filters는 컬럼명=값 또는 컬럼명=[값, ...] 형식입니다. (예: 축종='개', 시도='경기도', processState=['보호중'])
+        weeks는 최근 몇 주만 볼지 지정합니다.
+        """
+        table = self.table
+        if weeks is not None and self.weeks:
+            table = table[table['week'] >= self.weeks[max(0, len(self.weeks) - weeks)]]
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                table = table[table[column].isin(value)]
+            else:
+                table = table[table[column] == value]
+        return table.groupby(list(group_by), as_index=False)['count'].sum()
+
+    def weekly(self, by=None, weeks=None, **filters):
+        """주 × by 값의 마릿수 표 (추이 차트용, 없는 주는 0)"""
+        if by is None:
+            counts = self.query(('week',), weeks, **filters).set_index('week')['count']
+        else:
+            counts = self.query(('week', by), weeks, **filters).pivot(index='week', columns=by, values='count')
+        return counts.reindex(self.weeks[-weeks:] if weeks else self.weeks).fillna(0).astype(int)
+
+
+def load_rollup_table(path=INTAKE_ROLLUP_PATH):
+    if os.path.exists(path):
+        return pd.read_csv(path, dtype={column: str for column in ROLLUP_KEYS})
+    return pd.DataFrame(columns=ROLLUP_KEYS + ['count'])
+
+
+def load_ledger(path=INTAKE_LEDGER_PATH):
+    if os.path.exists(path):
+        return pd.read_csv(path, dtype=str)
+    return pd.DataFrame(columns=LEDGER_COLUMNS)
+
+
+def _write_csv(df, path):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+_update_lock = threading.Lock()
+
+
+@contextmanager
+def _locked(path):
+    """
+    집계표 갱신 잠금 (같은 프로세스의 스레드와 다른 프로세스 모두)
+    fcntl이 없는 환경(Windows)에서는 프로세스 안에서만 잠급니다.
+    """
+    with _update_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(f"{path}.lock", 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def update_intake_rollup(petinshelter, rollup_path=INTAKE_ROLLUP_PATH, ledger_path=INTAKE_LEDGER_PATH):
+    """
+    보호 동물 데이터의 새 동물과 상태가 바뀐 동물만 집계표에 반영해 저장 (스냅샷 저장 시 호출)
+    스냅샷에서 사라진 동물(입양, 반환 등으로 공고가 끝난 동물)은 마지막 상태로 집계에 남습니다.
+    반영한 동물 수 반환
+    """
+    if petinshelter is None or petinshelter.empty:
+        return 0
+    rows = ledger_rows(petinshelter)
+    os.makedirs(os.path.dirname(rollup_path) or '.', exist_ok=True)
+    # 읽기 → 반영 → 쓰기 사이에 다른 갱신이 끼어들면 변화량이 빠지거나 두 번 반영되므로 잠근 채 실행
+    with _locked(rollup_path):
+        return _apply_rows(rows, rollup_path, ledger_path)
+
+
+def _apply_rows(rows, rollup_path, ledger_path):
+    ledger = load_ledger(ledger_path)
+
+    merged = rows.merge(ledger, on='desertionNo', how='left', suffixes=('', '_old'), indicator=True)
+    is_new = merged['_merge'] == 'left_only'
+    changed = (merged['_merge'] == 'both') & (merged[ROLLUP_KEYS].values != merged[[f"{k}_old" for k in ROLLUP_KEYS]].values).any(axis=1)
+    if not (is_new | changed).any():
+        return 0
+
+    previous = merged.loc[changed, [f"{k}_old" for k in ROLLUP_KEYS]]
+    previous.columns = ROLLUP_KEYS
+    delta = pd.concat([count_rows(merged.loc[is_new | changed, ROLLUP_KEYS]), count_rows(previous, sign=-1)])
+
+    table = pd.concat([load_rollup_table(rollup_path), delta])
+    table = table.groupby(ROLLUP_KEYS, as_index=False)['count'].sum()
+    table = table[table['count'] > 0]
+
+    updated = rows[rows['desertionNo'].isin(merged.loc[is_new | changed, 'desertionNo'])]
+    ledger = pd.concat([ledger[~ledger['desertionNo'].isin(updated['desertionNo'])], updated], ignore_index=True)
+
+    # 보관 기간이 지난 주 삭제
+    weeks = sorted(table['week'].unique())
+    if len(weeks) > RETENTION_WEEKS:
+        oldest = weeks[-RETENTION_WEEKS]
+        table = table[table['week'] >= oldest]
+        ledger = ledger[ledger['week'] >= oldest]
+
+    _write_csv(table.sort_values(ROLLUP_KEYS), rollup_path)
+    _write_csv(ledger[LEDGER_COLUMNS], ledger_path)
+    return int((is_new | changed).sum())
+
+
+_rollups = {}
+
+
+def get_intake_rollup(path=INTAKE_ROLLUP_PATH):
+    """집계표를 파일이 바뀔 때까지 재사용 (기본 집계표가 아직 없으면 보호 동물 스냅샷으로 만듦)"""
+    if path == INTAKE_ROLLUP_PATH and not os.path.exists(path):
+        update_intake_rollup(read_snapshot('petinshelter'))
+    key = (path, os.path.getmtime(path) if os.path.exists(path) else None)
+    if key not in _rollups:
+        _rollups.clear()
+        _rollups[key] = IntakeRollup(load_rollup_table(path))
+    return _rollups[key]
@@ -0,0 +1,199 @@
+"""
+오래 걸리는 수집 작업을 백그라운드에서 실행하는 작업 큐
+작업 상태와 진행률은 ./static/cache/jobs 아래 JSON 파일로 저장되어
+페이지를 새로고침하거나 브라우저 탭이 끊겨도 다시 조회할 수 있습니다.
+끝난 작업의 상태·결과 파일은 보관 기간이 지나면 삭제합니다.
+"""
+import os
+import json
+import time
+import uuid
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from src.cancel import CancelToken, FetchCancelled
+
+JOB_DIR = './static/cache/jobs'
+# 끝난 작업 파일 보관 기간 (초)
+JOB_RETENTION = 7 * 24 * 60 * 60
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+INTERRUPTED = 'interrupted'
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED, INTERRUPTED)
+
+
+class JobContext:
+    """작업 함수에 전달되는 진행률 보고 및 취소 확인용 객체"""
+
+    def __init__(self, manager, job_id, cancel_token):
+        self.manager = manager
+        self.job_id = job_id
+        self.cancel_token = cancel_token
+
+    def progress(self, done, total, message=""):
+        self.manager._update(self.job_id, progress=done, total=total, message=message)
+
+    @property
+    def cancelled(self):
+        return self.cancel_token.cancelled
+
+
+class JobManager:
+    def __init__(self, job_dir=JOB_DIR, max_workers=2, retention=JOB_RETENTION):
+        self.job_dir = job_dir
+        self.retention = retention
+        os.makedirs(self.job_dir, exist_ok=True)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='petpension-job')
+        self.tokens = {}
+        self.lock = threading.Lock()
+
+    def _job_path(self, job_id):
+        return os.path.join(self.job_dir, f"{job_id}.json")
+
+    def _result_path(self, job_id):
+        return os.path.join(self.job_dir, f"{job_id}.csv")
+
+    def _write(self, job):
+        # 임시 파일에 쓴 뒤 교체하여 읽는 쪽이 깨진 JSON을 보지 않도록 함
+        path = self._job_path(job['id'])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _update(self, job_id, **fields):
+        with self.lock:
+            job = self.get(job_id)
+            if job is None:
+                return None
+            job.update(fields)
+            job['updated_at'] = time.time()
+            self._write(job)
+            return job
+
+    def submit(self, kind, func, params=None):
+        """
+        작업 등록 후 작업 ID 반환
+        func(ctx, **params)는 DataFrame 또는 None을 반환하고, ctx.progress()로 진행률을 보고합니다.
+        """
+        job_id = f"{kind}_{time.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        job = {
+            'id': job_id,
+            'kind': kind,
+            'status': QUEUED,
+            'params': params or {},
+            'progress': 0,
+            'total': 0,
+            'message': "",
+            'error': None,
+            'result_path': None,
+            'pid': os.getpid(),
+            'created_at': time.time(),
+            'updated_at': time.time()
+        }
+        with self.lock:
+            self._write(job)
+        self.prune()
+
+        token = CancelToken()
+        self.tokens[job_id] = token
+        self.executor.submit(self._run, job_id, func, params or {}, token)
+        return job_id
+
+    def _run(self, job_id, func, params, token):
+        if token.cancelled:
+            self._update(job_id, status=CANCELLED)
+            return
+        self._update(job_id, status=RUNNING, started_at=time.time())
+        ctx = JobContext(self, job_id, token)
+        try:
+            result = func(ctx, **params)
+            if token.cancelled:
+                self._update(job_id, status=CANCELLED, finished_at=time.time())
+                return
+            result_path = None
+            if isinstance(result, pd.DataFrame):
+                result_path = self._result_path(job_id)
+                result.to_csv(result_path, index=False)
+            self._update(job_id, status=DONE, result_path=result_path, finished_at=time.time())
+        except FetchCancelled:
+            self._update(job_id, status=CANCELLED, finished_at=time.time())
+        except Exception as e:
+            traceback.print_exc()
+            self._update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+        finally:
+            self.tokens.pop(job_id, None)
+
+    def get(self, job_id):
+        """작업 상태 조회 (다른 프로세스에서 실행되다 중단된 작업은 interrupted로 표시)"""
+        if not job_id:
+            return None
+        path = self._job_path(job_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if job['status'] in (QUEUED, RUNNING) and job.get('pid') != os.getpid():
+            job['status'] = INTERRUPTED
+        return job
+
+    def latest(self, kind):
+        """해당 종류의 가장 최근 작업"""
+        job_ids = [
+            name[:-5] for name in os.listdir(self.job_dir)
+            if name.startswith(f"{kind}_") and name.endswith('.json')
+        ]
+        if not job_ids:
+            return None
+        return self.get(max(job_ids))
+
+    def prune(self):
+        """보관 기간이 지난 끝난 작업의 상태·결과 파일 삭제, 삭제한 작업 수 반환"""
+        removed = 0
+        cutoff = time.time() - self.retention
+        for name in os.listdir(self.job_dir):
+            if not name.endswith('.json'):
+                continue
+            job = self.get(name[:-5])
+            if job is None or job['status'] not in FINISHED_STATES or job.get('updated_at', 0) >= cutoff:
+                continue
+            for path in (self._job_path(job['id']), self._result_path(job['id'])):
+                if os.path.exists(path):
+                    os.remove(path)
+            removed += 1
+        return removed
+
+    def cancel(self, job_id):
+        token = self.tokens.get(job_id)
+        if token is not None:
+            token.cancel()
+
+    def load_result(self, job):
+        """완료된 작업의 결과 DataFrame"""
+        if job is None or not job.get('result_path') or not os.path.exists(job['result_path']):
+            return None
+        return pd.read_csv(job['result_path'])
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """프로세스 전체에서 공유하는 작업 관리자"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+            _manager.prune()
+        return _manager
@@ -0,0 +1,50 @@
+"""
+API 응답 JSON을 데이터프레임으로 변환
+항목마다 딕셔너리를 새로 만들지 않고, 선언한 컬럼 목록(schema)에 따라 컬럼별 배열을 바로 만들어 데이터프레임을 생성합니다.
+orjson이 설치되어 있으면 응답 파싱에 사용합니다.
+"""
+import json
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(content):
+    """응답 본문(bytes 또는 str) 파싱"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def item_list(value):
+    """공공데이터 응답의 item 값을 목록으로 통일 (항목이 하나면 딕셔너리, 없으면 빈 문자열로 옴)"""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        return [value]
+    return []
+
+
+def public_items(data):
+    """공공데이터 응답의 response.body.items.item 목록 (형식이 다르면 None)"""
+    try:
+        items = data['response']['body']['items']
+    except (KeyError, TypeError):
+        return None
+    if not isinstance(items, dict):
+        return []
+    return item_list(items.get('item'))
+
+
+def decode_items(items, schema):
+    """
+    항목 목록 → 데이터프레임
+    schema는 컬럼명 → 키가 없을 때 넣을 기본값이며, 항목에 없는 키는 기본값으로 채웁니다.
+    """
+    columns = {}
+    for column, default in schema.items():
+        columns[column] = [item.get(column, default) for item in items]
+    return pd.DataFrame(columns, columns=list(schema))
@@ -0,0 +1,184 @@
+"""
+보호 동물 품종(kindCd) → AKC 견종 매핑표
+공공데이터의 kindCd 값("[개] 골든 리트리버", "[개] 진도 믹스견" 등)마다 AKC 견종 ID(영문 품종명)와
+한글 품종명, 믹스 여부를 미리 계산해 보호 동물 데이터 옆에 저장해 두고, 화면에서는 조회와 조인만 합니다.
+"""
+import os
+import re
+import pandas as pd
+from src.breed_search import get_breed_search_index, normalize, EXACT_SCORE, SUBSTRING_SCORE
+
+KIND_MAPPING_PATH = './static/database/kindCd_mapping.csv'
+AKC_BREED_INFO_PATH = './static/database/akcBreedInfo.csv'
+
+# 품종을 특정할 수 없는 믹스견의 견종 ID
+MIXED_ID = 'mixed'
+MIXED_PATTERN = re.compile(r"믹스견|믹스|잡종")
+KIND_PREFIX_PATTERN = re.compile(r"^\s*\[([^\]]*)\]\s*")
+
+# AKC 견종과 매핑하는 축종 (고양이, 기타 축종은 매핑하지 않음)
+DOG_KIND = '개'
+
+# 여러 견종을 묶어 부르는 이름 → 묶음에 속한 견종의 한글 품종명에 들어 있는 글자
+# (매핑은 별칭의 대표 견종을 쓰고, 견종으로 찾을 때는 묶음에 속한 견종 모두에 포함)
+GENERIC_KIND_NAMES = {
+    '리트리버': '리트리버',
+    '레트리버': '리트리버',
+    '푸들': '푸들',
+    '테리어': '테리어',
+    '스파니엘': '스파니엘',
+    '하운드': '하운드',
+    '슈나우저': '슈나우'
+}
+
+# 오타로 볼 수 있는 최소 3-gram 포함 비율
+FUZZY_MIN_SCORE = 0.85
+
+MAPPING_COLUMNS = ['kindCd', 'kind_name', 'breed_id', 'breed_name_kor', 'mixed']
+
+
+def split_kindCd(kindCd):
+    """"[개] 골든 리트리버" → ("개", "골든 리트리버")"""
+    if not isinstance(kindCd, str):
+        return "", ""
+    match = KIND_PREFIX_PATTERN.match(kindCd)
+    if match is None:
+        return "", kindCd.strip()
+    return match.group(1), kindCd[match.end():].strip()
+
+
+def resolve_kind(kind_name, index):
+    """
+    품종명 하나를 (견종 ID, 한글 품종명, 믹스 여부)로 변환
+    일치하는 이름·별칭 → 이름에 포함된 품종명 → 오타 보정 순으로 찾고, 찾지 못하면 견종 ID는 빈 문자열입니다.
+    """
+    mixed = bool(MIXED_PATTERN.search(kind_name))
+    base = MIXED_PATTERN.sub(" ", kind_name).strip()
+    if base in ("", "견"):
+        return MIXED_ID, "", True
+    results = index.search(base, limit=1)
+    if results and results[0][2] >= EXACT_SCORE:
+        return results[0][1], results[0][0], mixed
+
+    # "엄마는 치와와"처럼 품종명이 포함된 경우 가장 긴 이름을 사용
+    # (별칭은 제외: "잉글리쉬 포인터"가 별칭 "포인터"로 다른 견종에 매핑되지 않도록)
+    key = normalize(base)
+    contained = [entry for k, entry in enumerate(index.keys) if k in index.official_keys and len(entry[0]) >= 2 and entry[0] in key]
+    if contained:
+        breed = max(contained, key=lambda entry: len(entry[0]))[4]
+        return index.breed_names_eng[breed], index.breed_names[breed], mixed
+
+    # 접두사·부분 문자열 일치는 여러 품종에 걸칠 수 있으므로 오타 보정 점수만 사용
+    if results and FUZZY_MIN_SCORE <= results[0][2] < SUBSTRING_SCORE:
+        return results[0][1], results[0][0], mixed
+
+    return (MIXED_ID if mixed else ""), "", mixed
+
+
+def kind_group(kind_name):
+    """품종 묶음 이름("푸들", "리트리버믹스")이면 묶음에 속한 견종 이름에 들어 있는 글자, 아니면 None"""
+    base = normalize(MIXED_PATTERN.sub(" ", str(kind_name)))
+    for name, stem in GENERIC_KIND_NAMES.items():
+        if normalize(name) == base:
+            return stem
+    return None
+
+
+def build_kind_mapping(kindCds, breed_info):
+    """kindCd 목록의 매핑표 생성"""
+    index = get_breed_search_index(breed_info)
+    rows = []
+    for kindCd in sorted({k for k in kindCds if isinstance(k, str)}):
+        kind, kind_name = split_kindCd(kindCd)
+        if kind == DOG_KIND:
+            breed_id, breed_name_kor, mixed = resolve_kind(kind_name, index)
+        else:
+            breed_id, breed_name_kor, mixed = "", "", bool(MIXED_PATTERN.search(kind_name))
+        rows.append({
+            'kindCd': kindCd,
+            'kind_name': kind_name,
+            'breed_id': breed_id,
+            'breed_name_kor': breed_name_kor,
+            'mixed': mixed
+        })
+    return pd.DataFrame(rows, columns=MAPPING_COLUMNS)
+
+
+class KindMapping:
+    """kindCd → 견종 조회와 보호 동물 데이터 조인"""
+
+    def __init__(self, table, breed_info=None):
+        self.table = table.fillna({'breed_id': "", 'breed_name_kor': ""}).drop_duplicates('kindCd', keep='last')
+        self.breed_info = breed_info
+        self._index()
+
+    def _index(self):
+        self.rows = self.table.set_index('kindCd')
+        self.kinds_by_breed = self.table[self.table['breed_name_kor'] != ""].groupby('breed_name_kor')['kindCd'].apply(list).to_dict()
+        self.kinds_by_group = {}
+        for kindCd, kind_name in zip(self.table['kindCd'], self.table['kind_name']):
+            stem = kind_group(kind_name) if split_kindCd(kindCd)[0] == DOG_KIND else None
+            if stem is not None:
+                self.kinds_by_group.setdefault(stem, []).append(kindCd)
+
+    def ensure(self, kindCds):
+        """매핑표에 없는 kindCd가 있으면 계산해 추가 (추가된 행 수 반환)"""
+        missing = pd.Index(pd.unique(pd.Series(kindCds).dropna())).difference(self.rows.index)
+        if missing.empty:
+            return 0
+        breed_info = self.breed_info if self.breed_info is not None else pd.read_csv(AKC_BREED_INFO_PATH)
+        self.table = pd.concat([self.table, build_kind_mapping(missing, breed_info)], ignore_index=True)
+        self._index()
+        return len(missing)
+
+    def lookup(self, kindCd):
+        """(견종 ID, 한글 품종명, 믹스 여부) 조회 (매핑표에 없으면 None)"""
+        if kindCd not in self.rows.index:
+            return None
+        row = self.rows.loc[kindCd]
+        return row['breed_id'], row['breed_name_kor'], bool(row['mixed'])
+
+    def kinds_of(self, breed_name):
+        """견종에 해당하는 kindCd 목록 (매핑된 kindCd와, 견종이 속한 묶음 이름의 kindCd)"""
+        kinds = list(self.kinds_by_breed.get(breed_name, []))
+        for stem, group_kinds in self.kinds_by_group.items():
+            if stem in str(breed_name):
+                kinds += [kindCd for kindCd in group_kinds if kindCd not in kinds]
+        return kinds
+
+    def annotate(self, petinshelter):
+        """보호 동물 데이터에 breed_id, breed_name_kor, mixed 컬럼 추가"""
+        self.ensure(petinshelter['kindCd'])
+        result = petinshelter.drop(columns=['breed_id', 'breed_name_kor', 'mixed'], errors='ignore')
+        return result.join(self.rows[['breed_id', 'breed_name_kor', 'mixed']], on='kindCd')
+
+    def save(self, path=KIND_MAPPING_PATH):
+        tmp_path = f"{path}.tmp"
+        self.table.sort_values('kindCd').to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+
+def load_kind_mapping_table(path=KIND_MAPPING_PATH):
+    if os.path.exists(path):
+        return pd.read_csv(path, dtype={'breed_id': str, 'breed_name_kor': str})
+    return pd.DataFrame(columns=MAPPING_COLUMNS)
+
+
+def update_kind_mapping(petinshelter, path=KIND_MAPPING_PATH):
+    """보호 동물 데이터의 새 kindCd 값을 매핑표에 추가해 저장 (스냅샷 저장 시 호출)"""
+    mapping = get_kind_mapping(path)
+    if mapping.ensure(petinshelter['kindCd']):
+        mapping.save(path)
+    return mapping
+
+
+_mappings = {}
+
+
+def get_kind_mapping(path=KIND_MAPPING_PATH):
+    """매핑표를 파일이 바뀔 때까지 재사용"""
+    key = (path, os.path.getmtime(path) if os.path.exists(path) else None)
+    if key not in _mappings:
+        _mappings.clear()
+        _mappings[key] = KindMapping(load_kind_mapping_table(path))
+    return _mappings[key]
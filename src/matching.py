@@ -0,0 +1,485 @@
+"""
+설문 답변과 견종 특성을 비교하는 매칭 엔진
+설문 기준(CRITERIA)을 질문별 규칙표로 한 번만 변환해 두고, 견종마다 반복하던 비교를
+(답변 × 견종) 불리언 행렬 조회와 NumPy 합산으로 계산합니다.
+"""
+import os
+import ast
+import json
+import itertools
+import numpy as np
+import pandas as pd
+
+RECOMMENDATION_TABLE_PATH = './static/database/breed_recommendations.npz'
+
+# 같은 점수일 때 앞선 견종이 먼저 오도록 더하는 값 (점수 차이보다 충분히 작음)
+TIE_BREAK_EPS = 1e-9
+
+# 질문 → (가중치, 견종 특성 컬럼, 기준 점수, [털 빠짐 문항 여부, 크기 문항 여부])
+CRITERIA = {
+    "당신의 개가 얼마나 훈련되기를 원하십니까?": (2, 'Trainability Level', [4, 3, 2]),
+    "당신은 개가 얼마나 활동적이기를 원하십니까?": (2, 'Energy Level', [4, 3, 2]),
+    "얼마나 많은 털 빠짐을 감당할 수 있습니까?": (1.5, 'Shedding Level', [3, 2, 2], True),
+    "개 미용 관리를 얼마나 자주 해줄 수 있습니까?": (1.5, 'Coat Grooming Frequency', [4, 3, 2]),
+    "얼마나 많은 짖음이나 다른 소리에 괜찮으십니까?": (1, 'Barking Level', [4, 3, 2]),
+    "원하는 개의 크기는 무엇입니까?": (1.5, 'weight', None, False, True),
+    "가정에 어린이가 있습니까?": (2, 'Good With Young Children', [4]),
+    "가정에 다른 동물이 있습니까?": (1.5, 'Good With Other Dogs', [4]),
+    "저알레르기 개를 원하십니까?": (2, 'Shedding Level', [2], True)
+}
+
+# 기준 점수의 순서와 대응하는 답변 문자열
+ANSWER_STRINGS = [
+    "매우 훈련하기 쉬움",
+    "훈련하기 쉬움",
+    "훈련 가능",
+    "매우 높은 에너지 (하루 60~120분 운동)",
+    "활발함 (하루 60~90분 운동)",
+    "적당한 에너지 (하루 30~60분 운동)",
+    "많은 털 빠짐도 괜찮음",
+    "보통 정도의 털 빠짐은 괜찮음",
+    "가끔씩만 털 빠짐을 원함",
+    "매일",
+    "주 2~3회",
+    "매주",
+    "매우 시끄러움",
+    "자주 짖음",
+    "가끔 짖음"
+]
+
+# 털 빠짐 문항 답변 → (기준 점수 위치, 비교 방향)
+SHEDDING_ANSWERS = {
+    "많은 털 빠짐도 괜찮음": (0, 'ge'),
+    "보통 정도의 털 빠짐은 괜찮음": (1, 'ge'),
+    "가끔씩만 털 빠짐을 원함": (2, 'le')
+}
+
+# 점수와 별개로 조건에 맞지 않는 견종을 후보에서 제외하는 질문
+# 질문 → {선택지: (견종 특성 컬럼, 비교 방향, 기준 점수)}
+HARD_CONSTRAINTS = {
+    "혹시 개 털 등에 알레르기가 있습니까?": {"예": ('Shedding Level', 'le', 2)},
+    "자녀의 나이는 어떻게 됩니까?": {"10세 미만": ('Good With Young Children', 'ge', 3)},
+    "어떤 종류를 키우고 있습니까?": {"개": ('Good With Other Dogs', 'ge', 3)}
+}
+
+SIZE_MAPPING = {
+    "초대형": 5,
+    "대형": 4,
+    "중형": 3,
+    "소형": 2,
+    "초소형": 1
+}
+
+
+def breed_size_class(weight_str):
+    """
+    AKC 체중 문자열(예: "['55 pounds']")의 최대 체중으로 1~5 크기 등급 계산
+    숫자로 읽을 수 없는 형식이면 0을 반환합니다.
+    """
+    try:
+        if isinstance(weight_str, str):
+            weight_list = ast.literal_eval(weight_str)
+            max_weight = max([float(w.split()[0].replace("'", "")) for w in weight_list])
+            if max_weight > 100:
+                return 5
+            elif max_weight > 50:
+                return 4
+            elif max_weight > 25:
+                return 3
+            elif max_weight > 10:
+                return 2
+            else:
+                return 1
+    except:
+        pass
+    return 0
+
+
+def breed_fingerprint(breed_info):
+    """매칭에 쓰이는 견종 정보 컬럼의 해시 (견종 정보가 바뀌었는지 확인하는 용도)"""
+    columns = ['breed_name_kor', 'weight'] + sorted({c[1] for c in CRITERIA.values() if c[1] != 'weight'})
+    return int(pd.util.hash_pandas_object(breed_info[columns], index=False).sum())
+
+
+def top_k(scores, k):
+    """
+    행별 상위 k개 견종의 위치와 점수 (점수 내림차순, 같은 점수는 앞선 견종 우선)
+    전체 정렬 대신 argpartition으로 k개만 고른 뒤 그 안에서만 정렬합니다.
+    """
+    scores = np.atleast_2d(scores)
+    n_breeds = scores.shape[1]
+    k = min(k, n_breeds)
+    keys = -scores + np.arange(n_breeds) * TIE_BREAK_EPS
+    candidates = np.argpartition(keys, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(keys, candidates, axis=1), axis=1)
+    indices = np.take_along_axis(candidates, order, axis=1)
+    return indices, np.take_along_axis(scores, indices, axis=1)
+
+
+class QuestionRule:
+    """
+    질문 하나의 규칙표
+    masks[i]는 answers[i]를 골랐을 때 점수를 받는 견종, 마지막 행은 그 외 답변일 때의 견종입니다.
+    """
+
+    def __init__(self, question, weight, answers, masks):
+        self.question = question
+        self.weight = weight
+        self.answers = answers
+        self.codes = {answer: i for i, answer in enumerate(answers)}
+        self.masks = masks
+        self.contributions = masks * weight
+
+    @property
+    def other_code(self):
+        return len(self.answers)
+
+    def encode(self, answer):
+        return self.codes.get(answer, self.other_code)
+
+
+def compile_rule(question, criterion, breed_info, size_classes):
+    """CRITERIA 항목 하나를 답변별 불리언 행렬로 변환"""
+    weight, trait, levels, *optional = criterion
+    is_shedding = optional[0] if len(optional) > 0 else False
+    is_size = optional[1] if len(optional) > 1 else False
+    n_breeds = len(breed_info)
+
+    answers = []
+    masks = []
+    if is_size:
+        for answer, size_score in SIZE_MAPPING.items():
+            answers.append(answer)
+            masks.append(np.abs(size_score - size_classes) <= 1)
+        # 크기 등급표에 없는 답변은 0으로 비교
+        other = np.abs(size_classes) <= 1
+    else:
+        values = breed_info[trait].to_numpy(dtype=float)
+        if is_shedding:
+            for answer, (index, direction) in SHEDDING_ANSWERS.items():
+                answers.append(answer)
+                if index >= len(levels):
+                    masks.append(np.zeros(n_breeds, dtype=bool))
+                elif direction == 'ge':
+                    masks.append(values >= levels[index])
+                else:
+                    masks.append(values <= levels[index])
+        else:
+            for index, level in enumerate(levels):
+                answers.append(ANSWER_STRINGS[index])
+                masks.append(values >= level)
+        other = np.zeros(n_breeds, dtype=bool)
+
+    masks.append(other)
+    return QuestionRule(question, weight, answers, np.vstack(masks))
+
+
+class BreedMatcher:
+    """
+    견종별 매칭 점수 계산기
+    점수 = 일치한 질문의 가중치 합 / 답변한 질문의 가중치 합 × 100
+    """
+
+    def __init__(self, breed_info, criteria=CRITERIA):
+        self.fingerprint = breed_fingerprint(breed_info)
+        self.breed_names = breed_info['breed_name_kor'].tolist()
+        self.size_classes = np.array([breed_size_class(w) for w in breed_info['weight']])
+        self.rules = [
+            compile_rule(question, criterion, breed_info, self.size_classes)
+            for question, criterion in criteria.items()
+        ]
+        self.questions = [rule.question for rule in self.rules]
+        self.weights = np.array([rule.weight for rule in self.rules], dtype=float)
+        self.rule_by_question = {rule.question: rule for rule in self.rules}
+        self.constraint_masks = {
+            question: {
+                option: self._compare(breed_info[trait], direction, level)
+                for option, (trait, direction, level) in options.items()
+            }
+            for question, options in HARD_CONSTRAINTS.items()
+        }
+
+    @staticmethod
+    def _compare(values, direction, level):
+        values = values.to_numpy(dtype=float)
+        return values >= level if direction == 'ge' else values <= level
+
+    @property
+    def n_breeds(self):
+        return len(self.breed_names)
+
+    def contribution(self, question, answer):
+        """질문 하나의 답변이 견종별 점수에 더하는 값과 가중치 (기준에 없는 질문이면 None)"""
+        rule = self.rule_by_question.get(question)
+        if rule is None:
+            return None
+        return rule.contributions[rule.encode(answer)], rule.weight
+
+    def constraint(self, question, answer):
+        """
+        질문 하나의 답변으로 후보에 남는 견종 마스크 (제외 조건이 없으면 None)
+        여러 개를 고르는 질문은 고른 선택지의 조건을 모두 적용합니다.
+        """
+        masks = [
+            mask for option, mask in self.constraint_masks.get(question, {}).items()
+            if (option in answer if isinstance(answer, list) else option == answer)
+        ]
+        if not masks:
+            return None
+        return np.logical_and.reduce(masks)
+
+    def encode(self, answer_sets):
+        """
+        답변 목록을 (응답자 × 질문) 코드 행렬로 변환
+        answer_sets는 {질문: 답변} 딕셔너리 목록 또는 질문을 컬럼으로 하는 데이터프레임이며,
+        답하지 않은 질문은 -1로 표시합니다.
+        """
+        if isinstance(answer_sets, pd.DataFrame):
+            codes = np.full((len(answer_sets), len(self.rules)), -1, dtype=np.int16)
+            for j, rule in enumerate(self.rules):
+                if rule.question not in answer_sets.columns:
+                    continue
+                column = answer_sets[rule.question]
+                answered = column.notna().to_numpy()
+                mapped = column.map(rule.codes).fillna(rule.other_code).to_numpy(dtype=np.int16)
+                codes[:, j] = np.where(answered, mapped, -1)
+            return codes
+
+        codes = np.full((len(answer_sets), len(self.rules)), -1, dtype=np.int16)
+        for i, answers in enumerate(answer_sets):
+            for j, rule in enumerate(self.rules):
+                if rule.question in answers:
+                    codes[i, j] = rule.encode(answers[rule.question])
+        return codes
+
+    def score_codes(self, codes):
+        """코드 행렬 → (응답자 × 견종) 매칭 점수 행렬"""
+        codes = np.atleast_2d(codes)
+        score = np.zeros((codes.shape[0], self.n_breeds))
+        answered = codes >= 0
+        for j, rule in enumerate(self.rules):
+            rows = answered[:, j]
+            if rows.any():
+                score[rows] += rule.contributions[codes[rows, j]]
+        total_weight = answered @ self.weights
+
+        result = np.zeros_like(score)
+        has_weight = total_weight > 0
+        result[has_weight] = score[has_weight] / total_weight[has_weight, None] * 100
+        return result
+
+    def score(self, user_answers):
+        """한 사람의 답변 → 견종별 매칭 점수 배열 (breed_names 순서)"""
+        return self.score_codes(self.encode([user_answers]))[0]
+
+    def score_many(self, answer_sets):
+        """여러 사람의 답변 → (응답자 × 견종) 매칭 점수 행렬"""
+        return self.score_codes(self.encode(answer_sets))
+
+    def top_k_codes(self, codes, k=5, chunk_size=8192):
+        """코드 행렬의 응답자별 상위 k개 견종 위치와 점수 (메모리를 위해 chunk_size명씩 계산)"""
+        indices = np.empty((len(codes), min(k, self.n_breeds)), dtype=np.int32)
+        scores = np.empty(indices.shape)
+        for start in range(0, len(codes), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            indices[chunk], scores[chunk] = top_k(self.score_codes(codes[chunk]), k)
+        return indices, scores
+
+    def recommend(self, answer_sets, k=5, chunk_size=8192):
+        """
+        여러 사람의 답변 → 응답자별 상위 k개 추천 견종
+        반환값은 respondent(입력 순서), rank(1부터), breed_name_kor, score 컬럼의 데이터프레임입니다.
+        """
+        indices, scores = self.top_k_codes(self.encode(answer_sets), k, chunk_size)
+        n_respondents, k = indices.shape
+        return pd.DataFrame({
+            'respondent': np.repeat(np.arange(n_respondents), k),
+            'rank': np.tile(np.arange(1, k + 1), n_respondents),
+            'breed_name_kor': np.asarray(self.breed_names, dtype=object)[indices.ravel()],
+            'score': scores.ravel()
+        })
+
+
+class IncrementalMatch:
+    """
+    설문 진행 중 답변이 들어올 때마다 갱신하는 견종별 누적 점수
+    바뀐 질문의 점수 기여분만 빼고 더하며, 제외 조건에 걸린 견종은 후보에서 뺍니다.
+    """
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.score = np.zeros(matcher.n_breeds)
+        self.total_weight = 0.0
+        self.alive = np.ones(matcher.n_breeds, dtype=bool)
+        self.answers = {}
+        self.contributions = {}
+        self.constraints = {}
+
+    def answer(self, question, answer):
+        """질문 하나의 답변 반영 (이미 답한 질문이면 이전 답변을 되돌린 뒤 반영)"""
+        self.remove(question)
+        self.answers[question] = list(answer) if isinstance(answer, list) else answer
+
+        contribution = self.matcher.contribution(question, answer)
+        if contribution is not None:
+            vector, weight = contribution
+            self.score += vector
+            self.total_weight += weight
+            self.contributions[question] = contribution
+
+        mask = self.matcher.constraint(question, answer)
+        if mask is not None:
+            self.constraints[question] = mask
+            self.alive &= mask
+
+    def remove(self, question):
+        """질문 하나의 답변 취소"""
+        self.answers.pop(question, None)
+        if question in self.contributions:
+            vector, weight = self.contributions.pop(question)
+            self.score -= vector
+            self.total_weight -= weight
+        if question in self.constraints:
+            del self.constraints[question]
+            self.alive = np.logical_and.reduce(
+                [np.ones(self.matcher.n_breeds, dtype=bool)] + list(self.constraints.values())
+            )
+
+    def sync(self, user_answers):
+        """user_answers와 달라진 질문만 찾아 반영"""
+        for question in list(self.answers):
+            if question not in user_answers:
+                self.remove(question)
+        for question, answer in user_answers.items():
+            if question not in self.answers or self.answers[question] != answer:
+                self.answer(question, answer)
+
+    @property
+    def n_candidates(self):
+        return int(self.alive.sum())
+
+    def scores(self):
+        """현재까지의 견종별 매칭 점수"""
+        if self.total_weight <= 0:
+            return np.zeros(self.matcher.n_breeds)
+        return self.score / self.total_weight * 100
+
+    def top_k(self, k=5):
+        """
+        제외되지 않은 견종 중 상위 k개 (견종, 점수) 목록
+        모든 견종이 제외되면 제외 조건 없이 고릅니다.
+        """
+        scores = self.scores()
+        if self.alive.any():
+            k = min(k, self.n_candidates)
+            scores = np.where(self.alive, scores, -np.inf)
+        indices, values = top_k(scores, k)
+        return [(self.matcher.breed_names[i], float(value)) for i, value in zip(indices[0], values[0])]
+
+
+class RecommendationTable:
+    """
+    설문 선택지의 모든 조합에 대해 미리 계산한 상위 k개 추천 견종
+    선택지 위치를 혼합 진법으로 펼친 번호로 바로 조회합니다.
+    """
+
+    def __init__(self, questions, options, indices, scores, breed_names, fingerprint):
+        self.questions = list(questions)
+        self.options = [list(o) for o in options]
+        self.option_codes = [{option: i for i, option in enumerate(o)} for o in self.options]
+        self.shape = tuple(len(o) for o in self.options)
+        self.indices = indices
+        self.scores = scores
+        self.breed_names = list(breed_names)
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, matcher, survey_data, k=5, chunk_size=8192):
+        """설문에 있는 매칭 기준 질문의 모든 선택지 조합을 채점해 표 생성"""
+        survey_options = {
+            row['question_k']: ast.literal_eval(row['select_option_k'])
+            for _, row in survey_data.iterrows()
+            if pd.notna(row['select_option_k'])
+        }
+        rules = [rule for rule in matcher.rules if rule.question in survey_options]
+        questions = [rule.question for rule in rules]
+        options = [survey_options[question] for question in questions]
+
+        # 선택지 번호 조합 → 매칭 엔진 코드 행렬 (설문에 없는 기준 질문은 미응답)
+        combos = np.array(list(itertools.product(*[range(len(o)) for o in options])), dtype=np.int16)
+        codes = np.full((len(combos), len(matcher.rules)), -1, dtype=np.int16)
+        for j, rule in enumerate(matcher.rules):
+            if rule.question in survey_options:
+                q = questions.index(rule.question)
+                option_to_code = np.array([rule.encode(option) for option in options[q]], dtype=np.int16)
+                codes[:, j] = option_to_code[combos[:, q]]
+
+        indices, scores = matcher.top_k_codes(codes, k, chunk_size)
+        return cls(questions, options, indices, scores, matcher.breed_names, matcher.fingerprint)
+
+    def save(self, path=RECOMMENDATION_TABLE_PATH):
+        # 질문·선택지·견종명은 JSON 문자열로, 추천 결과는 배열로 저장
+        meta = {
+            'questions': self.questions,
+            'options': self.options,
+            'breed_names': self.breed_names,
+            'fingerprint': self.fingerprint
+        }
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            meta=np.array(json.dumps(meta, ensure_ascii=False)),
+            indices=self.indices,
+            scores=self.scores
+        )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=RECOMMENDATION_TABLE_PATH):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(
+                meta['questions'],
+                meta['options'],
+                data['indices'],
+                data['scores'],
+                meta['breed_names'],
+                meta['fingerprint']
+            )
+
+    def lookup(self, user_answers):
+        """답변의 상위 k개 (견종, 점수) 목록 (표에 없는 답변 조합이면 None)"""
+        position = []
+        for question, codes in zip(self.questions, self.option_codes):
+            answer = user_answers.get(question)
+            if answer not in codes:
+                return None
+            position.append(codes[answer])
+        row = np.ravel_multi_index(position, self.shape)
+        return [(self.breed_names[i], float(score)) for i, score in zip(self.indices[row], self.scores[row])]
+
+
+_matchers = {}
+_tables = {}
+
+
+def load_recommendation_table(matcher, path=RECOMMENDATION_TABLE_PATH):
+    """현재 견종 정보로 만든 추천표가 있으면 반환 (없거나 견종 정보가 바뀌었으면 None)"""
+    if not os.path.exists(path):
+        return None
+    key = (path, os.path.getmtime(path))
+    if key not in _tables:
+        _tables.clear()
+        _tables[key] = RecommendationTable.load(path)
+    table = _tables[key]
+    return table if table.fingerprint == matcher.fingerprint else None
+
+
+def get_breed_matcher(breed_info):
+    """견종 정보가 같으면 이미 만든 매칭 엔진을 재사용"""
+    key = breed_fingerprint(breed_info)
+    if key not in _matchers:
+        _matchers.clear()
+        _matchers[key] = BreedMatcher(breed_info)
+    return _matchers[key]
@@ -0,0 +1,195 @@
+"""
+데이터셋별 스냅샷 갱신 함수와 갱신 주기
+refresh_data.py 데몬과 페이지의 "지금 새로 조회" 기능이 같은 함수를 사용합니다.
+"""
+import os
+from datetime import datetime, timedelta
+import pandas as pd
+from src.data import Public
+from src.fetch import iter_schedule_results, fetch_rating_data, parse_prices
+from src.snapshot import write_snapshot, read_snapshot, snapshot_info
+from src.kind_mapping import update_kind_mapping
+from src.shelter_ingest import ingest_petinshelter, ensure_ingested
+from src.intake_rollup import update_intake_rollup
+from src.text_search import sync_text_search_index
+
+PENSION_INFO_PATH = './static/database/pension_info.csv'
+
+# 보호소 현황 조회 대상 (축종 코드 → kindCd 접두어)
+UPKIND_PREFIX = {
+    '417000': '[개]',
+    '422400': '[고양이]',
+    '429900': '[기타축종]'
+}
+
+SCHEDULE_DAYS = 60
+
+
+def load_pension_info():
+    return pd.read_csv(PENSION_INFO_PATH)
+
+
+def schedule_snapshot_meta(start_date_str, end_date_str):
+    """일정 스냅샷을 재사용할 수 있는지 판단하기 위한 정보"""
+    return {
+        'start_date': start_date_str,
+        'end_date': end_date_str,
+        'pension_info_mtime': os.path.getmtime(PENSION_INFO_PATH)
+    }
+
+
+def schedule_snapshot_covers(info, start_date_str, end_date_str):
+    """스냅샷이 요청한 기간과 현재 펜션 목록을 모두 포함하는지 확인"""
+    if not info or 'start_date' not in info:
+        return False
+    if info.get('pension_info_mtime') != os.path.getmtime(PENSION_INFO_PATH):
+        return False
+    return info['start_date'] <= start_date_str and end_date_str <= info['end_date']
+
+
+def load_schedule_snapshot(pension_info, start_date_str, end_date_str):
+    """미리 수집된 일정 스냅샷이 조회 기간을 포함하면 해당 기간 데이터 반환 (없으면 None)"""
+    if not schedule_snapshot_covers(snapshot_info('schedule_data'), start_date_str, end_date_str):
+        return None
+
+    snapshot = read_snapshot('schedule_data')
+    if snapshot is None:
+        return None
+    snapshot['가격'] = parse_prices(snapshot['가격'])
+
+    dates = pd.to_datetime(snapshot['날짜'])
+    return snapshot[
+        snapshot['숙박업소'].isin(pension_info['businessName']) &
+        (dates >= pd.Timestamp(start_date_str)) &
+        (dates <= pd.Timestamp(end_date_str))
+    ].reset_index(drop=True)
+
+
+def schedule_snapshot_replaceable(start_date_str, end_date_str):
+    """
+    조회 기간이 현재 스냅샷의 남은 기간(오늘 이후)을 모두 포함하는지 확인
+    사용자가 좁은 기간으로 조회한 결과가 데몬이 수집한 전체 기간 스냅샷을 덮어쓰지 않도록 합니다.
+    """
+    info = snapshot_info('schedule_data')
+    if not info or 'start_date' not in info or info.get('pension_info_mtime') != os.path.getmtime(PENSION_INFO_PATH):
+        return True
+    today_str = datetime.now().strftime("%Y-%m-%d")
+    return start_date_str <= max(info['start_date'], today_str) and info['end_date'] <= end_date_str
+
+
+def save_schedule_snapshot(pension_info, result, start_date_str, end_date_str, failed=()):
+    """
+    페이지에서 실시간으로 조회한 일정을 스냅샷으로 저장 (저장했으면 True)
+    일부 펜션의 일정을 가져오지 못했거나, 전체 펜션을 조회하지 않았거나, 기존 스냅샷보다 좁은 기간이면 저장하지 않습니다.
+    """
+    if failed or result is None or result.empty:
+        return False
+    all_items = set(load_pension_info()['bizItemId'].astype(str))
+    if not all_items <= set(pension_info['bizItemId'].astype(str)):
+        return False
+    if not schedule_snapshot_replaceable(start_date_str, end_date_str):
+        return False
+    write_snapshot('schedule_data', result, **schedule_snapshot_meta(start_date_str, end_date_str))
+    return True
+
+
+def refresh_schedule_data(days=SCHEDULE_DAYS, max_workers=10, cancel_token=None):
+    """오늘부터 days일 동안의 전체 펜션 일정 스냅샷 갱신 (일정을 가져오지 못한 펜션이 있으면 저장하지 않고 오류 발생)"""
+    pension_info = load_pension_info()
+    start_date_str = datetime.now().strftime("%Y-%m-%d")
+    end_date_str = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+    results = []
+    failed = []
+    for row, schedule_data, error in iter_schedule_results(
+        pension_info, start_date_str, end_date_str, max_workers=max_workers, cancel_token=cancel_token
+    ):
+        if error is not None:
+            print(f"오류 발생: {row.businessName} - {error}")
+            failed.append(f"{row.businessName} - {row.bizItemName}")
+        elif schedule_data is not None and not schedule_data.empty:
+            results.append(schedule_data)
+
+    if failed:
+        raise RuntimeError(f"{len(failed)}개 숙박상품의 일정을 가져오지 못해 스냅샷을 유지합니다: {', '.join(failed)}")
+    if not results:
+        return None
+    result = pd.concat(results, ignore_index=True)
+    write_snapshot('schedule_data', result, **schedule_snapshot_meta(start_date_str, end_date_str))
+    return result
+
+
+def refresh_rating_data(max_workers=5, cancel_token=None):
+    """전체 펜션 리뷰 스냅샷 갱신"""
+    result = fetch_rating_data(load_pension_info(), max_workers=max_workers, cancel_token=cancel_token)
+    if result.empty:
+        return None
+    write_snapshot('rating_data', result)
+    return result
+
+
+def refresh_petinshelter():
+    """
+    개·고양이·기타 축종 보호 동물 스냅샷 갱신
+    한 축종이라도 조회에 실패하면 오류가 그대로 발생해 스냅샷과 입소 집계를 갱신하지 않습니다.
+    """
+    public = Public()
+    results = [public.find_pet(upkind=upkind, raise_errors=True) for upkind in UPKIND_PREFIX]
+    results = [result for result in results if result is not None and not result.empty]
+    if not results:
+        return None
+    result = pd.concat(results, ignore_index=True)
+    update_kind_mapping(result)
+    result = ingest_petinshelter(result)
+    write_snapshot('petinshelter', result)
+    update_intake_rollup(result)
+    return result
+
+
+def upkind_rows(petinshelter, upkind):
+    """보호 동물 데이터 중 해당 축종 행 여부"""
+    return petinshelter['kindCd'].astype(str).str.startswith(UPKIND_PREFIX[upkind])
+
+
+def load_petinshelter_snapshot(upkind):
+    """보호 동물 스냅샷 중 해당 축종 데이터 (없으면 None, 읽은 버전으로 특징·발견장소 검색 인덱스도 맞춤)"""
+    info = snapshot_info('petinshelter')
+    snapshot = read_snapshot('petinshelter')
+    if snapshot is None or snapshot.empty:
+        return None
+    snapshot = snapshot[upkind_rows(snapshot, upkind)].reset_index(drop=True)
+    if snapshot.empty:
+        return None
+    sync_text_search_index(snapshot, name=upkind, version=info['updated_at'])
+    return ensure_ingested(snapshot)
+
+
+def save_petinshelter_snapshot(petinshelter, upkind):
+    """
+    실시간으로 조회한 한 축종의 보호 동물로 스냅샷의 해당 축종 데이터만 교체
+    가공 컬럼을 추가한 데이터를 반환합니다.
+    """
+    update_kind_mapping(petinshelter)
+    petinshelter = ensure_ingested(petinshelter)
+    existing = read_snapshot('petinshelter')
+    snapshot = petinshelter
+    if existing is not None and not existing.empty:
+        snapshot = pd.concat([ensure_ingested(existing[~upkind_rows(existing, upkind)]), petinshelter], ignore_index=True)
+    write_snapshot('petinshelter', snapshot)
+    sync_text_search_index(petinshelter, name=upkind, version=snapshot_info('petinshelter')['updated_at'])
+    update_intake_rollup(petinshelter)
+    return petinshelter
+
+
+def refresh_shelter_codes():
+    """시도/시군구/보호소 코드 스냅샷 갱신"""
+    return Public().update_shelter_info()
+
+
+# 데이터셋 이름 → (갱신 함수, 갱신 주기(초))
+DATASETS = {
+    'schedule_data': (refresh_schedule_data, 6 * 60 * 60),
+    'rating_data': (refresh_rating_data, 24 * 60 * 60),
+    'petinshelter': (refresh_petinshelter, 60 * 60),
+    '보호소코드': (refresh_shelter_codes, 7 * 24 * 60 * 60)
+}
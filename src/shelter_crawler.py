@@ -0,0 +1,222 @@
+"""
+시도 → 시군구 → 보호소 코드 재구축
+조회할 항목(frontier)과 완료된 결과를 작업 파일에 바로바로 기록하므로 중간에 멈춰도 남은 항목만 이어서 조회하고,
+동시 요청 수와 초당 요청 수를 제한하며 요청마다 재시도합니다.
+결과는 기존 코드표와 비교해 바뀐 시군구의 행만 교체해 저장합니다.
+"""
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from src.batch import RateLimiter
+from src.cancel import FetchCancelled, check_cancelled, cancellable_sleep
+from src.snapshot import snapshot_path, write_snapshot
+from src.shelter_dim import rebuild_shelter_tables
+
+CRAWL_STATE_PATH = './static/database/shelter_crawl.json'
+# 이보다 오래된 작업 파일은 이어서 쓰지 않고 처음부터 조회
+CRAWL_STATE_MAX_AGE = 24 * 60 * 60
+
+CRAWL_WORKERS = 6
+CRAWL_RATE = 10
+REQUEST_RETRIES = 3
+RETRY_BACKOFF = 2
+
+SIDO_COLUMNS = ['시도코드', '시도명']
+SIGUNGU_COLUMNS = ['시군구코드', '시군구명', '시도코드', '시도명']
+SHELTER_COLUMNS = ['보호소코드', '보호소명', '시도코드', '시도명', '시군구코드', '시군구명']
+CODE_COLUMNS = ['보호소코드', '시도코드', '시군구코드']
+
+
+def with_retries(func, retries=REQUEST_RETRIES, backoff=RETRY_BACKOFF, cancel_token=None):
+    """func()를 실패하면 backoff초부터 두 배씩 늘려 기다리며 다시 시도"""
+    for attempt in range(retries + 1):
+        check_cancelled(cancel_token)
+        try:
+            return func()
+        except FetchCancelled:
+            raise
+        except Exception:
+            if attempt == retries:
+                raise
+            cancellable_sleep(backoff * (2 ** attempt), cancel_token)
+
+
+def _records(df, columns):
+    return df.reindex(columns=columns).astype(str).to_dict('records')
+
+
+def _read_codes(name, columns):
+    path = snapshot_path(name)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=columns)
+    return pd.read_csv(path, dtype={column: str for column in CODE_COLUMNS})
+
+
+class ShelterCodeCrawler:
+    """
+    보호소 코드 계층 조회기
+    public은 find_sido, find_sigungu, find_shelter를 가진 src.data.Public 객체입니다.
+    """
+
+    def __init__(self, public, state_path=CRAWL_STATE_PATH, workers=CRAWL_WORKERS, rate=CRAWL_RATE,
+                 retries=REQUEST_RETRIES, cancel_token=None, on_progress=None):
+        self.public = public
+        self.state_path = state_path
+        self.workers = max(1, workers)
+        self.rate_limiter = RateLimiter(rate)
+        self.retries = retries
+        self.cancel_token = cancel_token
+        self.on_progress = on_progress
+        self.lock = threading.Lock()
+        self.state = None
+
+    def report(self, done, total, message):
+        if self.on_progress is not None:
+            self.on_progress(done, total, message)
+
+    # 작업 파일 (frontier와 완료된 결과)
+    def load_state(self, resume=True):
+        if resume and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, encoding='utf-8') as f:
+                    state = json.load(f)
+                if time.time() - state.get('started_at', 0) <= CRAWL_STATE_MAX_AGE:
+                    self.state = state
+                    return self.state
+            except (OSError, ValueError):
+                pass
+        self.state = {'started_at': time.time(), 'sido': None, 'sigungu': {}, 'shelters': {}, 'failed': {}}
+        return self.state
+
+    def checkpoint(self):
+        with self.lock:
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+
+    def _call(self, func):
+        def limited():
+            self.rate_limiter.wait(self.cancel_token)
+            return func()
+        return with_retries(limited, self.retries, cancel_token=self.cancel_token)
+
+    def _fan_out(self, items, fetch, done_key, message):
+        """
+        아직 완료되지 않은 items를 병렬로 조회해 완료될 때마다 작업 파일에 기록
+        items는 (키, 인자) 목록이며, 모든 재시도가 실패한 키는 state['failed']에 남습니다.
+        """
+        results = self.state[done_key]
+        pending = [(key, arg) for key, arg in items if key not in results]
+        total = len(items)
+        self.report(total - len(pending), total, message)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='shelter-crawl')
+        futures = {executor.submit(self._call, lambda arg=arg: fetch(arg)): key for key, arg in pending}
+        try:
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    records = future.result()
+                    with self.lock:
+                        results[key] = records
+                        self.state['failed'].pop(f"{done_key}:{key}", None)
+                except FetchCancelled:
+                    raise
+                except Exception as e:
+                    with self.lock:
+                        self.state['failed'][f"{done_key}:{key}"] = str(e)
+                self.checkpoint()
+                self.report(len([k for k, _ in items if k in results]), total, message)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def fetch_sigungu(self, sido):
+        result = self.public.find_sigungu(sido['시도코드'])
+        result['시도코드'] = sido['시도코드']
+        result['시도명'] = sido['시도명']
+        return _records(result, SIGUNGU_COLUMNS)
+
+    def fetch_shelters(self, region):
+        result = self.public.find_shelter(region['시도코드'], region['시군구코드'], raise_errors=True)
+        for column in ['시도코드', '시도명', '시군구코드', '시군구명']:
+            result[column] = region[column]
+        return _records(result, SHELTER_COLUMNS)
+
+    def run(self, resume=True):
+        """
+        코드 계층을 조회하고 바뀐 부분만 저장
+        (시도, 시군구, 보호소 코드표, 바뀐 시군구 수) 반환
+        """
+        self.load_state(resume)
+
+        if self.state['sido'] is None:
+            self.report(0, 0, "시도 코드 조회 중...")
+            self.state['sido'] = _records(self._call(self.public.find_sido), SIDO_COLUMNS)
+            self.checkpoint()
+        sidos = self.state['sido']
+
+        self._fan_out([(sido['시도코드'], sido) for sido in sidos], self.fetch_sigungu, 'sigungu', "시군구 코드 조회 중...")
+        regions = [region for sido in sidos for region in self.state['sigungu'].get(sido['시도코드'], [])]
+        self._fan_out([(f"{r['시도코드']}_{r['시군구코드']}", r) for r in regions], self.fetch_shelters, 'shelters', "보호소 코드 조회 중...")
+
+        result_sido = pd.DataFrame(sidos, columns=SIDO_COLUMNS)
+        result_sigungu = pd.DataFrame(regions, columns=SIGUNGU_COLUMNS)
+        changed = self.write_changes(result_sido, result_sigungu)
+
+        if not self.state['failed']:
+            os.remove(self.state_path)
+        return result_sido, result_sigungu, _read_codes('보호소코드', SHELTER_COLUMNS), changed
+
+    def write_changes(self, result_sido, result_sigungu):
+        """
+        기존 코드표와 비교해 바뀐 시군구의 보호소 행만 교체하고, 바뀐 파일만 저장
+        조회에 실패한 시도·시군구의 기존 행은 그대로 둡니다. 바뀐 시군구 수 반환
+        """
+        existing = _read_codes('보호소코드', SHELTER_COLUMNS)
+        existing_key = existing['시도코드'] + '_' + existing['시군구코드']
+        extra_columns = [c for c in existing.columns if c not in SHELTER_COLUMNS]
+        carry = existing.drop_duplicates(['보호소코드', '보호소명'])[['보호소코드', '보호소명'] + extra_columns]
+
+        # 시군구 목록을 받은 시도는 그 목록이 기준 (목록에서 빠진 시군구는 삭제), 받지 못한 시도는 기존 행 유지
+        crawled_sidos = set(self.state['sigungu'])
+        region_keys = {f"{r['시도코드']}_{r['시군구코드']}" for records in self.state['sigungu'].values() for r in records}
+        parts = [existing[~existing['시도코드'].isin(crawled_sidos)]]
+        removed = set(existing_key[existing['시도코드'].isin(crawled_sidos) & ~existing_key.isin(region_keys)])
+        changed = len(removed)
+
+        for key in sorted(region_keys):
+            old = existing[existing_key == key]
+            if key not in self.state['shelters']:
+                # 보호소 조회에 실패한 시군구
+                parts.append(old)
+                continue
+            new = pd.DataFrame(self.state['shelters'][key], columns=SHELTER_COLUMNS)
+            if set(zip(old['보호소코드'], old['보호소명'])) == set(zip(new['보호소코드'], new['보호소명'])):
+                parts.append(old)
+                continue
+            changed += 1
+            # 새로 받은 행에는 주소·위경도가 없으므로 기존 값을 보호소코드·보호소명으로 이어받음
+            if extra_columns:
+                new = new.merge(carry, on=['보호소코드', '보호소명'], how='left')
+            parts.append(new)
+
+        if changed:
+            merged = pd.concat([p for p in parts if not p.empty], ignore_index=True)
+            write_snapshot('보호소코드', merged.reindex(columns=existing.columns.tolist() or SHELTER_COLUMNS))
+            rebuild_shelter_tables()
+
+        # 시도·시군구 코드표는 모든 조회가 성공했을 때만 교체 (일부 시도만 받은 목록으로 덮어쓰면 다음 조회에서 그 시도가 빠짐)
+        if self.state['failed']:
+            return changed
+        for name, df, columns in (('시도코드', result_sido, SIDO_COLUMNS), ('시군구코드', result_sigungu, SIGUNGU_COLUMNS)):
+            current = _read_codes(name, columns)
+            if df.empty or (len(current) == len(df) and current.reindex(columns=columns).astype(str).reset_index(drop=True).equals(df.reset_index(drop=True))):
+                continue
+            write_snapshot(name, df)
+        return changed
@@ -0,0 +1,161 @@
+"""
+보호소 차원표와 관할 지역 연결표
+보호소코드.csv는 같은 보호소가 관할 시군구마다 한 줄씩 반복되므로(예: 한국동물구조관리협회는 서울 대부분의 구),
+실제 보호소마다 한 줄인 차원표(정수 shelter_id, 보호소명, 주소, 위경도)와
+보호소 → 관할 시도·시군구 연결표로 나눠 저장합니다. 보호 동물 데이터는 shelter_id로 보호소를 참조합니다.
+"""
+import os
+import pandas as pd
+
+SHELTER_CODE_PATH = './static/database/보호소코드.csv'
+SHELTER_DIM_PATH = './static/database/shelters.csv'
+SHELTER_BRIDGE_PATH = './static/database/shelter_jurisdictions.csv'
+
+DIM_COLUMNS = ['shelter_id', '보호소명', '주소', 'lat', 'lon']
+BRIDGE_COLUMNS = ['shelter_id', '보호소코드', '시도코드', '시도명', '시군구코드', '시군구명', 'primary']
+
+
+def _first_valid(series):
+    valid = series.dropna()
+    return valid.iloc[0] if len(valid) else None
+
+
+def build_shelter_tables(shelter_codes, previous_dim=None):
+    """
+    보호소 코드표 → (차원표, 연결표)
+    이전 차원표가 있으면 같은 보호소명의 shelter_id와 주소, 위경도를 그대로 유지합니다.
+    (API로 새로 받은 보호소 코드표에는 주소와 위경도가 없음)
+    """
+    codes = shelter_codes.dropna(subset=['보호소명']).copy()
+    codes['보호소명'] = codes['보호소명'].astype(str).str.strip()
+    for column in ['주소', 'lat', 'lon']:
+        if column not in codes.columns:
+            codes[column] = None
+
+    dim = codes.groupby('보호소명', sort=True).agg(
+        주소=('주소', _first_valid), lat=('lat', _first_valid), lon=('lon', _first_valid)
+    ).reset_index()
+
+    # shelter_id는 보호소명 기준으로 유지하고 새 보호소에만 새 번호 부여
+    known = {}
+    if previous_dim is not None and not previous_dim.empty:
+        known = dict(zip(previous_dim['보호소명'], previous_dim['shelter_id'].astype(int)))
+        previous = previous_dim.set_index('보호소명')
+        for column in ['주소', 'lat', 'lon']:
+            missing = dim[column].isna()
+            dim.loc[missing, column] = dim.loc[missing, '보호소명'].map(previous[column])
+    next_id = max(known.values(), default=0) + 1
+    ids = []
+    for name in dim['보호소명']:
+        if name not in known:
+            known[name] = next_id
+            next_id += 1
+        ids.append(known[name])
+    dim['shelter_id'] = ids
+
+    bridge = codes.merge(dim[['보호소명', 'shelter_id', '주소']], on='보호소명', suffixes=('_code', ''))
+    bridge = bridge.drop_duplicates(['shelter_id', '시도코드', '시군구코드'])
+    # 주소에 관할 시군구가 들어 있는 관할 지역을 대표 지역으로 (없으면 첫 번째)
+    in_address = [
+        isinstance(address, str) and str(sigungu) in address and str(sido)[:2] in address
+        for address, sido, sigungu in zip(bridge['주소'], bridge['시도명'], bridge['시군구명'])
+    ]
+    bridge['in_address'] = in_address
+    bridge = bridge.sort_values(['shelter_id', 'in_address'], ascending=[True, False], kind='stable')
+    bridge['primary'] = ~bridge['shelter_id'].duplicated()
+
+    return dim[DIM_COLUMNS].sort_values('shelter_id').reset_index(drop=True), bridge[BRIDGE_COLUMNS].reset_index(drop=True)
+
+
+class ShelterTables:
+    """보호소 차원표·연결표 조회"""
+
+    def __init__(self, dim, bridge):
+        self.dim = dim
+        self.bridge = bridge
+        self.id_by_name = dict(zip(dim['보호소명'], dim['shelter_id']))
+        self.primary = bridge[bridge['primary']].set_index('shelter_id')[['시도명', '시군구명']]
+        # 관할 기관명("시도 시군구" 또는 "시도") → 관할 지역 (보호소별)
+        by_sigungu = bridge.assign(org=bridge['시도명'] + ' ' + bridge['시군구명'].fillna(''))
+        by_sido = bridge.assign(org=bridge['시도명'])
+        self.jurisdictions = pd.concat([by_sigungu, by_sido]).drop_duplicates(['shelter_id', 'org'])[['shelter_id', 'org', '시도명', '시군구명']]
+
+    def shelter_ids(self, careNm):
+        """보호소명 → shelter_id (없으면 결측)"""
+        return careNm.astype('string').str.strip().map(self.id_by_name).astype('Int64')
+
+    def regions(self, shelter_ids, orgNm):
+        """
+        (shelter_id, 관할 기관명) → (시도, 시군구)
+        보호 동물의 관할 기관(orgNm)이 보호소의 관할 지역 중 하나면 그 지역을, 아니면 보호소의 대표 지역을 사용합니다.
+        """
+        keys = pd.DataFrame({'shelter_id': shelter_ids.astype('Int64'), 'org': orgNm.astype('string').str.strip()})
+        matched = keys.merge(self.jurisdictions.astype({'shelter_id': 'Int64', 'org': 'string'}), on=['shelter_id', 'org'], how='left')
+        primary = keys[['shelter_id']].join(self.primary, on='shelter_id')
+        sido = matched['시도명'].fillna(pd.Series(primary['시도명'].to_numpy(), index=matched.index))
+        sigungu = matched['시군구명'].fillna(pd.Series(primary['시군구명'].to_numpy(), index=matched.index))
+        return pd.Series(sido.to_numpy(), index=shelter_ids.index), pd.Series(sigungu.to_numpy(), index=shelter_ids.index)
+
+    def save(self, dim_path=SHELTER_DIM_PATH, bridge_path=SHELTER_BRIDGE_PATH):
+        for df, path in ((self.dim, dim_path), (self.bridge, bridge_path)):
+            tmp_path = f"{path}.tmp"
+            df.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+
+def load_shelter_tables(dim_path=SHELTER_DIM_PATH, bridge_path=SHELTER_BRIDGE_PATH):
+    if not (os.path.exists(dim_path) and os.path.exists(bridge_path)):
+        return None
+    return ShelterTables(
+        pd.read_csv(dim_path),
+        pd.read_csv(bridge_path, dtype={'보호소코드': str, '시도코드': str, '시군구코드': str})
+    )
+
+
+def rebuild_shelter_tables(code_path=SHELTER_CODE_PATH, dim_path=SHELTER_DIM_PATH, bridge_path=SHELTER_BRIDGE_PATH):
+    """보호소 코드표로 차원표·연결표를 다시 만들어 저장 (보호소 코드 갱신 후 호출)"""
+    previous = load_shelter_tables(dim_path, bridge_path)
+    shelter_codes = pd.read_csv(code_path, dtype={'보호소코드': str, '시도코드': str, '시군구코드': str})
+    tables = ShelterTables(*build_shelter_tables(shelter_codes, previous.dim if previous is not None else None))
+    tables.save(dim_path, bridge_path)
+    return tables
+
+
+def update_shelter_geo(tables, geocode, dim_path=SHELTER_DIM_PATH):
+    """
+    위경도가 없는 보호소만 geocode(주소) → (lat, lon)으로 채워 차원표 저장
+    채운 보호소 수 반환
+    """
+    dim = tables.dim
+    missing = dim[(dim['lat'].isna() | dim['lon'].isna()) & dim['주소'].notna()]
+    updated = 0
+    for row in missing.itertuples():
+        lat, lon = geocode(row.주소)
+        if lat is not None and lon is not None:
+            dim.loc[row.Index, ['lat', 'lon']] = [float(lat), float(lon)]
+            updated += 1
+    if updated:
+        tmp_path = f"{dim_path}.tmp"
+        dim.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, dim_path)
+    return updated
+
+
+_tables = {}
+
+
+def get_shelter_tables(code_path=SHELTER_CODE_PATH, dim_path=SHELTER_DIM_PATH, bridge_path=SHELTER_BRIDGE_PATH):
+    """
+    차원표·연결표를 파일이 바뀔 때까지 재사용
+    보호소 코드표가 차원표보다 새로우면 다시 만듭니다.
+    """
+    if not os.path.exists(code_path) and not os.path.exists(dim_path):
+        return None
+    if os.path.exists(code_path) and (not os.path.exists(dim_path) or os.path.getmtime(code_path) > os.path.getmtime(dim_path)):
+        _tables.clear()
+        rebuild_shelter_tables(code_path, dim_path, bridge_path)
+    key = (dim_path, os.path.getmtime(dim_path), os.path.getmtime(bridge_path))
+    if key not in _tables:
+        _tables.clear()
+        _tables[key] = load_shelter_tables(dim_path, bridge_path)
+    return _tables[key]
@@ -0,0 +1,115 @@
+"""
+보호 동물 데이터 가공
+공공데이터에서 받은 문자열 컬럼(나이, 체중, 성별, 중성화 여부, 품종, 보호소)을 수집 시점에 한 번만
+벡터 연산으로 해석해 타입이 정해진 컬럼으로 저장합니다. 화면에서는 이 컬럼을 그대로 사용하고 문자열을 다시 파싱하지 않습니다.
+"""
+from datetime import datetime
+import pandas as pd
+from src.kind_mapping import get_kind_mapping, KIND_PREFIX_PATTERN
+from src.shelter_dim import get_shelter_tables
+
+UNKNOWN_REGION = '정보 없음'
+
+# "2017(년생)", "2025(60일미만)(년생)" → 2017, 2025
+BIRTH_YEAR_PATTERN = r'^\s*(\d{4})(?:\s*\(|\s*$)'
+# "1.5(Kg)" → 1.5
+WEIGHT_PATTERN = r'(\d+(?:\.\d+)?)'
+MIN_BIRTH_YEAR = 1990
+
+SEX_CATEGORIES = ['M', 'F', 'Q']
+NEUTER_FLAGS = {'Y': True, 'N': False}
+
+# 가공 후 추가되는 컬럼 → 타입 (스냅샷 CSV에서 다시 읽을 때 타입 복원에 사용)
+INGEST_COLUMNS = {
+    '출생년도': 'Int64',
+    '년생': 'string',
+    'weight_kg': 'float64',
+    'sex': pd.CategoricalDtype(SEX_CATEGORIES),
+    'neutered': 'boolean',
+    'kind_name': 'string',
+    'breed_id': 'string',
+    'breed_name_kor': 'string',
+    'mixed': 'boolean',
+    'shelter_id': 'Int64',
+    '시도': 'string',
+    '시군구': 'string'
+}
+
+def parse_birth_year(age, current_year=None):
+    """나이 문자열 컬럼에서 출생년도 추출 (유효 범위를 벗어나면 결측)"""
+    current_year = current_year or datetime.now().year
+    years = pd.to_numeric(age.astype('string').str.extract(BIRTH_YEAR_PATTERN)[0], errors='coerce').astype('Int64')
+    # +1은 내년 출생 표기도 허용
+    return years.where((years >= MIN_BIRTH_YEAR) & (years <= current_year + 1))
+
+
+def parse_happen_date(happenDt):
+    """"20250313" 또는 "2025-03-13" 형식의 발견일을 날짜로 변환"""
+    if pd.api.types.is_datetime64_any_dtype(happenDt):
+        return happenDt.dt.normalize()
+    digits = happenDt.astype('string').str.replace('-', '', regex=False).str.strip()
+    return pd.to_datetime(digits, format='%Y%m%d', errors='coerce')
+
+
+def ingest_petinshelter(raw, kind_mapping=None, current_year=None):
+    """보호 동물 원본 데이터에 가공 컬럼을 추가한 데이터프레임 반환"""
+    df = raw.copy()
+    if df.empty:
+        for column, dtype in INGEST_COLUMNS.items():
+            df[column] = pd.Series(dtype=dtype)
+        return df
+
+    happen_date = parse_happen_date(df['happenDt'])
+    df['happenDt'] = happen_date.dt.strftime('%Y-%m-%d')
+
+    birth_year = parse_birth_year(df['age'], current_year)
+    df['출생년도'] = birth_year
+    df['년생'] = (birth_year.astype('string') + '년생').fillna('')
+
+    weight = df['weight'].astype('string').str.extract(WEIGHT_PATTERN)[0]
+    df['weight_kg'] = pd.to_numeric(weight, errors='coerce')
+
+    df['sex'] = pd.Categorical(df['sexCd'].astype('string').str.strip(), categories=SEX_CATEGORIES)
+    df['neutered'] = df['neuterYn'].astype('string').str.strip().map(NEUTER_FLAGS).astype('boolean')
+
+    kind_mapping = kind_mapping or get_kind_mapping()
+    df = kind_mapping.annotate(df)
+    df['kind_name'] = df['kindCd'].astype('string').str.replace(KIND_PREFIX_PATTERN, '', regex=True).str.strip()
+
+    # 보호소는 shelter_id로 참조하고, 시도·시군구는 보호소의 관할 지역 중 동물의 관할 기관(orgNm)에 맞는 지역으로
+    tables = get_shelter_tables()
+    if tables is not None:
+        df['shelter_id'] = tables.shelter_ids(df['careNm'])
+        sido, sigungu = tables.regions(df['shelter_id'], df['orgNm'] if 'orgNm' in df.columns else pd.Series('', index=df.index))
+        df['시도'] = sido.fillna(UNKNOWN_REGION)
+        df['시군구'] = sigungu.fillna(UNKNOWN_REGION)
+    else:
+        df['shelter_id'] = pd.Series(pd.NA, index=df.index, dtype='Int64')
+        df['시도'] = UNKNOWN_REGION
+        df['시군구'] = UNKNOWN_REGION
+
+    return restore_types(df)
+
+
+def is_ingested(df):
+    return all(column in df.columns for column in INGEST_COLUMNS)
+
+
+def restore_types(df):
+    """가공 컬럼의 타입 복원 (CSV에서 읽으면 문자열·실수로 바뀌므로)"""
+    df = df.copy()
+    for column, dtype in INGEST_COLUMNS.items():
+        if dtype == 'boolean':
+            df[column] = df[column].map({True: True, False: False, 'True': True, 'False': False}).astype('boolean')
+        elif dtype == 'string':
+            df[column] = df[column].astype('string').fillna('')
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def ensure_ingested(df):
+    """가공되지 않은 (예전 형식의) 데이터만 가공하고, 가공된 데이터는 타입만 맞춤"""
+    if df is None:
+        return None
+    return restore_types(df) if is_ingested(df) else ingest_petinshelter(df)
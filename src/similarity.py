@@ -0,0 +1,114 @@
+"""
+견종 특성 유사도 인덱스
+AKC 14개 특성 점수와 키·체중을 표준화한 벡터로 견종 간 코사인 유사도를 한 번만 계산해 두고,
+"이 견종과 비슷한 견종" 조회는 미리 계산한 행에서 상위 k개만 고릅니다.
+"""
+import re
+import numpy as np
+import pandas as pd
+from src.matching import top_k
+
+TRAIT_COLUMNS = [
+    'Affectionate With Family',
+    'Good With Young Children',
+    'Good With Other Dogs',
+    'Shedding Level',
+    'Coat Grooming Frequency',
+    'Drooling Level',
+    'Openness To Strangers',
+    'Playfulness Level',
+    'Watchdog/Protective Nature',
+    'Adaptability Level',
+    'Trainability Level',
+    'Energy Level',
+    'Barking Level',
+    'Mental Stimulation Needs'
+]
+
+# 한글 단위 변환 컬럼 → 단위
+SIZE_COLUMNS = {
+    'height_k': 'cm',
+    'weight_k': 'kg'
+}
+
+
+def parse_measure(value, unit):
+    """
+    "수컷: 58-69cm, 암컷: 56-65cm" 같은 문자열에서 숫자의 평균을 계산
+    숫자가 없으면 NaN을 반환합니다.
+    """
+    if not isinstance(value, str):
+        return np.nan
+    numbers = re.findall(r'\d+(?:\.\d+)?', value.replace(unit, ' '))
+    if not numbers:
+        return np.nan
+    return float(np.mean([float(n) for n in numbers]))
+
+
+def trait_matrix(breed_info):
+    """견종 × (특성 점수, 키, 체중) 행렬 (체중은 크기 차이가 과하게 반영되지 않도록 로그 변환)"""
+    features = breed_info[TRAIT_COLUMNS].apply(pd.to_numeric, errors='coerce').astype(float)
+    for column, unit in SIZE_COLUMNS.items():
+        features[column] = breed_info[column].map(lambda value: parse_measure(value, unit))
+    features['weight_k'] = np.log1p(features['weight_k'])
+    return features
+
+
+class TraitSimilarityIndex:
+    """견종 특성 벡터의 코사인 유사도 인덱스"""
+
+    def __init__(self, breed_info):
+        self.breed_names = breed_info['breed_name_kor'].astype(str).tolist()
+        self.positions = {name: i for i, name in reversed(list(enumerate(self.breed_names)))}
+
+        features = trait_matrix(breed_info)
+        # 표준화 후 빠진 값은 평균(0)으로 채움
+        std = features.std().replace(0, 1)
+        vectors = ((features - features.mean()) / std).fillna(0).to_numpy()
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.vectors = vectors / np.where(norms == 0, 1, norms)
+        self.similarity = self.vectors @ self.vectors.T
+
+    def __contains__(self, breed_name):
+        return breed_name in self.positions
+
+    def scores(self, breeds):
+        """기준 견종(하나 또는 여러 개의 평균)과 전체 견종의 유사도"""
+        if isinstance(breeds, str):
+            breeds = [breeds]
+        rows = [self.positions[b] for b in breeds if b in self.positions]
+        if not rows:
+            return None, rows
+        if len(rows) == 1:
+            return self.similarity[rows[0]].copy(), rows
+        center = self.vectors[rows].mean(axis=0)
+        return self.vectors @ (center / (np.linalg.norm(center) or 1)), rows
+
+    def similar(self, breeds, k=5, candidates=None):
+        """
+        기준 견종과 가장 비슷한 견종 k개의 (견종명, 유사도) 목록
+        기준 견종 자신은 제외하며, candidates가 주어지면 그 안의 견종만 고릅니다.
+        """
+        scores, rows = self.scores(breeds)
+        if scores is None:
+            return []
+        scores[rows] = -np.inf
+        if candidates is not None:
+            allowed = np.zeros(len(self.breed_names), dtype=bool)
+            allowed[[self.positions[c] for c in candidates if c in self.positions]] = True
+            scores[~allowed] = -np.inf
+        indices, values = top_k(scores, k)
+        return [(self.breed_names[i], float(s)) for i, s in zip(indices[0], values[0]) if np.isfinite(s)]
+
+
+_indexes = {}
+
+
+def get_similarity_index(breed_info):
+    """견종 정보가 같으면 이미 만든 인덱스를 재사용"""
+    columns = ['breed_name_kor'] + TRAIT_COLUMNS + list(SIZE_COLUMNS)
+    key = int(pd.util.hash_pandas_object(breed_info[columns], index=False).sum())
+    if key not in _indexes:
+        _indexes.clear()
+        _indexes[key] = TraitSimilarityIndex(breed_info)
+    return _indexes[key]
@@ -0,0 +1,140 @@
+"""
+미리 수집해 둔 데이터 스냅샷 읽기/쓰기
+static/database 아래 CSV를 원자적으로 교체하고, 갱신 시각 등 신선도 정보를
+freshness.json에 함께 기록합니다. 페이지는 스냅샷을 먼저 읽고 필요할 때만 실시간으로 조회합니다.
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+from datetime import datetime
+import pandas as pd
+
+DATABASE_DIR = './static/database'
+FRESHNESS_PATH = os.path.join(DATABASE_DIR, 'freshness.json')
+
+# 데이터셋 이름 → 스냅샷 파일
+SNAPSHOT_FILES = {
+    'schedule_data': 'schedule_data.csv',
+    'rating_data': 'rating_data.csv',
+    'petinshelter': 'petinshelter.csv',
+    '보호소코드': '보호소코드.csv'
+}
+
+_lock = threading.Lock()
+
+
+def snapshot_path(name):
+    return os.path.join(DATABASE_DIR, SNAPSHOT_FILES.get(name, f"{name}.csv"))
+
+
+def _temp_path(path):
+    """path와 같은 폴더의 고유한 임시 파일 (갱신 데몬과 페이지 세션이 동시에 써도 섞이지 않음)"""
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or '.', prefix=f".{os.path.basename(path)}.", suffix='.tmp', delete=False) as f:
+        return f.name
+
+
+def _atomic_write_json(path, data):
+    tmp_path = _temp_path(path)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_freshness():
+    """데이터셋별 신선도 정보 전체"""
+    if not os.path.exists(FRESHNESS_PATH):
+        return {}
+    try:
+        with open(FRESHNESS_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_snapshot(name, df, path=None, **meta):
+    """
+    데이터프레임을 임시 파일에 쓴 뒤 교체하고 신선도 정보 기록
+    meta에는 조회 기간 등 스냅샷을 재사용할 수 있는지 판단할 정보를 넣습니다.
+    """
+    path = path or snapshot_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = _temp_path(path)
+    try:
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    with _lock:
+        freshness = load_freshness()
+        freshness[name] = {
+            'path': path,
+            'updated_at': time.time(),
+            'rows': int(len(df)),
+            **meta
+        }
+        _atomic_write_json(FRESHNESS_PATH, freshness)
+    return path
+
+
+def update_snapshot(name, df, key, **meta):
+    """
+    기존 스냅샷에서 df와 key 값이 겹치는 행만 교체해 저장
+    일부 항목만 다시 수집했을 때 나머지 항목의 스냅샷을 잃지 않기 위해 사용합니다.
+    """
+    existing = read_snapshot(name)
+    if existing is not None and key in existing.columns and not existing.empty:
+        keep = ~existing[key].astype(str).isin(df[key].astype(str))
+        df = pd.concat([existing[keep], df], ignore_index=True)
+    return write_snapshot(name, df, **meta)
+
+
+def snapshot_info(name):
+    """
+    스냅샷 신선도 정보 (없으면 None)
+    freshness.json에 기록이 없는 기존 파일은 파일 수정 시각을 갱신 시각으로 사용합니다.
+    """
+    info = load_freshness().get(name)
+    if info is not None:
+        return info
+    path = snapshot_path(name)
+    if not os.path.exists(path):
+        return None
+    return {'path': path, 'updated_at': os.path.getmtime(path)}
+
+
+def snapshot_age(name):
+    """스냅샷이 갱신된 지 몇 초 지났는지 (없으면 None)"""
+    info = snapshot_info(name)
+    if info is None:
+        return None
+    return time.time() - info['updated_at']
+
+
+def read_snapshot(name, max_age=None):
+    """스냅샷 데이터프레임 (없거나 max_age초보다 오래되었으면 None)"""
+    info = snapshot_info(name)
+    if info is None or not os.path.exists(info['path']):
+        return None
+    if max_age is not None and time.time() - info['updated_at'] > max_age:
+        return None
+    return pd.read_csv(info['path'])
+
+
+def describe_freshness(name):
+    """화면에 표시할 갱신 시각 문구"""
+    info = snapshot_info(name)
+    if info is None:
+        return "미리 수집된 데이터가 없습니다."
+    updated_at = datetime.fromtimestamp(info['updated_at']).strftime('%Y-%m-%d %H:%M')
+    minutes = int((time.time() - info['updated_at']) // 60)
+    if minutes < 60:
+        elapsed = f"{minutes}분 전"
+    elif minutes < 60 * 24:
+        elapsed = f"{minutes // 60}시간 전"
+    else:
+        elapsed = f"{minutes // (60 * 24)}일 전"
+    return f"마지막 갱신: {updated_at} ({elapsed})"
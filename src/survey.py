@@ -7,138 +7,67 @@ import pydeck as pdk
 import pandas as pd
 import ast
 import numpy as np
+from src.survey_model import BRANCH_ANSWER
+from src.matching import get_breed_matcher, load_recommendation_table, IncrementalMatch
 
 class Survey:
     def __init__(self):
         pass 
 
-    def calculate_breed_match(self, user_answers, breed_info):
-        """사용자 답변과 견종 정보를 비교하여 매칭 점수를 계산합니다."""
-        scores = {}
-        
-        for _, breed in breed_info.iterrows():
-            score, total_weight = self.calculate_scores(user_answers, breed)
-            final_score = (score / total_weight) * 100 if total_weight > 0 else 0
-            scores[breed['breed_name_kor']] = final_score
-        
-        return scores
-
-    def calculate_scores(self, user_answers, breed):
-        score = 0
-        total_weight = 0
-
-        criteria = {
-            "당신의 개가 얼마나 훈련되기를 원하십니까?": (2, 'Trainability Level', [4, 3, 2]),
-            "당신은 개가 얼마나 활동적이기를 원하십니까?": (2, 'Energy Level', [4, 3, 2]),
-            "얼마나 많은 털 빠짐을 감당할 수 있습니까?": (1.5, 'Shedding Level', [3, 2, 2], True),
-            "개 미용 관리를 얼마나 자주 해줄 수 있습니까?": (1.5, 'Coat Grooming Frequency', [4, 3, 2]),
-            "얼마나 많은 짖음이나 다른 소리에 괜찮으십니까?": (1, 'Barking Level', [4, 3, 2]),
-            "원하는 개의 크기는 무엇입니까?": (1.5, 'weight', None, False, True),
-            "가정에 어린이가 있습니까?": (2, 'Good With Young Children', [4]),
-            "가정에 다른 동물이 있습니까?": (1.5, 'Good With Other Dogs', [4]),
-            "저알레르기 개를 원하십니까?": (2, 'Shedding Level', [2], True)
-        }
-
-        for question, (weight, trait, levels, *optional) in criteria.items():
-            is_shedding = optional[0] if len(optional) > 0 else False
-            is_size = optional[1] if len(optional) > 1 else False
-            
-            if question in user_answers:
-                answer = user_answers[question]
-                score, total_weight = self.update_score_and_weight(
-                    score, total_weight, weight, breed, trait, answer, levels, is_shedding, is_size
-                )
-
-        return score, total_weight
-
-    def update_score_and_weight(self, score, total_weight, weight, breed, trait, answer, levels, is_shedding, is_size):
-        if is_size:
-            size_score = self.get_size_score(answer)
-            breed_size = self.get_breed_size(breed)
-            if abs(size_score - breed_size) <= 1:
-                score += weight
-        else:
-            if is_shedding:
-                if answer == "많은 털 빠짐도 괜찮음" and breed[trait] >= levels[0]:
-                    score += weight
-                elif answer == "보통 정도의 털 빠짐은 괜찮음" and breed[trait] >= levels[1]:
-                    score += weight
-                elif answer == "가끔씩만 털 빠짐을 원함" and breed[trait] <= levels[2]:
-                    score += weight
-            else:
-                for i, level in enumerate(levels):
-                    if answer == self.get_answer_string(i) and breed[trait] >= level:
-                        score += weight
-                        break
-
-        total_weight += weight
-        return score, total_weight
-
-    def get_size_score(self, answer):
-        size_mapping = {
-            "초대형": 5,
-            "대형": 4,
-            "중형": 3,
-            "소형": 2,
-            "초소형": 1
-        }
-        return size_mapping.get(answer, 0)
-
-    def get_breed_size(self, breed):
-        try:
-            weight_str = breed['weight']
-            if isinstance(weight_str, str):
-                weight_list = ast.literal_eval(weight_str)
-                max_weight = max([float(w.split()[0].replace("'", "")) for w in weight_list])
-                if max_weight > 100:
-                    return 5
-                elif max_weight > 50:
-                    return 4
-                elif max_weight > 25:
-                    return 3
-                elif max_weight > 10:
-                    return 2
-                else:
-                    return 1
-        except:
-            pass
-        return 0
-
-    def get_answer_string(self, index):
-        answer_strings = [
-            "매우 훈련하기 쉬움",
-            "훈련하기 쉬움",
-            "훈련 가능",
-            "매우 높은 에너지 (하루 60~120분 운동)",
-            "활발함 (하루 60~90분 운동)",
-            "적당한 에너지 (하루 30~60분 운동)",
-            "많은 털 빠짐도 괜찮음",
-            "보통 정도의 털 빠짐은 괜찮음",
-            "가끔씩만 털 빠짐을 원함",
-            "매일",
-            "주 2~3회",
-            "매주",
-            "매우 시끄러움",
-            "자주 짖음",
-            "가끔 짖음"
-        ]
-        return answer_strings[index]
+    def get_match_state(self, breed_info):
+        """세션의 누적 매칭 점수를 현재 답변에 맞춰 갱신 (바뀐 질문만 반영)"""
+        matcher = get_breed_matcher(breed_info)
+        state = st.session_state.get('breed_match')
+        if state is None or state.matcher is not matcher:
+            state = IncrementalMatch(matcher)
+            st.session_state.breed_match = state
+        state.sync(st.session_state.user_answers)
+        return state
+
+    def get_matched_breeds(self, user_answers, breed_info, k=5):
+        """
+        상위 k개 추천 견종 (견종, 점수) 목록
+        제외 조건이 없으면 미리 계산한 추천표를 조회하고, 아니면 누적 점수에서 후보 견종만 고릅니다.
+        """
+        state = self.get_match_state(breed_info)
+        if not state.constraints:
+            table = load_recommendation_table(state.matcher)
+            if table is not None:
+                matched_breeds = table.lookup(user_answers)
+                if matched_breeds is not None and len(matched_breeds) >= k:
+                    return matched_breeds[:k]
+        return state.top_k(k)
+
+    def show_live_preview(self, state, k=3):
+        """설문 진행 중 지금까지의 답변으로 고른 추천 후보 표시"""
+        if state.total_weight <= 0 and not state.constraints:
+            return
+        candidates = ", ".join(f"{breed} ({score:.0f}점)" for breed, score in state.top_k(k))
+        st.caption(f"🐶 지금까지의 추천 후보: {candidates} · 조건에 맞는 견종 {state.n_candidates}개")
 
     def show_breed_results(self, matched_breeds, breed_info):
         """매칭된 견종 결과를 표시합니다."""
         st.subheader("🏆 추천 품종")
         upkind = '417000'
+        breedinfo = BreedInfo()
+        recommended = [breed for breed, _ in matched_breeds[:5]]
+
+        # 추천 품종 전체의 특성은 하나의 차트로 비교하고, 1순위 품종만 특성별 차트를 표시
+        breedinfo.show_breed_compare(recommended, key="survey_result")
         
         for i, (breed, score) in enumerate(matched_breeds[:5], 1):
             breed_data = breed_info[breed_info['breed_name_kor'] == breed].iloc[0]
             kindCd = breed_data.get('breed_name_kor', '')
 
             if i == 1:
-                BreedInfo().show_breed_info(kindCd, expandedoption=True, matching_score=score)
-                BreedInfo().match_breed(upkind, kindCd)
+                breedinfo.show_breed_info(kindCd, expandedoption=True, matching_score=score)
+                breedinfo.match_breed(upkind, kindCd)
             else:
-                BreedInfo().show_breed_info(kindCd, expandedoption=False, matching_score=score)
-                BreedInfo().match_breed(upkind, kindCd)
+                breedinfo.show_breed_info(kindCd, expandedoption=False, matching_score=score, show_traits=False)
+                breedinfo.match_breed(upkind, kindCd)
+
+        # 추천 품종과 특성이 비슷한 다른 견종
+        breedinfo.show_similar_breeds(recommended, exclude=recommended)
 
     def show_progress_bar(self, current_step, total_steps):
         """진행 상황을 보여주는 프로그레스 바를 표시합니다."""
@@ -146,11 +75,11 @@ class Survey:
         st.progress(progress)
         st.write(f"진행 상황: {current_step}/{total_steps} 단계")
 
-    def handle_survey_navigation(self, survey_data, current_step):   
-        row = survey_data.iloc[current_step]
-        question = row['question_k']
-        options = ast.literal_eval(row['select_option_k']) if pd.notna(row['select_option_k']) else []
-        description = row['description_k'] if pd.notna(row['description_k']) else ""
+    def handle_survey_navigation(self, survey_model, current_step):   
+        survey_question = survey_model[current_step]
+        question = survey_question.question
+        options = survey_question.options
+        description = survey_question.description
         
         st.subheader(question)
         if description:
@@ -158,7 +87,7 @@ class Survey:
         else:
             st.write("")
         
-        if options and isinstance(options, list):
+        if options:
             answer = st.radio(
                 "답변을 선택해주세요",
                 options,
@@ -169,8 +98,8 @@ class Survey:
             
             if answer:
                 st.session_state.user_answers[question] = answer
-                self.handle_conditional_questions(row, answer)
-                if not (pd.notna(row['if_question_k']) and pd.notna(row['if_option_k'])):
+                self.handle_conditional_questions(survey_question, answer)
+                if survey_question.branch is None:
                     st.session_state.current_step += 1
                     st.rerun()
         
@@ -183,71 +112,66 @@ class Survey:
                     key=f"prev_button_{current_step}",
                     use_container_width=True
                 ):
-                    self.reset_answers(survey_data, current_step)
+                    self.reset_answers(survey_model, current_step)
                     st.session_state.current_step -= 1
                     st.rerun()
 
-    def reset_answers(self, survey_data, current_step):
-        current_question = survey_data.iloc[current_step]['question_k']
-        if current_question in st.session_state.user_answers:
-            del st.session_state.user_answers[current_question]
+    def reset_answers(self, survey_model, current_step):
+        user_answers = st.session_state.user_answers
+        current_question = survey_model[current_step]
+        user_answers.pop(current_question.question, None)
         
-        current_row = survey_data.iloc[current_step]
-        if pd.notna(current_row['if_question_k']):
-            if current_row['if_question_k'] in st.session_state.user_answers:
-                del st.session_state.user_answers[current_row['if_question_k']]
+        if current_question.branch is not None:
+            user_answers.pop(current_question.branch.question, None)
         
-        prev_question = survey_data.iloc[current_step - 1]['question_k']
-        if prev_question in st.session_state.user_answers:
-            del st.session_state.user_answers[prev_question]
-
-    def handle_conditional_questions(self, row, answer):
-        if pd.notna(row['if_question_k']) and pd.notna(row['if_option_k']):
-            if answer == "예":
-                try:
-                    if_options = ast.literal_eval(row['if_option_k'])
-                    if isinstance(if_options, list) and if_options:
-                        if row['question_k'] in ["가정에 다른 동물이 있습니까?", "집에서 키우는 다른 동물이 있습니까?"]:
-                            st.write(row['if_question_k'])
-                            selected_animals = []
-                            for option in if_options:
-                                if st.checkbox(
-                                    option,
-                                    key=f"survey_if_{row['question_k']}_{option}",
-                                    value=option in st.session_state.user_answers.get(row['if_question_k'], [])
-                                ):
-                                    selected_animals.append(option)
-                            
-                            if selected_animals:
-                                st.session_state.user_answers[row['if_question_k']] = selected_animals
-                                col1, col2 = st.columns([1, 5])
-                                with col1:
-                                    if st.button(
-                                        "다음",
-                                        type="primary",
-                                        key=f"next_button_animals_{id(row)}",
-                                        use_container_width=True
-                                    ):
-                                        st.session_state.current_step += 1
-                                        st.rerun()
-                        else:
-                            if_answer = st.radio(
-                                row['if_question_k'],
-                                if_options,
-                                key=f"survey_if_{row['question_k']}",
-                                index=None
-                            )
-                            if if_answer:
-                                st.session_state.user_answers[row['if_question_k']] = if_answer
-                                st.session_state.current_step += 1
-                                st.rerun()
-                except (ValueError, SyntaxError) as e:
-                    st.error(f"조건부 질문 '{row['if_question_k']}'의 옵션을 처리하는 중 오류가 발생했습니다: {str(e)}")
-            
-            elif answer == "아니오" and row['question_k'] in ["가정에 어린이가 있습니까?", "집에 자녀가 있습니까?", 
-                                                        "가정에 다른 동물이 있습니까?", "집에서 키우는 다른 동물이 있습니까?"]:
-                st.session_state.current_step += 1
-                st.rerun()
+        user_answers.pop(survey_model[current_step - 1].question, None)
+
+    def handle_conditional_questions(self, survey_question, answer):
+        branch = survey_question.branch
+        if branch is None:
+            return
+
+        if answer == BRANCH_ANSWER:
+            if branch.error:
+                st.error(f"조건부 질문 '{branch.question}'의 옵션을 처리하는 중 오류가 발생했습니다: {branch.error}")
+            elif branch.options and branch.multi_select:
+                st.write(branch.question)
+                selected_animals = []
+                for option in branch.options:
+                    if st.checkbox(
+                        option,
+                        key=f"survey_if_{survey_question.question}_{option}",
+                        value=option in st.session_state.user_answers.get(branch.question, [])
+                    ):
+                        selected_animals.append(option)
+                
+                if selected_animals:
+                    st.session_state.user_answers[branch.question] = selected_animals
+                    col1, col2 = st.columns([1, 5])
+                    with col1:
+                        if st.button(
+                            "다음",
+                            type="primary",
+                            key=f"next_button_animals_{survey_question.index}",
+                            use_container_width=True
+                        ):
+                            st.session_state.current_step += 1
+                            st.rerun()
+            elif branch.options:
+                if_answer = st.radio(
+                    branch.question,
+                    branch.options,
+                    key=f"survey_if_{survey_question.question}",
+                    index=None
+                )
+                if if_answer:
+                    st.session_state.user_answers[branch.question] = if_answer
+                    st.session_state.current_step += 1
+                    st.rerun()
+        
+        elif answer == "아니오" and branch.skip_on_no:
+            st.session_state.current_step += 1
+            st.rerun()
 
     def handle_survey_completion(self, breed_info, akcTraits):
         st.success("모든 질문이 완료되었습니다!")
@@ -264,8 +188,7 @@ class Survey:
                 st.session_state.current_step = 0
                 st.rerun()
                 
-        scores = self.calculate_breed_match(st.session_state.user_answers, breed_info)
-        matched_breeds = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        matched_breeds = self.get_matched_breeds(st.session_state.user_answers, breed_info)
         
         self.show_breed_results(matched_breeds, breed_info)
 
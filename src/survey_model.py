@@ -0,0 +1,117 @@
+"""
+설문 정의 모델
+survey.csv의 질문, 선택지, 조건부 질문을 한 번만 읽어 질문 객체로 변환해 두고 프로세스 안에서 재사용합니다.
+설문 화면은 매번 CSV를 읽거나 선택지 문자열을 파싱하지 않고 이 모델만 조회합니다.
+"""
+import os
+import ast
+import pandas as pd
+
+SURVEY_PATH = './static/database/survey.csv'
+
+# 조건부 질문을 여는 답변
+BRANCH_ANSWER = "예"
+
+# 조건부 질문을 여러 개 고를 수 있는 질문
+MULTI_SELECT_QUESTIONS = ["가정에 다른 동물이 있습니까?", "집에서 키우는 다른 동물이 있습니까?"]
+
+# "아니오"를 고르면 바로 다음 질문으로 넘어가는 질문
+SKIP_ON_NO_QUESTIONS = ["가정에 어린이가 있습니까?", "집에 자녀가 있습니까?",
+                        "가정에 다른 동물이 있습니까?", "집에서 키우는 다른 동물이 있습니까?"]
+
+
+def parse_options(value):
+    """'["예", "아니오"]' 형식의 선택지 문자열을 목록으로 변환 (비어 있으면 빈 목록)"""
+    if pd.isna(value):
+        return []
+    options = ast.literal_eval(value.strip())
+    return list(options) if isinstance(options, list) else []
+
+
+class ConditionalBranch:
+    """특정 답변을 고르면 이어서 묻는 조건부 질문"""
+
+    def __init__(self, question, options, multi_select=False, skip_on_no=False, error=None):
+        self.question = question
+        self.options = options
+        self.multi_select = multi_select
+        self.skip_on_no = skip_on_no
+        # 선택지를 해석하지 못했으면 화면에 표시할 오류 메시지
+        self.error = error
+
+
+class SurveyQuestion:
+    """설문 질문 하나 (선택지와 조건부 질문 포함)"""
+
+    def __init__(self, index, question, options, description="", branch=None):
+        self.index = index
+        self.question = question
+        self.options = options
+        self.description = description
+        self.branch = branch
+
+
+class SurveyModel:
+    """순서대로 묻는 설문 질문 목록"""
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.positions = {q.question: q.index for q in questions}
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __getitem__(self, step):
+        return self.questions[step]
+
+    @classmethod
+    def from_frame(cls, survey_data):
+        questions = []
+        for index, row in enumerate(survey_data.to_dict('records')):
+            question = row['question_k']
+            branch = None
+            # 기존 설문 화면과 같이 조건부 질문과 선택지 칸이 모두 채워진 경우만 조건부 질문으로 취급
+            if pd.notna(row['if_question_k']) and pd.notna(row['if_option_k']):
+                try:
+                    if_options, error = parse_options(row['if_option_k']), None
+                except (ValueError, SyntaxError) as e:
+                    if_options, error = [], str(e)
+                branch = ConditionalBranch(
+                    row['if_question_k'],
+                    if_options,
+                    multi_select=question in MULTI_SELECT_QUESTIONS,
+                    skip_on_no=question in SKIP_ON_NO_QUESTIONS,
+                    error=error
+                )
+            questions.append(SurveyQuestion(
+                index,
+                question,
+                parse_options(row['select_option_k']),
+                description=row['description_k'] if pd.notna(row['description_k']) else "",
+                branch=branch
+            ))
+        return cls(questions)
+
+
+_models = {}
+_tables = {}
+
+
+def get_survey_model(path=SURVEY_PATH):
+    """survey.csv가 바뀌지 않았으면 이미 만든 설문 모델을 재사용"""
+    key = (path, os.path.getmtime(path))
+    if key not in _models:
+        _models.clear()
+        _models[key] = SurveyModel.from_frame(pd.read_csv(path))
+    return _models[key]
+
+
+def load_table(path):
+    """
+    설문 화면에서 읽기 전용으로 쓰는 CSV를 파일이 바뀔 때까지 재사용
+    반환된 데이터프레임은 여러 세션이 공유하므로 수정하지 않아야 합니다.
+    """
+    key = os.path.getmtime(path)
+    if _tables.get(path, (None,))[0] != key:
+        _tables[path] = (key, pd.read_csv(path))
+    return _tables[path][1]
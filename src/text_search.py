@@ -0,0 +1,180 @@
+"""
+보호 동물 특징·발견장소 검색 인덱스
+specialMark, happenPlace 문자열을 어절마다 글자 2-gram으로 나눠 역색인(2-gram → 유기번호별 가중치)을 만들고,
+검색어의 모든 2-gram을 포함한 동물만 골라 idf 가중치 합으로 순위를 매깁니다.
+한 글자 검색어는 그 글자가 들어간 2-gram의 역색인을 합쳐 찾습니다. (예: "개"는 "개", "검개", "개와" 등)
+보호 동물 스냅샷을 읽거나 저장할 때 바뀐 유기번호만 추가·삭제하므로 전체를 다시 만들지 않습니다.
+"""
+import math
+import re
+import threading
+from collections import Counter
+
+# 검색 대상 컬럼 → 가중치
+TEXT_COLUMNS = {
+    'specialMark': 1.0,
+    'happenPlace': 0.7
+}
+NGRAM_SIZE = 2
+
+
+def tokenize(text):
+    """어절별 글자 2-gram 목록 (한 글자 어절은 그대로, 구분 기호는 공백으로 처리)"""
+    if not isinstance(text, str):
+        return []
+    grams = []
+    for word in re.sub(r"[^\w]", " ", text.lower()).split():
+        if len(word) < NGRAM_SIZE:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1))
+    return grams
+
+
+def query_terms(query):
+    """검색어 → 어절별 2-gram 집합 목록 (어절마다 모든 2-gram이 있어야 일치)"""
+    return [set(tokenize(word)) for word in str(query).split() if tokenize(word)]
+
+
+class TextSearchIndex:
+    """유기번호 → 특징·발견장소 문자열에 대한 역색인"""
+
+    def __init__(self, columns=TEXT_COLUMNS):
+        self.columns = columns
+        # 2-gram → {유기번호: 가중치}
+        self.postings = {}
+        # 유기번호 → (원문 튜플, 2-gram 목록) (변경 확인과 삭제에 사용)
+        self.documents = {}
+        # 마지막으로 맞춘 스냅샷 버전
+        self.version = None
+        # 여러 세션의 검색과 갱신이 역색인을 동시에 읽고 쓰지 않도록 잠금
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, doc_id, texts):
+        if doc_id in self.documents:
+            self.remove(doc_id)
+        weights = Counter()
+        for column, weight in self.columns.items():
+            for gram in tokenize(texts.get(column)):
+                weights[gram] += weight
+        for gram, weight in weights.items():
+            self.postings.setdefault(gram, {})[doc_id] = weight
+        self.documents[doc_id] = (tuple(texts.get(column) for column in self.columns), list(weights))
+
+    def remove(self, doc_id):
+        _, grams = self.documents.pop(doc_id)
+        for gram in grams:
+            posting = self.postings[gram]
+            posting.pop(doc_id, None)
+            if not posting:
+                del self.postings[gram]
+
+    def sync(self, data, version=None):
+        """
+        보호 동물 데이터와 인덱스를 맞춤 (새로 들어오거나 내용이 바뀐 동물은 추가, 사라진 동물은 삭제)
+        version이 이미 맞춘 버전과 같으면 비교하지 않습니다. 추가·삭제한 문서 수 반환
+        """
+        with self._lock:
+            if version is not None and version == self.version:
+                return 0
+            changed = self._sync(data)
+            self.version = version
+            return changed
+
+    def _sync(self, data):
+        columns = [column for column in self.columns if column in data.columns]
+        records = data[['desertionNo'] + columns].drop_duplicates('desertionNo', keep='last').to_dict('records')
+        current = set()
+        changed = 0
+        for record in records:
+            doc_id = record['desertionNo']
+            current.add(doc_id)
+            texts = tuple(record.get(column) for column in self.columns)
+            if doc_id not in self.documents or self.documents[doc_id][0] != texts:
+                self.add(doc_id, record)
+                changed += 1
+        for doc_id in [doc_id for doc_id in self.documents if doc_id not in current]:
+            self.remove(doc_id)
+            changed += 1
+        return changed
+
+    def posting(self, gram):
+        """
+        2-gram → {유기번호: 가중치}
+        한 글자는 그 글자가 들어간 모든 2-gram(과 한 글자 어절)의 역색인을 합침 (유기번호별 가장 큰 가중치)
+        """
+        if len(gram) >= NGRAM_SIZE:
+            return self.postings.get(gram, {})
+        merged = {}
+        for key, posting in self.postings.items():
+            if gram in key:
+                for doc_id, weight in posting.items():
+                    if weight > merged.get(doc_id, 0):
+                        merged[doc_id] = weight
+        return merged
+
+    def search(self, query, limit=None):
+        """검색어에 맞는 (유기번호, 점수) 목록 (점수 높은 순)"""
+        terms = query_terms(query)
+        if not terms:
+            return []
+        with self._lock:
+            return self._search(terms, limit)
+
+    def _search(self, terms, limit):
+        total = len(self.documents)
+        postings_by_gram = {gram: self.posting(gram) for gram in set().union(*terms)}
+
+        matched = None
+        for grams in terms:
+            # 후보가 가장 적은 2-gram부터 교집합
+            postings = sorted((postings_by_gram[gram] for gram in grams), key=len)
+            docs = set(postings[0])
+            for posting in postings[1:]:
+                docs.intersection_update(posting)
+            matched = docs if matched is None else matched & docs
+            if not matched:
+                return []
+
+        scores = dict.fromkeys(matched, 0.0)
+        for gram, posting in postings_by_gram.items():
+            idf = math.log(1 + total / len(posting))
+            for doc_id in matched:
+                scores[doc_id] += posting[doc_id] * idf
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return ranked[:limit] if limit else ranked
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _named_index(name):
+    with _indexes_lock:
+        if name not in _indexes:
+            _indexes[name] = TextSearchIndex()
+        return _indexes[name]
+
+
+def sync_text_search_index(data, name='petinshelter', version=None):
+    """
+    스냅샷을 읽거나 저장할 때 이름별 검색 인덱스에 변경분만 반영 (같은 버전이면 건너뜀)
+    축종별 목록처럼 서로 다른 데이터는 다른 이름을 사용합니다.
+    """
+    index = _named_index(name)
+    index.sync(data, version)
+    return index
+
+
+def get_text_search_index(data, name='petinshelter'):
+    """
+    화면에서 사용할 검색 인덱스 (스냅샷 동기화에서 맞춘 인덱스를 그대로 사용)
+    아직 한 번도 맞추지 않은 이름이면 data로 만듭니다.
+    """
+    index = _named_index(name)
+    if index.version is None and not index.documents:
+        index.sync(data)
+    return index
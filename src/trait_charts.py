@@ -0,0 +1,126 @@
+"""
+견종 특성 차트
+특성마다 차트를 따로 만들지 않고 여러 특성(또는 여러 견종)을 하나의 Plotly 그림으로 그립니다.
+만든 그림은 (견종, 특성, 통계표) 단위로 최근 사용한 것만 보관해 두고 다음 화면 갱신 때는 복사본만 반환합니다.
+"""
+import threading
+from collections import OrderedDict
+import plotly.graph_objects as go
+
+# 견종 상세 정보의 탭 → 특성
+TRAIT_GROUPS = {
+    "Fmaily Life": ['Affectionate With Family', 'Good With Young Children', 'Good With Other Dogs'],
+    "Physical": ['Shedding Level', 'Coat Grooming Frequency', 'Drooling Level'],
+    "Social": ['Openness To Strangers', 'Playfulness Level', 'Watchdog/Protective Nature', 'Adaptability Level'],
+    "Personality": ['Trainability Level', 'Energy Level', 'Barking Level', 'Mental Stimulation Needs']
+}
+
+GAUGE_ROW_HEIGHT = 220
+COMPARE_COLORS = ['blue', 'orange', 'green', 'purple', 'brown']
+
+# 보관할 그림 수 (견종 상세 정보 탭 4개 × 자주 보는 견종, 비교 차트)
+MAX_CACHED_FIGURES = 256
+
+_figures = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cached(key, build):
+    """최근에 사용한 그림을 보관하고 복사본 반환 (여러 세션이 동시에 호출해도 안전)"""
+    with _lock:
+        figure = _figures.get(key)
+        if figure is not None:
+            _figures.move_to_end(key)
+    if figure is None:
+        figure = build()
+        with _lock:
+            _figures[key] = figure
+            while len(_figures) > MAX_CACHED_FIGURES:
+                _figures.popitem(last=False)
+    return go.Figure(figure)
+
+
+def trait_gauges_figure(stats, trait_text, breed_name, traits, columns=2):
+    """한 견종의 여러 특성 게이지를 격자로 배치한 그림 (견종이나 특성 정보가 없으면 None)"""
+    values = {trait: stats.lookup(breed_name, trait) for trait in traits}
+    if all(value is None for value in values.values()):
+        return None
+
+    def build():
+        rows = (len(traits) + columns - 1) // columns
+        fig = go.Figure()
+        for n, trait in enumerate(traits):
+            if values[trait] is None:
+                continue
+            score, average_score, _ = values[trait]
+            average_score = round(float(average_score), 2)
+            text = trait_text[trait]
+            fig.add_trace(go.Indicator(
+                mode="gauge+number+delta",
+                value=score,
+                title={'text': text['trait_ko']},
+                domain={'row': n // columns, 'column': n % columns},
+                gauge={
+                    'axis': {'range': [1, 5],
+                             'tickmode': "array",
+                             "tickvals": [1, 2, 3, 4, 5],
+                             "ticktext": [f"{text['score_low_ko']}", "", "", "", f"{text['score_high_ko']}"]},
+                    'bar': {'color': "blue"},
+                    'threshold': {
+                        'line': {'color': "red", 'width': 4},
+                        'thickness': 0.75,
+                        'value': average_score
+                    }
+                },
+                delta={'reference': average_score}
+            ))
+        fig.update_layout(
+            grid={'rows': rows, 'columns': columns, 'pattern': "independent", 'ygap': 0.35},
+            height=GAUGE_ROW_HEIGHT * rows,
+            margin=dict(t=60, b=10, l=30, r=30),
+            autosize=True,
+            font=dict(size=14)
+        )
+        return fig
+
+    return _cached(('gauges', breed_name, tuple(traits), columns, stats.source_hash), build)
+
+
+def trait_compare_figure(stats, trait_text, breed_names, traits):
+    """여러 견종의 특성 점수를 나란히 비교하는 그림 (빨간 선은 전체 견종 평균)"""
+    breed_names = [b for b in breed_names if b in stats.breed_positions]
+    if not breed_names:
+        return None
+
+    def build():
+        labels = [trait_text[trait]['trait_ko'] for trait in traits]
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=[round(float(stats.average(trait)), 2) for trait in traits],
+            y=labels,
+            name="평균",
+            mode='markers',
+            marker=dict(symbol='line-ns', size=18, line=dict(width=3, color='red'))
+        ))
+        for i, breed_name in enumerate(breed_names):
+            lookups = [stats.lookup(breed_name, trait) for trait in traits]
+            fig.add_trace(go.Scatter(
+                x=[value[0] if value is not None else None for value in lookups],
+                y=labels,
+                name=breed_name,
+                mode='markers',
+                marker=dict(size=12, color=COMPARE_COLORS[i % len(COMPARE_COLORS)], opacity=0.8),
+                customdata=[f"상위 {value[2]:.0f}%" if value is not None else "" for value in lookups],
+                hovertemplate="%{y}: %{x}점 (%{customdata})<extra>" + breed_name + "</extra>"
+            ))
+        fig.update_layout(
+            height=60 + 32 * len(traits),
+            margin=dict(t=40, b=10, l=10, r=10),
+            xaxis=dict(range=[0.5, 5.5], tickvals=[1, 2, 3, 4, 5]),
+            yaxis=dict(autorange='reversed'),
+            legend=dict(orientation='h', y=1.02, yanchor='bottom'),
+            font=dict(size=14)
+        )
+        return fig
+
+    return _cached(('compare', tuple(breed_names), tuple(traits), stats.source_hash), build)
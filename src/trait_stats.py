@@ -0,0 +1,157 @@
+"""
+견종 특성 통계표
+특성별 평균, 견종별 상위 백분율, 점수 분포를 akcBreedInfo.csv에서 한 번에 계산해 점수와 함께 저장해 두고,
+원본 파일 내용이 바뀌면 자동으로 다시 만듭니다. 불러올 때는 저장된 통계를 그대로 쓰며 다시 계산하지 않고,
+화면에서는 (견종, 특성) 위치 조회만 합니다.
+"""
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from src.similarity import TRAIT_COLUMNS
+
+AKC_BREED_INFO_PATH = './static/database/akcBreedInfo.csv'
+TRAIT_STATS_PATH = './static/database/trait_stats.json'
+TRAIT_AVERAGES_PATH = './static/database/trait_averages.csv'
+
+# 특성 점수 범위 (1~5점)
+SCORE_LEVELS = [1, 2, 3, 4, 5]
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def derive_stats(scores):
+    """견종 × 특성 점수 → (특성별 평균, 견종 × 특성 상위 백분율, 특성 × 점수별 견종 수)"""
+    valid = ~np.isnan(scores)
+    counts = valid.sum(axis=0)
+    mean = np.nansum(scores, axis=0) / np.maximum(counts, 1)
+    # 상위 백분율: 이 점수 이상인 견종의 비율 (정렬된 점수에서 이진 탐색)
+    top_percent = np.full(scores.shape, np.nan)
+    for j in range(scores.shape[1]):
+        column = np.sort(scores[valid[:, j], j])
+        at_least = len(column) - np.searchsorted(column, scores[valid[:, j], j], side='left')
+        top_percent[valid[:, j], j] = at_least / max(len(column), 1) * 100
+    histogram = np.stack([(scores == level).sum(axis=0) for level in SCORE_LEVELS], axis=1)
+    return mean, top_percent, histogram
+
+
+def _nullable(array):
+    """NaN을 None으로 바꾼 중첩 목록 (JSON 저장용)"""
+    values = np.asarray(array, dtype=float).tolist()
+    if np.ndim(array) == 1:
+        return [None if np.isnan(v) else v for v in values]
+    return [[None if np.isnan(v) else v for v in row] for row in values]
+
+
+def _array(values):
+    return np.array(values, dtype=float)
+
+
+class TraitStats:
+    """견종 × 특성 점수와 특성별 평균·상위 백분율·분포"""
+
+    def __init__(self, breed_names, traits, scores, source_hash=None, derived=None):
+        """derived는 저장해 둔 (평균, 상위 백분율, 분포)이며, 없으면 점수에서 계산합니다."""
+        self.breed_names = list(breed_names)
+        self.traits = list(traits)
+        self.scores = np.asarray(scores, dtype=float)
+        self.source_hash = source_hash
+        self.breed_positions = {name: i for i, name in reversed(list(enumerate(self.breed_names)))}
+        self.trait_positions = {trait: j for j, trait in enumerate(self.traits)}
+        self.mean, self.top_percent, self.histogram = derived if derived is not None else derive_stats(self.scores)
+
+    @classmethod
+    def build(cls, breed_info, source_hash=None):
+        scores = breed_info[TRAIT_COLUMNS].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        return cls(breed_info['breed_name_kor'].astype(str), TRAIT_COLUMNS, scores, source_hash)
+
+    def lookup(self, breed_name, trait):
+        """(점수, 전체 평균, 상위 백분율) 조회 (견종이나 특성이 없으면 None)"""
+        i = self.breed_positions.get(breed_name)
+        j = self.trait_positions.get(trait)
+        if i is None or j is None or np.isnan(self.scores[i, j]):
+            return None
+        return self.scores[i, j], self.mean[j], self.top_percent[i, j]
+
+    def average(self, trait):
+        return self.mean[self.trait_positions[trait]]
+
+    def distribution(self, trait):
+        """특성 점수(1~5)별 견종 수"""
+        return dict(zip(SCORE_LEVELS, self.histogram[self.trait_positions[trait]].tolist()))
+
+    def averages_frame(self):
+        return pd.DataFrame({'trait': self.traits, 'average_score': np.round(self.mean, 2)})
+
+    def save(self, path=TRAIT_STATS_PATH):
+        data = {
+            'source_hash': self.source_hash,
+            'traits': self.traits,
+            'breed_names': self.breed_names,
+            'scores': _nullable(self.scores),
+            'mean': _nullable(self.mean),
+            'top_percent': _nullable(self.top_percent),
+            'histogram': self.histogram.tolist()
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=TRAIT_STATS_PATH):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        scores = _array([[np.nan if v is None else v for v in row] for row in data['scores']])
+        derived = None
+        if all(name in data for name in ('mean', 'top_percent', 'histogram')):
+            derived = (
+                _array([np.nan if v is None else v for v in data['mean']]),
+                _array([[np.nan if v is None else v for v in row] for row in data['top_percent']]),
+                np.array(data['histogram'], dtype=int)
+            )
+        return cls(data['breed_names'], data['traits'], scores, data.get('source_hash'), derived)
+
+
+def build_trait_stats(source_path=AKC_BREED_INFO_PATH, path=TRAIT_STATS_PATH, averages_path=TRAIT_AVERAGES_PATH):
+    """견종 정보로 통계표를 만들어 저장 (기존 trait_averages.csv도 같은 값으로 갱신)"""
+    stats = TraitStats.build(pd.read_csv(source_path), source_hash=file_hash(source_path))
+    stats.save(path)
+    if averages_path:
+        stats.averages_frame().to_csv(averages_path, index=False)
+    return stats
+
+
+_stats = {}
+
+
+def get_trait_stats(source_path=AKC_BREED_INFO_PATH, path=TRAIT_STATS_PATH):
+    """
+    저장된 통계표를 한 번만 읽어 재사용
+    akcBreedInfo.csv가 수정되어 내용이 달라졌으면 통계표를 다시 만듭니다.
+    """
+    key = (source_path, os.path.getmtime(source_path))
+    if key in _stats:
+        return _stats[key]
+
+    source_hash = file_hash(source_path)
+    stats = None
+    if os.path.exists(path):
+        try:
+            stats = TraitStats.load(path)
+        except (OSError, ValueError, KeyError):
+            stats = None
+    if stats is None or stats.source_hash != source_hash:
+        try:
+            stats = build_trait_stats(source_path, path)
+        except OSError:
+            # 저장할 수 없는 환경이면 메모리에서만 사용
+            stats = TraitStats.build(pd.read_csv(source_path), source_hash=source_hash)
+
+    _stats.clear()
+    _stats[key] = stats
+    return stats
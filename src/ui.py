@@ -1,10 +1,12 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Callable, Optional, Union, Tuple
 from src.settings import verify_password
 from pathlib import Path
 from src.data import Public
+import os
 import time, random, string, re
 from st_aggrid import AgGrid, GridOptionsBuilder
 import plotly.graph_objects as go
@@ -12,6 +14,35 @@ from src.data import Public, Common
 import pydeck as pdk
 import pandas as pd
 from streamlit_javascript import st_javascript
+from src.refresh import save_petinshelter_snapshot
+from src.shelter_ingest import ensure_ingested, UNKNOWN_REGION
+from src.similarity import get_similarity_index
+from src.breed_search import get_breed_search_index
+from src.kind_mapping import get_kind_mapping, split_kindCd
+from src.trait_stats import get_trait_stats
+from src.trait_charts import TRAIT_GROUPS, trait_gauges_figure, trait_compare_figure
+from src.filter_index import get_filter_index
+from src.image_cache import get_image_cache
+from src.text_search import get_text_search_index
+from src.shelter_dim import get_shelter_tables, update_shelter_geo
+
+# 보호 동물 목록의 페이지당 행 수
+PAGE_SIZES = [50, 100, 200]
+
+AKC_BREED_INFO_PATH = './static/database/akcBreedInfo.csv'
+AKC_TRAITS_PATH = './static/database/akcTraits.csv'
+
+_breed_tables = {}
+
+
+def get_breed_tables():
+    """견종 정보·특성 설명표를 파일이 바뀔 때까지 재사용 (자동 완성처럼 입력마다 BreedInfo를 만들어도 CSV를 다시 읽지 않음)"""
+    key = (os.path.getmtime(AKC_BREED_INFO_PATH), os.path.getmtime(AKC_TRAITS_PATH))
+    if key not in _breed_tables:
+        _breed_tables.clear()
+        trait_info = pd.read_csv(AKC_TRAITS_PATH)
+        _breed_tables[key] = (pd.read_csv(AKC_BREED_INFO_PATH), trait_info, trait_info.set_index('trait').to_dict('index'))
+    return _breed_tables[key]
 
 class UI:
     def __init__(self) -> None:
@@ -182,12 +213,14 @@ class UI:
                                 hide_index: bool = True, 
                                 use_container_width: bool = True) -> None:
 
-        if '가격' in df.columns:
-            df['가격'] = df['가격'].apply(lambda x: "{:,.0f}".format(x) if pd.notnull(x) and isinstance(x, (int, float)) else x)
-
         gb = GridOptionsBuilder.from_dataframe(df)
         gb.configure_selection(selection_mode="single", use_checkbox=True)
 
+        # 가격은 정수로 두고 표시할 때만 천 단위 구분 기호를 붙임 (정렬·필터는 숫자 기준)
+        if '가격' in df.columns:
+            gb.configure_column("가격", headerName="가격", type=["numericColumn"],
+                                valueFormatter="value == null ? '' : value.toLocaleString('ko-KR')")
+
         gb.configure_column("숙박업소", headerName="숙박업소", rowGroup=True, hide=True, checkboxSelection=False)
         grid_options = gb.build()
         
@@ -347,6 +380,45 @@ class UI:
                 hide_index=True
             )
 
+    def show_job_status(self, job, key="job", poll_interval=2):
+        """
+        백그라운드 작업 상태 표시
+        실행 중인 작업은 poll_interval초마다 페이지를 다시 실행해 진행률을 갱신합니다.
+        """
+        from src.jobs import get_job_manager, QUEUED, RUNNING, DONE, CANCELLED, INTERRUPTED
+
+        status = job['status']
+        total = job.get('total') or 0
+        progress = job.get('progress') or 0
+        message = job.get('message') or ""
+        created_at = datetime.fromtimestamp(job['created_at']).strftime('%Y-%m-%d %H:%M:%S')
+
+        if status in (QUEUED, RUNNING):
+            ratio = min(progress / total, 1.0) if total else 0.0
+            st.progress(ratio, text=message or "작업 대기 중...")
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                auto_refresh = st.toggle("자동 새로고침", value=True, key=f"{key}_auto_refresh")
+            with col2:
+                st.button("새로고침", use_container_width=True, key=f"{key}_refresh")
+            with col3:
+                if st.button("작업 취소", use_container_width=True, key=f"{key}_cancel"):
+                    get_job_manager().cancel(job['id'])
+                    st.rerun()
+            st.caption(f"작업 ID: {job['id']} · 시작: {created_at}")
+
+            if auto_refresh:
+                time.sleep(poll_interval)
+                st.rerun()
+        elif status == DONE:
+            st.success(f"작업이 완료되었습니다. ({created_at} 시작)")
+        elif status == CANCELLED:
+            st.warning("작업이 취소되었습니다.")
+        elif status == INTERRUPTED:
+            st.warning("서버가 재시작되어 작업이 중단되었습니다. 다시 실행해주세요.")
+        else:
+            st.error(f"작업 중 오류가 발생했습니다: {job.get('error')}")
+
     def total_count(self, upkind):
         total_count = Public().totalCount(upkind=upkind)
         count_placeholder = st.empty()
@@ -376,55 +448,37 @@ class UI:
         with st.expander("보호소 정보", expanded=False):
             st.write("보호소 정보를 확인할 수 있습니다.", unsafe_allow_html=False)
 
-    def show_petinshelter(self, upkind, data_key = None, refresh_button = None):
+    def show_petinshelter(self, upkind, data_key = None, refresh_button = None, snapshot = None):
+        """
+        보호 동물 목록을 가공해 세션에 저장
+        snapshot이 주어지면 미리 수집된 데이터를 사용하고, 없으면 실시간으로 조회해 스냅샷을 갱신합니다.
+        """
         with st.spinner("보호소 정보를 가져오고 있습니다..."):
             try:
-                petinshelter = Public().find_pet(upkind=upkind)
-                petinshelter.to_csv('./static/database/petinshelter.csv', index=False)
+                if snapshot is not None:
+                    petinshelter = ensure_ingested(snapshot)
+                else:
+                    petinshelter = Public().find_pet(upkind=upkind)
+                    if petinshelter is not None and not petinshelter.empty:
+                        petinshelter = save_petinshelter_snapshot(petinshelter, upkind)
                 if petinshelter is not None and not petinshelter.empty:
                     petinshelter = petinshelter[
                         petinshelter['processState'].isin(["보호중", "공고중"])
                     ]
-                    petinshelter = petinshelter[['desertionNo', 'happenDt', 'kindCd', 'age', 'sexCd', 'careNm']].copy()
-                    
-                    petinshelter['happenDt'] = pd.to_datetime(petinshelter['happenDt'], errors='coerce').dt.strftime('%Y-%m-%d')
+                    # 수집 시점에 가공된 컬럼만 골라 사용 (문자열을 다시 해석하지 않음)
+                    petinshelter = petinshelter[[
+                        'desertionNo', 'happenDt', 'kind_name', 'age', 'sexCd', 'careNm', 'shelter_id', 'filename', 'popfile', 'specialMark', 'happenPlace',
+                        'breed_id', 'breed_name_kor', '출생년도', '년생', 'weight_kg', 'sex', 'neutered', '시도', '시군구'
+                    ]].rename(columns={'kind_name': 'kindCd'})
                     petinshelter = petinshelter.dropna(subset=['happenDt'])
                     
-                    petinshelter['kindCd'] = petinshelter['kindCd'].str.replace('[개]', '').str.replace('[고양이]', '').str.replace('[기타축종] ', '').str.strip()
-                    
-                    if not Public().shelter_to_sido:
-                        st.warning("시도 매핑 정보가 비어 있습니다. 시도 정보를 '정보 없음'으로 설정합니다.")
-                        petinshelter['시도'] = '정보 없음'
-                    else:
-                        petinshelter['시도'] = petinshelter['careNm'].map(Public().shelter_to_sido)
-                        
-                        missing_sido = petinshelter['시도'].isna().sum()
-                        if missing_sido > 0:
-                            st.warning(f"{missing_sido}개의 보호소에 시도 정보가 매핑되지 않았습니다.")
-                            
-                            missing_shelters = petinshelter.loc[petinshelter['시도'].isna(), 'careNm'].unique()
-                            if len(missing_shelters) > 0:
-                                sample_missing = missing_shelters[:min(5, len(missing_shelters))]
-                                st.warning(f"매핑되지 않은 보호소 예시: {', '.join(sample_missing)}")
-                                
-                                for shelter_name in sample_missing:
-                                    similar_names = [name for name in Public().shelter_to_sido.keys() 
-                                                    if shelter_name in name or name in shelter_name]
-                                    if similar_names:
-                                        st.info(f"'{shelter_name}'와(과) 비슷한 이름: {', '.join(similar_names[:3])}")
-                        
-                        petinshelter['시도'] = petinshelter['시도'].fillna('정보 없음')
+                    missing_sido = petinshelter['시도'] == UNKNOWN_REGION
+                    if missing_sido.any():
+                        st.warning(f"{missing_sido.sum()}개의 보호소에 시도 정보가 매핑되지 않았습니다.")
+                        sample_missing = petinshelter.loc[missing_sido, 'careNm'].dropna().unique()[:5]
+                        if len(sample_missing) > 0:
+                            st.warning(f"매핑되지 않은 보호소 예시: {', '.join(sample_missing)}")
                     
-                    if not Public().shelter_to_sigungu:
-                        petinshelter['시군구'] = '정보 없음'
-                    else:
-                        petinshelter['시군구'] = petinshelter['careNm'].map(Public().shelter_to_sigungu).fillna('정보 없음')                  
-                    
-                    petinshelter['출생년도'] = petinshelter['age'].apply(Public().extract_birth_year)
-                    petinshelter['년생'] = petinshelter.apply(
-                        lambda row: f"{int(row['출생년도'])}년생" if pd.notna(row['출생년도']) else "", 
-                        axis=1
-                    )
                     st.session_state[data_key] = petinshelter
                     
                     if refresh_button:
@@ -450,24 +504,16 @@ class UI:
         def set_filter_active():
             st.session_state[filter_state_key] = True
         
+        # 선택지와 필터 결과는 데이터마다 한 번 만든 인덱스에서 조회
+        index = get_filter_index(data)
+
         with st.expander("🔍 필터 옵션 보기", expanded=False):
-            all_kinds = sorted(data['kindCd'].unique().tolist())
-            
-            birth_years = []
-            if '출생년도' in data.columns:
-                for year in data['출생년도'].dropna().unique():
-                    if pd.notna(year) and str(year).isdigit() and len(str(int(year))) == 4:
-                        birth_years.append(int(year))
-            
-            all_birth_years = sorted([f"{y}년생" for y in birth_years], reverse=True) if birth_years else []
-            
-            all_sexes = sorted([s for s in data['sexCd'].unique().tolist() if s and s != ' '])
-            all_sidos = sorted([s for s in data['시도'].unique().tolist() if s != '정보 없음'])
+            all_birth_years = [f"{y}년생" for y in index.birth_years]
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                min_date = pd.to_datetime(data['happenDt'].min()).date().strftime('%Y-%m-%d')
-                max_date = pd.to_datetime(data['happenDt'].max()).date().strftime('%Y-%m-%d')
+                min_date = index.min_date
+                max_date = index.max_date
                 
                 date_from = st.date_input("발견일 시작", 
                                         value=min_date,
@@ -485,14 +531,13 @@ class UI:
 
             with col3:
                 selected_sido = st.selectbox("시도", 
-                                        ["모든 지역"] + all_sidos,
+                                        ["모든 지역"] + index.sidos,
                                         key=f"sido_{upkind}")
             
             with col4:
                 if selected_sido != "모든 지역":
-                    filtered_sigungu = sorted(data[data['시도'] == selected_sido]['시군구'].unique().tolist())
                     selected_sigungu = st.selectbox("시군구", 
-                                                ["모든 시군구"] + filtered_sigungu,
+                                                ["모든 시군구"] + index.sigungus(selected_sido),
                                                 key=f"sigungu_{upkind}")
                 else:
                     selected_sigungu = "모든 시군구"
@@ -500,7 +545,7 @@ class UI:
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 selected_kind = st.selectbox("품종", 
-                                            ["모든 품종"] + all_kinds,
+                                            ["모든 품종"] + index.kinds,
                                             key=f"kind_{upkind}")
             with col2:
                 selected_birth_year = st.selectbox("출생년도", 
@@ -511,6 +556,10 @@ class UI:
                                         ["모두", "M", "F"],
                                         key=f"sex_{upkind}")
             
+            search_text = st.text_input("특징·발견장소 검색",
+                                        placeholder="예: 겁먹어서, 들개포획단",
+                                        key=f"text_{upkind}")
+
             col1, col2, col3 = st.columns(3)
             with col2:
                 st.button("필터 적용", 
@@ -522,61 +571,86 @@ class UI:
         if not st.session_state[filter_state_key]:
             return data
         
-        filtered_data = data.copy()
-        
-        filtered_data['happenDt'] = pd.to_datetime(filtered_data['happenDt'], errors='coerce')
+        birth_year = None
+        if selected_birth_year != "모든 년도":
+            year_only = selected_birth_year.replace('년생', '').strip()
+            birth_year = int(year_only) if year_only.isdigit() else None
 
-        filtered_data = filtered_data[
-            (filtered_data['happenDt'].dt.date >= date_from) & 
-            (filtered_data['happenDt'].dt.date <= date_to)
-        ]
-        
-        if selected_kind != "모든 품종":
-            filtered_data = filtered_data[filtered_data['kindCd'] == selected_kind]
-        
-        if selected_birth_year != "모든 년도" and '출생년도' in filtered_data.columns:
-            try:
-                year_only = selected_birth_year.replace('년생', '').strip()
-                if year_only.isdigit():
-                    year_value = int(year_only)
-                    filtered_data = filtered_data[filtered_data['출생년도'] == year_value]
-            except Exception as e:
-                st.error(f"출생년도 필터링 중 오류 발생: {str(e)}")
-        
-        if selected_sex != "모두":
-            filtered_data = filtered_data[filtered_data['sexCd'] == selected_sex]
-        
-        if selected_sido != "모든 지역":
-            filtered_data = filtered_data[filtered_data['시도'] == selected_sido]
-            
-            if selected_sigungu != "모든 시군구":
-                filtered_data = filtered_data[filtered_data['시군구'] == selected_sigungu]
+        positions = index.query(
+            date_from=date_from,
+            date_to=date_to,
+            kindCd=None if selected_kind == "모든 품종" else selected_kind,
+            출생년도=birth_year,
+            sexCd=None if selected_sex == "모두" else selected_sex,
+            시도=None if selected_sido == "모든 지역" else selected_sido,
+            시군구=None if selected_sido == "모든 지역" or selected_sigungu == "모든 시군구" else selected_sigungu
+        )
         
-        filtered_data['happenDt'] = filtered_data['happenDt'].dt.strftime('%Y-%m-%d')
+        if search_text.strip():
+            # 검색 결과를 관련도 순으로 두고 필터 조건에 맞는 행만 남김
+            ranked = get_text_search_index(data, name=upkind).search(search_text)
+            ranked_positions = index.rows_for([desertion_no for desertion_no, _ in ranked])
+            positions = ranked_positions[np.isin(ranked_positions, positions)]
         
-        return filtered_data
+        return index.take(positions)
     
 class BreedInfo:
     def __init__(self) -> None:
-        self.breed_info = pd.read_csv('./static/database/akcBreedInfo.csv')
-        self.trait_info = pd.read_csv('./static/database/akcTraits.csv')
-        self.trait_averages = pd.read_csv('./static/database/trait_averages.csv')
+        self.breed_info, self.trait_info, self.trait_text = get_breed_tables()
+        self.trait_stats = get_trait_stats()
 
     def display_text_input(self, label, value, col):
         with col:
             unique_key = f"breed_info_{label}_{id(self)}_{id(col)}"
             st.text_input(label, disabled=True, value=value, key=unique_key)
     
-    def show_shelter_detail(self, filtered_data, breed = None):
+    def show_shelter_detail(self, filtered_data, breed = None, base = None, key = "shelter_detail"):
+        """
+        보호 동물 목록을 페이지 단위로 표시
+        정렬과 페이지 나누기는 필터 인덱스에서 계산하고 보이는 페이지의 행만 그리드로 보냅니다.
+        base는 filtered_data를 잘라낸 원본 데이터 (원본의 필터 인덱스를 재사용)
+        """
         display_columns = ['시도', 'careNm', '시군구', 'desertionNo', 'happenDt', 'kindCd', 'age', 'sexCd']
+        # 그리드에는 보이는 페이지만 있으므로 모든 컬럼의 정렬은 전체 목록 기준으로 서버에서 처리
+        sort_columns = {'시도': '시도', '시군구': '시군구', 'careNm': '보호소', 'happenDt': '발견일', 'kindCd': '품종', 'age': '나이', 'sexCd': '성별', 'desertionNo': '유기번호', None: '검색 관련도'}
+
+        index = get_filter_index(base if base is not None else filtered_data)
+        positions = index.positions_of(filtered_data)
+        if positions is None:
+            index = get_filter_index(filtered_data)
+            positions = index.positions_of(filtered_data)
         if breed:
-            filtered_data = filtered_data[filtered_data['kindCd'].str.contains(breed)]
-        display_data = filtered_data[display_columns].copy()
+            positions = index.contains(positions, 'kindCd', breed)
+        total = len(positions)
 
-        display_data = display_data.sort_values(by='시도', ascending=True)
+        col1, col2, col3, col4 = st.columns((2, 1, 1, 1))
+        with col1:
+            sort_by = st.selectbox("정렬", list(sort_columns), format_func=sort_columns.get, key=f"{key}_sort")
+        with col2:
+            ascending = st.selectbox("순서", ["오름차순", "내림차순"], key=f"{key}_order") == "오름차순"
+        with col3:
+            page_size = st.selectbox("페이지당", PAGE_SIZES, key=f"{key}_page_size")
+        page_count = max(1, -(-total // page_size))
+        # 필터 결과가 줄어 현재 페이지가 범위를 벗어나면 마지막 페이지로
+        if st.session_state.get(f"{key}_page", 1) > page_count:
+            st.session_state[f"{key}_page"] = page_count
+        with col4:
+            page = int(st.number_input(f"페이지 (총 {page_count:,})", min_value=1, max_value=page_count, step=1, key=f"{key}_page"))
+
+        page_positions = index.page(positions, sort_by, ascending, (page - 1) * page_size, page_size)
+        page_data = index.take(page_positions)
+        display_data = page_data[display_columns]
+        # 보이는 행의 사진은 선택하기 전에 미리 받아 둠 (목록용 썸네일은 작은 사진 filename에서)
+        image_cache = get_image_cache()
+        if 'popfile' in page_data.columns:
+            image_cache.prefetch(page_data['popfile'], 'medium')
+        if 'filename' in page_data.columns:
+            image_cache.prefetch(page_data['filename'], 'thumb')
 
         gb = GridOptionsBuilder.from_dataframe(display_data)
         gb.configure_selection(selection_mode="single", use_checkbox=True)
+        # 정렬·필터는 서버에서 처리하므로 그리드의 정렬·필터는 끔
+        gb.configure_default_column(sortable=False, filter=False)
 
 
         if st.session_state.is_mobile == False:
@@ -609,25 +683,38 @@ class BreedInfo:
             fit_columns_on_grid_load=True,
             use_container_width = True
         )
+        start = (page - 1) * page_size
+        st.caption(f"전체 {total:,}마리 중 {start + 1 if total else 0:,}–{start + len(page_positions):,}번째")
+
+        if 'filename' in page_data.columns and st.toggle("이 페이지 사진 보기", value=False, key=f"{key}_photos"):
+            self.show_thumbnails(page_data)
 
         return grid_response
+
+    def show_thumbnails(self, page_data, per_row=6):
+        """
+        페이지 행의 썸네일 목록
+        아직 캐시되지 않은 사진은 기다리지 않고 원본 주소로 표시합니다. (다음 실행부터 캐시 사용)
+        """
+        image_cache = get_image_cache()
+        rows = page_data[['desertionNo', 'kindCd', 'filename']].to_dict('records')
+        for start in range(0, len(rows), per_row):
+            for col, row in zip(st.columns(per_row), rows[start:start + per_row]):
+                thumbnail = image_cache.cached(row['filename'], 'thumb') or row['filename']
+                if isinstance(thumbnail, str) and thumbnail:
+                    col.image(thumbnail, caption=f"{row['kindCd']} · {row['desertionNo']}", use_container_width=True)
     
     def show_map(self, petinshelter, radius=30):
-        shelterlist = pd.read_csv('./static/database/보호소코드.csv')
-        shelterlist = shelterlist[shelterlist['주소'].notna()]
-
-        shelterlist['count_pet'] = shelterlist['보호소명'].map(petinshelter['careNm'].value_counts())
+        # 보호소마다 한 줄인 차원표에 보호 중인 동물 수를 붙임 (파일에는 저장하지 않음)
+        shelter_tables = get_shelter_tables()
 
         with st.spinner("보호소의 위경도 정보를 업데이트 중입니다..."):
-            for index, row in shelterlist.iterrows():
-                if pd.isna(row['lat']) or pd.isna(row['lon']):
-                    lat, lon = Common().convert_gps(row['주소'])
-                    shelterlist.loc[index, 'lat'] = lat
-                    shelterlist.loc[index, 'lon'] = lon
+            update_shelter_geo(shelter_tables, Common().convert_gps)
 
-        shelterlist.to_csv('./static/database/보호소코드.csv', index=False)
-        
-        shelterlist_status = shelterlist[['보호소명', 'count_pet', '주소', 'lat', 'lon']]
+        shelterlist = shelter_tables.dim[shelter_tables.dim['주소'].notna()]
+        counts = petinshelter['shelter_id'].value_counts()
+        shelterlist_status = shelterlist.assign(count_pet=shelterlist['shelter_id'].map(counts))
+        shelterlist_status = shelterlist_status[['보호소명', 'count_pet', '주소', 'lat', 'lon']]
         shelterlist_status = shelterlist_status.dropna(subset=['count_pet'])
         
         layer = pdk.Layer(
@@ -724,11 +811,9 @@ class BreedInfo:
         self.show_pet_info(selected_pet)
 
         if 'kindCd' in selected_pet.columns:
-            kindCd = selected_pet['kindCd'].iloc[0]
-            if isinstance(kindCd, str):
-                kindCd = kindCd.replace("[개]", "").replace("[고양이]", "").replace("[기타축종]", "").strip()
-            kindCd = self.kindCd_mapping(kindCd)
+            kindCd = self.kindCd_mapping(selected_pet['kindCd'].iloc[0])
             self.show_breed_info(kindCd)
+            self.show_similar_breeds(kindCd, petinshelter=petinshelter)
         else:
             st.warning("품종 정보를 찾을 수 없습니다.")
 
@@ -738,7 +823,9 @@ class BreedInfo:
         with st.expander("보호동물 상세 정보", expanded=False):
             col1, col2, col3 = st.columns([2, 1, 1])
             with col1:
-                st.image(selected_pet['popfile'].iloc[0], use_container_width=True)
+                # 로컬 캐시에 줄여 둔 사진을 사용하고, 받지 못하면 원본 주소로 표시
+                popfile = selected_pet['popfile'].iloc[0]
+                st.image(get_image_cache().get(popfile, 'medium') or popfile, use_container_width=True)
                 st.markdown('<style>img { max-height: 500px; }</style>', unsafe_allow_html=True)
                 st.markdown('<style>img { object-fit: contain; }</style>', unsafe_allow_html=True)
                 self.display_text_input('나이', selected_pet['age'].iloc[0], col2)
@@ -762,18 +849,20 @@ class BreedInfo:
             self.display_text_input('상태', selected_pet['processState'].iloc[0], col4)
             
     def kindCd_mapping(self, kindCd):
+        """보호 동물의 kindCd를 견종 정보의 한글 품종명으로 변환 (매핑표에 없으면 축종 표시와 믹스 표기만 제거)"""
         if kindCd is None or not isinstance(kindCd, str) or kindCd.strip() == '':
             return ""
             
-        kindCd_mapping = {
-            "푸들": "스탠다드 푸들"
-        }
+        mapping = get_kind_mapping()
+        found = mapping.lookup(kindCd) or mapping.lookup(f"[개] {kindCd.strip()}")
+        if found is not None and found[1]:
+            return found[1]
         
-        kindCd = kindCd_mapping.get(kindCd, kindCd)
+        kindCd = split_kindCd(kindCd)[1]
         kindCd = kindCd.replace("믹스", "").replace("잡종", "").strip()
         return kindCd
 
-    def show_breed_info(self, kindCd, expandedoption=True, matching_score=False):
+    def show_breed_info(self, kindCd, expandedoption=True, matching_score=False, show_traits=True):
         if kindCd is None or kindCd == "":
             st.info("품종 정보가 없습니다.")
             return
@@ -823,50 +912,80 @@ class BreedInfo:
                 self.display_text_input('체중', "", col3)
                 self.display_text_input('기대수명', "", col4)
 
-            tab0, tab1, tab2, tab3, tab4 = st.tabs(["How to read", "Fmaily Life", "Physical", "Social", "Personality"])
-            with tab0:
+            if not show_traits:
+                return
+
+            tabs = st.tabs(["How to read"] + list(TRAIT_GROUPS))
+            with tabs[0]:
                 self.show_breed_trait_5scale_example()
-                
-            with tab1:
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    self.show_breed_trait_5scale(kindCd, 'Affectionate With Family')
-                with col2:
-                    self.show_breed_trait_5scale(kindCd, 'Good With Young Children')
-                with col1:
-                        self.show_breed_trait_5scale(kindCd, 'Good With Other Dogs')
-            
-            with tab2:
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    self.show_breed_trait_5scale(kindCd, 'Shedding Level')
-                with col2:
-                    self.show_breed_trait_5scale(kindCd, 'Coat Grooming Frequency')
-                with col1:
-                    self.show_breed_trait_5scale(kindCd, 'Drooling Level')
-                self.show_breed_trait_hair(kindCd)
-            
-            with tab3:
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    self.show_breed_trait_5scale(kindCd, 'Openness To Strangers')
-                with col2:
-                    self.show_breed_trait_5scale(kindCd, 'Playfulness Level')
-                with col1:
-                    self.show_breed_trait_5scale(kindCd, 'Watchdog/Protective Nature')
-                with col2:
-                    self.show_breed_trait_5scale(kindCd, 'Adaptability Level')
 
-            with tab4:
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    self.show_breed_trait_5scale(kindCd, 'Trainability Level')
-                with col2:
-                    self.show_breed_trait_5scale(kindCd, 'Energy Level')
-                with col1:
-                    self.show_breed_trait_5scale(kindCd, 'Barking Level')
-                with col2:
-                    self.show_breed_trait_5scale(kindCd, 'Mental Stimulation Needs')
+            for tab, (group, traits) in zip(tabs[1:], TRAIT_GROUPS.items()):
+                with tab:
+                    self.show_breed_traits(kindCd, traits, key=group)
+                    if group == "Physical":
+                        self.show_breed_trait_hair(kindCd)
+
+    def show_breed_traits(self, breed_name, traits, key=""):
+        """여러 특성 게이지를 하나의 차트로 그리고 아래에 특성 설명을 표시"""
+        fig = trait_gauges_figure(self.trait_stats, self.trait_text, breed_name, traits)
+        if fig is None:
+            st.info(f"{breed_name} 품종에 대한 정보가 없습니다.")
+            return
+
+        unique_key = f"trait_gauges_{breed_name}_{key}_{id(self)}".replace(" ", "_").replace("/", "_")
+        st.plotly_chart(fig, use_container_width=True, key=unique_key)
+        for trait in traits:
+            stats = self.trait_stats.lookup(breed_name, trait)
+            rank = f" · 상위 {stats[2]:.0f}%" if stats is not None else ""
+            st.write(f"**{self.trait_text[trait]['trait_ko']}**{rank}  \n{self.trait_text[trait]['trait_desc_ko']}")
+
+    def show_breed_compare(self, breed_names, key=""):
+        """여러 견종의 전체 특성을 하나의 차트에서 비교"""
+        traits = [trait for group in TRAIT_GROUPS.values() for trait in group]
+        fig = trait_compare_figure(self.trait_stats, self.trait_text, breed_names, traits)
+        if fig is None:
+            return
+        unique_key = f"trait_compare_{key}_{id(self)}"
+        st.plotly_chart(fig, use_container_width=True, key=unique_key)
+
+    def shelter_breed_counts(self, petinshelter):
+        """보호 중인 동물의 품종별 마릿수 (kindCd를 견종 정보의 한글 품종명으로 맞춤)"""
+        if 'breed_name_kor' not in petinshelter.columns:
+            petinshelter = get_kind_mapping().annotate(petinshelter)
+        breeds = petinshelter['breed_name_kor']
+        return breeds[breeds.notna() & (breeds != "")].value_counts()
+
+    def show_similar_breeds(self, breeds, petinshelter=None, k=5, exclude=None):
+        """
+        특성이 비슷한 견종 표시
+        petinshelter가 주어지면 현재 보호소에 있는 견종 중에서만 찾아 마릿수와 함께 보여줍니다.
+        """
+        index = get_similarity_index(self.breed_info)
+        breed_list = [breeds] if isinstance(breeds, str) else list(breeds)
+        if not any(b in index for b in breed_list):
+            return
+
+        candidates = None
+        counts = None
+        if petinshelter is not None and not petinshelter.empty:
+            counts = self.shelter_breed_counts(petinshelter)
+            candidates = counts.index
+        if exclude:
+            candidates = [b for b in (candidates if candidates is not None else index.breed_names) if b not in exclude]
+
+        similar = index.similar(breed_list, k=k, candidates=candidates)
+        title = "보호소에 있는 비슷한 견종" if counts is not None else "비슷한 견종"
+        with st.expander(title, expanded=False):
+            if not similar:
+                st.info("비슷한 견종을 찾지 못했습니다.")
+                return
+            rows = []
+            for breed_name, score in similar:
+                row = {'품종': breed_name, '유사도': f"{score * 100:.0f}%"}
+                if counts is not None:
+                    row['보호 중'] = f"{int(counts.get(breed_name, 0)):,}마리"
+                rows.append(row)
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
 
     def show_shelter_info(self, selected_pet):
         with st.expander("보호소 정보", expanded=False):
@@ -996,54 +1115,6 @@ class BreedInfo:
                 with col2:
                     column_2_mobile(score_low, score_high, scores, average_scores)
 
-    def show_breed_trait_5scale(self, breed_name, trait):
-        if breed_name not in self.breed_info['breed_name_kor'].values:
-            st.info(f"{breed_name} 품종에 대한 정보가 없습니다.")
-            return
-        
-        filtered_data = self.breed_info.loc[self.breed_info['breed_name_kor'] == breed_name, trait]
-        trait_name = self.trait_info.loc[self.trait_info['trait'] == trait, 'trait_ko'].values[0]
-        
-        if filtered_data.empty:
-            st.info(f"{breed_name} 품종의 '{trait_name}' 속성 정보가 없습니다.")
-            return
-        
-        score = filtered_data.values[0]
-        trait_desc = self.trait_info.loc[self.trait_info['trait'] == trait, 'trait_desc_ko'].values[0]
-        score_low = self.trait_info.loc[self.trait_info['trait'] == trait, 'score_low_ko'].values[0]
-        score_high = self.trait_info.loc[self.trait_info['trait'] == trait, 'score_high_ko'].values[0]
-        average_score = self.trait_averages.loc[self.trait_averages['trait'] == trait, 'average_score'].values[0]
-
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=score,
-            title={'text': trait_name},
-            gauge={
-            'axis': {'range': [1, 5],
-                        'tickmode': "array",
-                        "tickvals": [1, 2, 3, 4, 5],
-                        "ticktext": [f"{score_low}", "", "", "", f"{score_high}"]},
-            'bar': {'color': "blue"},
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                    'value': average_score
-                }
-            },
-            delta={'reference': average_score}
-        ))
-
-        fig.update_layout(
-            height=200,
-            margin=dict(t=60, b=10, l=10, r=10),
-            autosize=False,
-            font=dict(size=16)
-        )
-
-        unique_key = f"trait_chart_{breed_name}_{trait}_{id(self)}_{id(fig)}".replace(" ", "_").replace("/", "_")
-        st.plotly_chart(fig, use_container_width=True, key=unique_key)
-        st.write(trait_desc)
-
     def show_breed_trait_hair(self, breed_name, trait=None):
         if breed_name not in self.breed_info['breed_name_kor'].values:
             st.info(f"{breed_name} 품종에 대한 털 정보가 없습니다.")
@@ -1140,17 +1211,18 @@ class BreedInfo:
             st.error(f"털 정보 표시 중 오류가 발생했습니다: {str(e)}")
             return
 
-    def search_breed(self, breed_name):
-        search_result = self.breed_info[self.breed_info['breed_name_kor'].str.contains(breed_name)]
-        if search_result.empty:
-            search_result = self.breed_info[self.breed_info['breed_name'].str.contains(breed_name)]
-            if search_result.empty:
-                st.info(f"{breed_name} 품종에 대한 정보가 없습니다.")
-                return None
-            else:
-                return pd.DataFrame({'품종': search_result['breed_name_kor'].values, '품종_영문': search_result['breed_name'].values})
-        else:
-            return pd.DataFrame({'품종': search_result['breed_name_kor'].values, '품종_영문': search_result['breed_name'].values})
+    def search_breed(self, breed_name, limit=10):
+        """한글/영문 품종명, 별칭, 초성으로 품종 검색 (오타가 있어도 비슷한 순서대로 반환)"""
+        index = get_breed_search_index(self.breed_info)
+        search_result = index.search(breed_name, limit=limit)
+        return pd.DataFrame({
+            '품종': [kor for kor, _, _ in search_result],
+            '품종_영문': [eng for _, eng, _ in search_result]
+        })
+
+    def complete_breed(self, prefix, limit=5):
+        """입력 중인 글자로 시작하는 품종명 (자동 완성)"""
+        return get_breed_search_index(self.breed_info).complete(prefix, limit=limit)
     
 
     def match_breed(self, upkind, breed_name):
@@ -1175,28 +1247,25 @@ class BreedInfo:
                 st.error("보호소 데이터를 가져오지 못했습니다.")
                 return
             
-            search_keywords = breed_name.split()
-            main_keyword = search_keywords[0] if search_keywords else breed_name
-            
-            filtered_data = petinshelter[petinshelter['kindCd'].str.contains(main_keyword, na=False, case=False)]
-            
-            if filtered_data.empty and len(search_keywords) > 1:
-                main_keyword = search_keywords[1]
-                filtered_data = petinshelter[petinshelter['kindCd'].str.contains(main_keyword, na=False, case=False)]
+            # kindCd 매핑표로 견종이 같은 동물(해당 견종의 믹스와 "푸들"처럼 견종이 속한 묶음 이름 포함)만 선택
+            filtered_data = petinshelter[petinshelter['kindCd'].isin(get_kind_mapping().kinds_of(breed_name))]
             
             if filtered_data.empty:
                 st.warning(f"'{breed_name}' 품종을 찾을 수 없습니다. 다른 검색어로 시도해보세요.")
             
             st.session_state[data_key] = filtered_data
+            # 원본도 함께 보관해 재실행 때 원본의 필터 인덱스를 재사용
+            st.session_state[f"{data_key}_base"] = petinshelter
         
         if data_key in st.session_state:
             filtered_data = st.session_state[data_key]
+            base = st.session_state.get(f"{data_key}_base")
             
             if filtered_data is not None and not filtered_data.empty:                
                 with st.expander("지도 보기", expanded=True):
                     self.show_map(filtered_data, radius=500)
                 
-                grid_response = self.show_shelter_detail(filtered_data)
+                grid_response = self.show_shelter_detail(filtered_data, base=base, key=grid_key)
                 st.session_state[grid_key] = grid_response
                 
                 self.show_pet_detail(grid_response)